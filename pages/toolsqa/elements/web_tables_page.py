@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import Optional
-from pombase import SingleWebNode, TableNode, NumberType, wait_until, PseudoLocatorType, GenericNode
+from pombase import SingleWebNode, TableNode, TimeoutType, wait_until, PseudoLocatorType, GenericNode
 from overrides import overrides
 from pages.toolsqa.web_concept_page import WebConceptPage
 
@@ -51,7 +51,7 @@ class WebTablesPage(WebConceptPage):
         )
 
     @overrides
-    def override_wait_until_loaded(self, timeout: NumberType = None) -> None:
+    def override_wait_until_loaded(self, timeout: TimeoutType = None) -> None:
         super().override_wait_until_loaded(timeout)
 
         table = self.swn_table_wrapper__swn_table
@@ -68,10 +68,9 @@ class WebTablesPage(WebConceptPage):
         # Row Actions exist for each row
         last_name_column_index = table.get_header_cell_index("Last Name", timeout)
         action_column_index = table.get_header_cell_index("Action", timeout)
-        for i in range(len(table.mwn_data_rows.get_multiple_nodes())):
-            last_name_txt = table.get_data_cell(i, last_name_column_index, timeout).get_text(timeout).strip()
-            actions_cell_node = table.get_data_cell(i, action_column_index, timeout)
-            if len(last_name_txt) > 0:
+        for i, last_name_txt in enumerate(table.column(last_name_column_index, timeout)):
+            if last_name_txt is not None and len(last_name_txt) > 0:
+                actions_cell_node = table.get_data_cell(i, action_column_index, timeout)
                 RowActionNode(parent=actions_cell_node)
                 # actions_cell_node has new child, so wait_until_loaded_succeeded to wait for this new child
                 actions_cell_node.wait_until_loaded_succeeded(timeout)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from pombase import SingleWebNode, NumberType, PageNode
+from pombase import SingleWebNode, TimeoutType, PageNode
 from overrides import overrides
 
 
 class WebTablesRegistrationFormPage(PageNode):
+    use_template = True
+
     @overrides
     def init_node(self) -> None:
         super().init_node()
@@ -22,7 +24,7 @@ class WebTablesRegistrationFormPage(PageNode):
         self.swn_registration_form__swn_submit = SingleWebNode("button#submit", required=True)
 
     @overrides
-    def override_wait_until_loaded(self, timeout: NumberType = None) -> None:
+    def override_wait_until_loaded(self, timeout: TimeoutType = None) -> None:
         super().override_wait_until_loaded(timeout)
 
         self.swn_registration_form__swn_modal_title\
@@ -4,6 +4,8 @@ from pombase import PageNode, SingleWebNode
 
 
 class ToolsQAPage(PageNode):
+    use_template = True
+
     @overrides
     def init_node(self) -> None:
         super().init_node()
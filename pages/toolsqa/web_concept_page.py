@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Optional
 from overrides import overrides
-from pombase import SingleWebNode, PageNode, NumberType, GenericNode
+from pombase import SingleWebNode, PageNode, TimeoutType, GenericNode
 
 
 class SubElement(SingleWebNode):
@@ -48,6 +48,7 @@ class AccordionElementNode(SingleWebNode):
 
 
 class WebConceptPage(PageNode):
+    use_template = True
     title = ""
 
     @overrides
@@ -66,7 +67,7 @@ class WebConceptPage(PageNode):
         self.swn_left_pannel__swn_book_store_application = AccordionElementNode("Book Store Application")
 
     @overrides
-    def override_wait_until_loaded(self, timeout: NumberType = None) -> None:
+    def override_wait_until_loaded(self, timeout: TimeoutType = None) -> None:
         super().override_wait_until_loaded(timeout)
 
         # Page title is self.title
@@ -4,10 +4,14 @@ from .constant import PbWebDriverType, TP_DRIVER_CLASS, TP_SLEEP_TIMING_TYPE, TP
     TP_REPORT_TYPE, ALMOST_NONE
 from .pombase_case import PombaseCase
 from .pombase_config import PombaseConfig
-from .types import NumberType
-from .util import wait_until, DateUtil, CaseInsensitiveDict, clean, normalize_caseless, \
+from .types import NumberType, TimeoutType
+from .util import Deadline, remaining_timeout, wait_until, wait_until_any, wait_until_all, PollSchedule, \
+    ConstantPollSchedule, BackoffPollSchedule, poll_schedule_from_str, get_default_poll_schedule, \
+    set_default_poll_schedule, DateUtil, CaseInsensitiveDict, clean, normalize_caseless, \
     expand_replacing_spaces_and_underscores, first_not_none
 from .web_node import NodeCount, SelectorByTuple, Locator, GenericNode, SingleWebNode, MultipleWebNode, PageNode, TableNode, \
-    node_from, as_css, as_xpath, compound, infer_by_from_selector, get_locator, PseudoLocatorType
+    TableSnapshot, HeaderLookup, node_from, field_value_from_snapshot, header_index, valid_count_bounds, as_css, \
+    as_xpath, compound, optimize_compound, optimize_xpath, infer_by_from_selector, get_locator, PseudoLocatorType
 from .webdriver import Chrome, Firefox, Edge, Ie, Safari, Remote, Generic
 from .decorator import report_assertion_errors
+from .aio import AsyncPombaseCase
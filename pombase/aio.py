@@ -0,0 +1,79 @@
+from __future__ import annotations
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from typing import Any, Callable, Optional, TypeVar, TYPE_CHECKING
+from weakref import WeakKeyDictionary
+from selenium.webdriver.remote.webdriver import WebDriver
+
+if TYPE_CHECKING:
+    from .pombase_case import PombaseCase
+
+# asyncio facade. Blocking PombaseCase calls (WebDriver commands and python waits) are run in a worker thread, so the
+# event loop is free meanwhile, and calls of different PombaseCase objects run concurrently.
+# Each PombaseCase has only one worker thread: its calls are serialized, because they share the state of the
+# PombaseCase (current driver, frame...). Use one PombaseCase per user to drive several browsers concurrently.
+
+T = TypeVar('T')
+
+_executors: WeakKeyDictionary[PombaseCase, ThreadPoolExecutor] = WeakKeyDictionary()
+
+
+def get_executor(pbc: PombaseCase) -> ThreadPoolExecutor:
+    """Worker thread (single thread executor) that runs the async calls of pbc"""
+    executor = _executors.get(pbc)
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"pombase-{id(pbc):x}")
+        _executors[pbc] = executor
+    return executor
+
+
+def shutdown_executor(pbc: PombaseCase) -> None:
+    """Stops the worker thread of pbc (if any). A new one is created if more async calls are done"""
+    executor = _executors.pop(pbc, None)
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+async def run(pbc: PombaseCase,
+              f: Callable[..., T],
+              *args: Any,
+              driver: Optional[WebDriver] = None,
+              **kwargs: Any) -> T:
+    """
+    Runs f(*args, **kwargs) in the worker thread of pbc and waits (without blocking the event loop) for its result.
+    If driver is given, pbc switches to it first (for PombaseCase objects with several drivers).
+    """
+
+    def call() -> T:
+        if driver is not None and pbc.driver is not driver:
+            pbc.switch_to_driver(driver)
+        return f(*args, **kwargs)
+
+    return await asyncio.get_running_loop().run_in_executor(get_executor(pbc), call)
+
+
+class AsyncPombaseCase:
+    """
+    Async version of a PombaseCase: every method of the PombaseCase is available as a coroutine function.
+    Example: `await AsyncPombaseCase(pb).open(url)`.
+    If driver is given, it is used in all the calls (it should be in the drivers list of pbc).
+    """
+
+    def __init__(self, pbc: PombaseCase, driver: Optional[WebDriver] = None) -> None:
+        self.pbc = pbc
+        self.driver = driver
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.pbc, name)
+        if not callable(attribute):
+            return attribute
+
+        @wraps(attribute)
+        async def method(*args: Any, **kwargs: Any) -> Any:
+            return await run(self.pbc, partial(attribute, *args, **kwargs), driver=self.driver)
+
+        return method
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.pbc!r})"
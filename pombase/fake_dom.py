@@ -0,0 +1,667 @@
+from __future__ import annotations
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Optional
+from urllib.parse import unquote
+from urllib.request import url2pathname
+from lxml import etree, html as lxml_html
+from cssselect import HTMLTranslator
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from . import javascript as pb_js
+
+# Browserless driver for fast page-object tests: a static HTML document (parsed with lxml) plays the role of the
+# browser. It understands the WebDriver (legacy, not W3C) protocol commands used by PombaseCase and SeleniumBase:
+# find elements (css, xpath and the rest of By strategies), text, attributes and properties, visibility (heuristics
+# based on tags, attributes and inline styles), clicks on checkboxes, radios, options and labels, and typing into
+# form fields. pombase scripts (javascript.py) are run in python; any other script fails with a JavaScript error.
+# Nothing else changes the document, so waits are not done in the "browser" (see PombaseCase.browser_waits_enabled):
+# they are polled from python, as usual.
+
+_HIDDEN_TAGS = {"head", "script", "style", "template", "title", "meta", "link", "noscript", "base"}
+_BLOCK_TAGS = {"address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "fieldset", "figcaption",
+               "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav",
+               "ol", "p", "pre", "section", "table", "tbody", "thead", "tfoot", "tr", "ul", "option", "select",
+               "caption", "details", "summary", "body", "html"}
+_CELL_TAGS = {"td", "th"}
+# Keys (selenium.webdriver.common.keys.Keys) are characters in the unicode private use area
+_KEYS = re.compile("[\ue000-\uf8ff]")
+_BACKSPACE = "\ue003"
+
+_translator = HTMLTranslator()
+
+# Legacy protocol status codes (see selenium.webdriver.remote.errorhandler.ErrorCode)
+_NO_SUCH_ELEMENT = 7
+_NO_SUCH_FRAME = 8
+_UNKNOWN_COMMAND = 9
+_STALE_ELEMENT_REFERENCE = 10
+_ELEMENT_NOT_VISIBLE = 11
+_UNKNOWN_ERROR = 13
+_JAVASCRIPT_ERROR = 17
+_INVALID_SELECTOR = 32
+
+
+class _CommandError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@lru_cache(maxsize=1024)
+def _compiled_xpath(selector: str) -> etree.XPath:
+    try:
+        return etree.XPath(selector)
+    except etree.XPathError as e:
+        raise _CommandError(_INVALID_SELECTOR, f"Invalid xpath: {selector}. {e}")
+
+
+@lru_cache(maxsize=1024)
+def _css_as_xpath(selector: str) -> str:
+    try:
+        return _translator.css_to_xpath(selector, prefix="descendant::")
+    except Exception as e:
+        raise _CommandError(_INVALID_SELECTOR, f"Invalid css selector: {selector}. {e}")
+
+
+def _as_xpath(selector: str, by: str) -> str:
+    if by == By.XPATH:
+        return selector
+    if by == By.CSS_SELECTOR:
+        return _css_as_xpath(selector)
+    if by == By.ID:
+        return _css_as_xpath(f'[id="{selector}"]')
+    if by == By.NAME:
+        return _css_as_xpath(f'[name="{selector}"]')
+    if by == By.CLASS_NAME:
+        return _css_as_xpath(f".{selector}")
+    if by == By.TAG_NAME:
+        return _css_as_xpath(selector)
+    if by == By.LINK_TEXT:
+        return f'descendant::a[normalize-space(.)="{selector}"]'
+    if by == By.PARTIAL_LINK_TEXT:
+        return f'descendant::a[contains(normalize-space(.), "{selector}")]'
+    raise _CommandError(_INVALID_SELECTOR, f"Locator strategy not supported: {by}")
+
+
+def _style(element: etree.ElementBase) -> dict[str, str]:
+    style = {}
+    for declaration in element.get("style", "").split(";"):
+        name, _, value = declaration.partition(":")
+        if name.strip():
+            style[name.strip().lower()] = value.strip().lower()
+    return style
+
+
+def is_visible(element: etree.ElementBase) -> bool:
+    """Visibility heuristics: tags never rendered, `hidden` attribute and inline styles (of element or ancestors)"""
+    if element.tag == "input" and element.get("type", "").lower() == "hidden":
+        return False
+    node = element
+    while node is not None:
+        if not isinstance(node.tag, str) or node.tag in _HIDDEN_TAGS or node.get("hidden") is not None:
+            return False
+        style = _style(node)
+        if style.get("display") == "none" or style.get("visibility") in ("hidden", "collapse") \
+                or style.get("opacity") == "0":
+            return False
+        node = node.getparent()
+    return True
+
+
+def _is_displayed_subtree(element: etree.ElementBase) -> bool:
+    # Like is_visible, but only for element itself (ancestors already checked)
+    if not isinstance(element.tag, str) or element.tag in _HIDDEN_TAGS or element.get("hidden") is not None:
+        return False
+    if element.tag == "input" and element.get("type", "").lower() == "hidden":
+        return False
+    style = _style(element)
+    return style.get("display") != "none" and style.get("visibility") not in ("hidden", "collapse")
+
+
+def visible_text(element: etree.ElementBase) -> str:
+    """Similar to innerText (normalized the same way as pbText in javascript.py)"""
+    if not is_visible(element):
+        return ""
+    parts = []
+
+    def collect(node: etree.ElementBase) -> None:
+        if not _is_displayed_subtree(node):
+            return
+        if node.tag == "br":
+            parts.append("\n")
+        block = node.tag in _BLOCK_TAGS
+        if block:
+            parts.append("\n")
+        if node.tag == "textarea":
+            parts.append(node.text or "")
+        else:
+            if node.text:
+                parts.append(node.text)
+            for child in node:
+                if isinstance(child.tag, str):
+                    collect(child)
+                if child.tail:
+                    parts.append(child.tail)
+        if node.tag in _CELL_TAGS:
+            parts.append(" ")
+        if block:
+            parts.append("\n")
+
+    collect(element)
+    lines = "".join(parts).replace("\u00a0", " ").split("\n")
+    return "\n".join(line for line in (" ".join(line.split()) for line in lines) if len(line) > 0)
+
+
+def _options(select: etree.ElementBase) -> list[etree.ElementBase]:
+    return select.xpath(".//option")
+
+
+def _is_selected(element: etree.ElementBase) -> bool:
+    if element.tag == "option":
+        if element.get("selected") is not None:
+            return True
+        select = next(element.iterancestors("select"), None)
+        if select is not None and select.get("multiple") is None and select.get("size") in (None, "1"):
+            # A single select always has a selected option: the first one by default
+            options = _options(select)
+            return not any(o.get("selected") is not None for o in options) and options[0] is element
+        return False
+    return element.get("checked") is not None
+
+
+def field_value(element: etree.ElementBase) -> Optional[str]:
+    """Current value of a form field (`value` property)"""
+    if element.tag == "textarea":
+        return element.text or ""
+    if element.tag == "select":
+        selected = [o for o in _options(element) if _is_selected(o)]
+        return field_value(selected[0]) if len(selected) > 0 else ""
+    if element.tag == "option":
+        value = element.get("value")
+        return value if value is not None else visible_text(element) or (element.text or "").strip()
+    if element.tag == "input":
+        value = element.get("value")
+        if value is None and element.get("type", "").lower() in ("checkbox", "radio"):
+            return "on"
+        return value if value is not None else ""
+    return element.get("value")
+
+
+def _set_field_value(element: etree.ElementBase, value: str) -> None:
+    if element.tag == "textarea":
+        element.text = value
+    else:
+        element.set("value", value)
+
+
+def _is_enabled(element: etree.ElementBase) -> bool:
+    if element.get("disabled") is not None:
+        return False
+    return not any(a.get("disabled") is not None for a in element.iterancestors("fieldset", "select"))
+
+
+class FakeDomConnection:
+    """Command executor of FakeDomDriver: answers WebDriver commands using the lxml document"""
+
+    def __init__(self, page_source: str = None, url: str = "about:blank") -> None:
+        self.w3c = False
+        self.url = url
+        self.root: Optional[etree.ElementBase] = None
+        self._elements: dict[str, etree.ElementBase] = {}
+        self._element_ids: dict[etree.ElementBase, str] = {}
+        self._lock = threading.RLock()
+        # Incremented whenever the document changes (table epochs, see pb_js.TABLE_HELPERS)
+        self.version = 0
+        self.load(page_source if page_source is not None else "<html><head></head><body></body></html>", url)
+
+    def load(self, page_source: str, url: str = "about:blank") -> None:
+        """Replaces the document (elements found in previous document become stale)"""
+        with self._lock:
+            self.root = lxml_html.document_fromstring(page_source)
+            self.url = url
+            self._elements = {}
+            self._element_ids = {}
+            self.version += 1
+
+    ###########
+    # Elements
+    ###########
+    def element_reference(self, element: etree.ElementBase) -> dict:
+        element_id = self._element_ids.get(element)
+        if element_id is None:
+            element_id = f"fake-{len(self._elements)}"
+            self._elements[element_id] = element
+            self._element_ids[element] = element_id
+        return {"ELEMENT": element_id}
+
+    def element(self, reference: Any) -> etree.ElementBase:
+        element_id = reference.get("ELEMENT") if isinstance(reference, dict) else reference
+        element = self._elements.get(element_id)
+        if element is None:
+            raise _CommandError(_STALE_ELEMENT_REFERENCE, f"Element {element_id} is not in current document")
+        return element
+
+    def find(self, selector: str, by: str, context: etree.ElementBase = None) -> list[etree.ElementBase]:
+        """Elements found (like querySelectorAll or document.evaluate from context, or from whole document)"""
+        if context is None:
+            context = self.root
+            if by != By.XPATH:
+                # Root element can also match a css selector searched from the document
+                xpath = _as_xpath(selector, by).replace("descendant::", "descendant-or-self::", 1)
+                return _compiled_xpath(xpath)(context)
+        result = _compiled_xpath(_as_xpath(selector, by))(context)
+        if not isinstance(result, list):
+            raise _CommandError(_INVALID_SELECTOR, f"Xpath does not select elements: {selector}")
+        return [e for e in result if isinstance(e, etree.ElementBase)]
+
+    ##########
+    # Actions
+    ##########
+    def click(self, element: etree.ElementBase) -> None:
+        if not is_visible(element):
+            raise _CommandError(_ELEMENT_NOT_VISIBLE, "Element is not visible")
+        if not _is_enabled(element):
+            return
+        if element.tag == "label":
+            target = None
+            if element.get("for"):
+                found = self.root.xpath("//*[@id=$id]", id=element.get("for"))
+                target = found[0] if len(found) > 0 else None
+            else:
+                target = next(iter(element.xpath(".//input|.//select|.//textarea")), None)
+            if target is not None and target.tag == "input":
+                self.click(target)
+            return
+        if element.tag == "option":
+            select = next(element.iterancestors("select"), None)
+            if select is not None and select.get("multiple") is not None:
+                if element.get("selected") is not None:
+                    del element.attrib["selected"]
+                else:
+                    element.set("selected", "selected")
+                return
+            if select is not None:
+                for option in _options(select):
+                    option.attrib.pop("selected", None)
+            element.set("selected", "selected")
+            return
+        input_type = element.get("type", "").lower()
+        if element.tag == "input" and input_type == "checkbox":
+            if element.get("checked") is not None:
+                del element.attrib["checked"]
+            else:
+                element.set("checked", "checked")
+        elif element.tag == "input" and input_type == "radio":
+            name = element.get("name")
+            if name is not None:
+                form = next(element.iterancestors("form"), self.root)
+                for radio in form.xpath(".//input[@type='radio'][@name=$name]", name=name):
+                    radio.attrib.pop("checked", None)
+            element.set("checked", "checked")
+
+    def send_keys(self, element: etree.ElementBase, text: str) -> None:
+        if not is_visible(element):
+            raise _CommandError(_ELEMENT_NOT_VISIBLE, "Element is not visible")
+        if element.tag not in ("input", "textarea") or not _is_enabled(element):
+            return
+        value = field_value(element) or ""
+        for part in re.split(f"({_BACKSPACE})", text):
+            if part == _BACKSPACE:
+                value = value[:-1]
+            else:
+                value += _KEYS.sub("", part)
+        _set_field_value(element, value)
+
+    ###########
+    # Scripts
+    ###########
+    def field_snapshot(self, element: etree.ElementBase) -> dict:
+        # Same as pbFieldSnapshot
+        selected = None
+        if element.tag == "select":
+            selected = [visible_text(o) or " ".join((o.text or "").split())
+                        for o in _options(element) if _is_selected(o)]
+        return {
+            "tag": element.tag,
+            "type": element.get("type"),
+            "text": visible_text(element),
+            "value": field_value(element),
+            "checked": _is_selected(element),
+            "selected": selected,
+            "visible": is_visible(element),
+        }
+
+    def _field_snapshot_script(self, selector: str, by: str, multiple: bool, only_visible: bool) -> Any:
+        elements = self.find(selector, by)
+        if multiple:
+            if only_visible:
+                elements = [e for e in elements if is_visible(e)]
+            return [self.field_snapshot(e) for e in elements]
+        if len(elements) == 0 or not is_visible(elements[0]):
+            return None
+        return self.field_snapshot(elements[0])
+
+    def _nodes_snapshot_script(self, nodes: list) -> list:
+        results = []
+        for node in nodes:
+            parent = None if node[3] is None else results[node[3]]
+            if parent is not None and (parent["frame"] or parent["count"] is None):
+                results.append({"count": None, "visible": None, "fields": None, "frame": False})
+                continue
+            elements = self.find(node[0], node[1])
+            counted = [e for e in elements if is_visible(e)] if node[2] else elements
+            fields = None
+            if node[4]:
+                fields = [self.field_snapshot(e) for e in (counted if node[5] else counted[:1])]
+            results.append({
+                "count": len(counted),
+                "visible": len(elements) > 0 and is_visible(elements[0]),
+                "fields": fields,
+                "frame": len(elements) > 0 and elements[0].tag == "iframe",
+            })
+        return results
+
+    def _first_visible(self, selector: str, by: str) -> Optional[etree.ElementBase]:
+        elements = self.find(selector, by)
+        return elements[0] if len(elements) > 0 and is_visible(elements[0]) else None
+
+    def _table_epoch(self, table: etree.ElementBase) -> str:
+        # Any change in the document changes the epochs of all tables
+        return f"{table.getroottree().getpath(table)}:{self.version}"
+
+    def _table_snapshot_script(self,
+                               selector: str,
+                               by: str,
+                               headers: Optional[list],
+                               rows: Optional[list],
+                               cells: list, ) -> Any:
+        table = self._first_visible(selector, by)
+        if table is None:
+            return None
+
+        def find_relative(spec: list, context: etree.ElementBase) -> list[etree.ElementBase]:
+            elements = self.find(spec[0], By.XPATH, context)
+            return [e for e in elements if is_visible(e)] if spec[1] else elements
+
+        return {
+            "headers": None if headers is None else [self.field_snapshot(e) for e in find_relative(headers, table)],
+            "rows": [[self.field_snapshot(cell) for cell in find_relative(cells, row)]
+                     for row in ([] if rows is None else find_relative(rows, table))],
+            "epoch": self._table_epoch(table),
+        }
+
+    def _table_epoch_script(self, selector: str, by: str) -> Optional[str]:
+        table = self._first_visible(selector, by)
+        return None if table is None else self._table_epoch(table)
+
+    @staticmethod
+    def _is_valid_count(valid: list, count: int) -> bool:
+        if valid[2] is not None:
+            return count in valid[2]
+        return count >= valid[0] and (valid[1] is None or count <= valid[1])
+
+    def _nodes_loaded_script(self, nodes: list, force_not_zero: bool, ancestors: list) -> dict:
+        failures = []
+        frame = False
+
+        def check(position: int, context: Optional[etree.ElementBase], force: bool, indexes: list) -> None:
+            nonlocal frame
+            node = nodes[position]
+            children = node[6]
+            if node[0] is not None:
+                if context is None or node[2] is None:
+                    elements = self.find(node[0], node[1])
+                else:
+                    elements = self.find(node[2], By.XPATH, context)
+                counted = [e for e in elements if is_visible(e)] if node[3] else elements
+                if not self._is_valid_count(node[4], len(counted)) or (force and len(counted) == 0):
+                    failures.append([position, indexes, len(counted)])
+                if len(children) > 0 and len(elements) > 0 and elements[0].tag == "iframe":
+                    frame = True
+                if node[5]:
+                    for k in range(min(len(counted), len(elements))):
+                        for child in children:
+                            check(child, elements[k], False, indexes + [k])
+                    return
+            for child in children:
+                check(child, context, False, indexes)
+
+        for ancestor in ancestors:
+            found = self.find(ancestor[0], ancestor[1])
+            if len(found) > 0 and found[0].tag == "iframe":
+                frame = True
+        check(0, None, force_not_zero, [])
+        return {"failures": failures, "frame": frame}
+
+    def _nodes_visible_script(self, nodes: list) -> list:
+        results = []
+        for selector, by, ancestors in nodes:
+            in_frame = False
+            for ancestor in ancestors:
+                found = self.find(ancestor[0], ancestor[1])
+                in_frame = in_frame or (len(found) > 0 and found[0].tag == "iframe")
+            if in_frame:
+                results.append(None)
+            else:
+                elements = self.find(selector, by)
+                results.append(len(elements) > 0 and is_visible(elements[0]))
+        return results
+
+    def _wait_for_script(self, selector: str, by: str, condition: str, parameter: Any, only_visible: bool,
+                         _timeout: Any) -> Any:
+        # Document does not change by itself: condition is checked only once
+        if condition == "mutation":
+            return False
+        elements = self.find(selector, by)
+        first_visible = len(elements) > 0 and is_visible(elements[0])
+
+        def text_visible(exact: bool) -> bool:
+            if not first_visible:
+                return False
+            text = visible_text(elements[0])
+            return text == parameter.strip() if exact else parameter in text
+
+        if condition == "present":
+            return len(elements) > 0
+        if condition == "not_present":
+            return len(elements) == 0
+        if condition == "visible":
+            return first_visible
+        if condition == "not_visible":
+            return not first_visible
+        if condition == "text":
+            return text_visible(False)
+        if condition == "exact_text":
+            return text_visible(True)
+        if condition == "text_not_visible":
+            return not text_visible(False)
+        if condition == "count":
+            counted = [e for e in elements if is_visible(e)] if only_visible else elements
+            return self._is_valid_count(parameter[0], len(counted)) and not (parameter[1] and len(counted) == 0)
+        return {"error": f"Unknown condition: {condition}"}
+
+    def execute_script(self, script: str, args: list) -> Any:
+        scripts: dict[str, Callable[..., Any]] = {
+            pb_js.FIELD_SNAPSHOT: self._field_snapshot_script,
+            pb_js.NODES_SNAPSHOT: self._nodes_snapshot_script,
+            pb_js.TABLE_SNAPSHOT: self._table_snapshot_script,
+            pb_js.TABLE_EPOCH: self._table_epoch_script,
+            pb_js.NODES_LOADED: self._nodes_loaded_script,
+            pb_js.NODES_VISIBLE: self._nodes_visible_script,
+            pb_js.WAIT_FOR: self._wait_for_script,
+        }
+        if script in scripts:
+            return self._wrap(scripts[script](*args))
+        if script.strip().rstrip(";") == "return document.readyState":
+            return "complete"
+        if "window.angular" in script and "cb(false)" in script:
+            # seleniumbase wait_for_angularjs: a static document has no angular (else it sleeps after the error)
+            return False
+        raise _CommandError(_JAVASCRIPT_ERROR, "FakeDomDriver only runs pombase scripts")
+
+    def _wrap(self, value: Any) -> Any:
+        if isinstance(value, etree.ElementBase):
+            return self.element_reference(value)
+        if isinstance(value, list):
+            return [self._wrap(v) for v in value]
+        if isinstance(value, dict):
+            return {k: self._wrap(v) for k, v in value.items()}
+        return value
+
+    ###########
+    # Protocol
+    ###########
+    def execute(self, command: str, params: dict) -> dict:
+        with self._lock:
+            try:
+                return {"status": 0, "sessionId": "fake-dom", "value": self._execute(command, params)}
+            except _CommandError as e:
+                return {"status": e.status, "value": {"message": str(e)}}
+
+    def _execute(self, command: str, params: dict) -> Any:
+        if command == Command.NEW_SESSION:
+            return {"browserName": "fakedom", "javascriptEnabled": False}
+        if command == Command.GET:
+            self.get(params["url"])
+            return None
+        if command == Command.GET_CURRENT_URL:
+            return self.url
+        if command == Command.GET_TITLE:
+            titles = self.root.xpath("//title")
+            return (titles[0].text or "").strip() if len(titles) > 0 else ""
+        if command == Command.GET_PAGE_SOURCE:
+            return etree.tostring(self.root, encoding="unicode", method="html")
+        if command in (Command.FIND_ELEMENT, Command.FIND_ELEMENTS, Command.FIND_CHILD_ELEMENT,
+                       Command.FIND_CHILD_ELEMENTS):
+            context = self.element(params["id"]) if "id" in params else None
+            elements = self.find(params["value"], params["using"], context)
+            if command in (Command.FIND_ELEMENTS, Command.FIND_CHILD_ELEMENTS):
+                return [self.element_reference(e) for e in elements]
+            if len(elements) == 0:
+                raise _CommandError(_NO_SUCH_ELEMENT, f"Element not found: {params['using']}={params['value']}")
+            return self.element_reference(elements[0])
+        if command == Command.GET_ACTIVE_ELEMENT:
+            return self.element_reference(self.root.find("body"))
+        if command in (Command.EXECUTE_SCRIPT, Command.EXECUTE_ASYNC_SCRIPT):
+            args = [self.element(a) if isinstance(a, dict) and "ELEMENT" in a else a for a in params.get("args", [])]
+            return self.execute_script(params["script"], args)
+        if "id" in params and command not in (Command.SWITCH_TO_FRAME, Command.SWITCH_TO_WINDOW):
+            return self._execute_element_command(command, self.element(params["id"]), params)
+        if command == Command.SWITCH_TO_FRAME:
+            if params.get("id") is not None:
+                raise _CommandError(_NO_SUCH_FRAME, "FakeDomDriver does not support frames")
+            return None
+        if command in (Command.GET_CURRENT_WINDOW_HANDLE, ):
+            return "fake-dom-window"
+        if command == Command.GET_WINDOW_HANDLES:
+            return ["fake-dom-window"]
+        if command in (Command.GET_WINDOW_SIZE, Command.GET_WINDOW_RECT):
+            return {"x": 0, "y": 0, "width": 1250, "height": 840}
+        if command == Command.GET_ALL_COOKIES:
+            return []
+        if command in (Command.QUIT, Command.CLOSE, Command.SWITCH_TO_WINDOW, Command.SWITCH_TO_PARENT_FRAME,
+                       Command.SET_WINDOW_SIZE, Command.SET_WINDOW_RECT, Command.SET_WINDOW_POSITION,
+                       Command.MAXIMIZE_WINDOW, Command.SET_TIMEOUTS, Command.SET_SCRIPT_TIMEOUT,
+                       Command.IMPLICIT_WAIT, Command.DELETE_ALL_COOKIES, Command.ADD_COOKIE, Command.DELETE_COOKIE,
+                       Command.REFRESH, Command.GO_BACK, Command.GO_FORWARD):
+            return None
+        raise _CommandError(_UNKNOWN_COMMAND, f"Command not supported by FakeDomDriver: {command}")
+
+    def _execute_element_command(self, command: str, element: etree.ElementBase, params: dict) -> Any:
+        if command == Command.GET_ELEMENT_TEXT:
+            return visible_text(element)
+        if command == Command.GET_ELEMENT_TAG_NAME:
+            return element.tag
+        if command == Command.GET_ELEMENT_ATTRIBUTE:
+            name = params["name"]
+            if name == "value":
+                return field_value(element)
+            if name in ("checked", "selected"):
+                return "true" if _is_selected(element) else None
+            if name == "disabled":
+                return None if _is_enabled(element) else "true"
+            if name in ("textContent", "innerText"):
+                return visible_text(element) if name == "innerText" else element.text_content()
+            return element.get("class" if name == "className" else name)
+        if command == Command.GET_ELEMENT_PROPERTY:
+            name = params["name"]
+            if name == "value":
+                return field_value(element)
+            if name in ("checked", "selected"):
+                return _is_selected(element)
+            if name == "disabled":
+                return not _is_enabled(element)
+            if name == "tagName":
+                return element.tag.upper()
+            if name in ("textContent", "innerText"):
+                return visible_text(element) if name == "innerText" else element.text_content()
+            if name in ("innerHTML", "outerHTML"):
+                source = etree.tostring(element, encoding="unicode", method="html", with_tail=False)
+                if name == "innerHTML":
+                    source = (element.text or "") + "".join(
+                        etree.tostring(c, encoding="unicode", method="html") for c in element)
+                return source
+            return element.get("class" if name == "className" else name)
+        if command == Command.GET_ELEMENT_VALUE_OF_CSS_PROPERTY:
+            return _style(element).get(params["propertyName"].lower(), "")
+        if command == Command.IS_ELEMENT_DISPLAYED:
+            return is_visible(element)
+        if command == Command.IS_ELEMENT_ENABLED:
+            return _is_enabled(element)
+        if command == Command.IS_ELEMENT_SELECTED:
+            return _is_selected(element)
+        if command == Command.CLICK_ELEMENT:
+            self.click(element)
+            self.version += 1
+            return None
+        if command == Command.CLEAR_ELEMENT:
+            if element.tag in ("input", "textarea"):
+                _set_field_value(element, "")
+            self.version += 1
+            return None
+        if command == Command.SEND_KEYS_TO_ELEMENT:
+            self.send_keys(element, "".join(params.get("value", [])) if "value" in params else params["text"])
+            self.version += 1
+            return None
+        if command == Command.SUBMIT_ELEMENT:
+            return None
+        size = {"width": 100, "height": 20} if is_visible(element) else {"width": 0, "height": 0}
+        if command == Command.GET_ELEMENT_SIZE:
+            return size
+        if command in (Command.GET_ELEMENT_LOCATION, Command.GET_ELEMENT_LOCATION_ONCE_SCROLLED_INTO_VIEW):
+            return {"x": 0, "y": 0}
+        if command == Command.GET_ELEMENT_RECT:
+            return {"x": 0, "y": 0, **size}
+        raise _CommandError(_UNKNOWN_COMMAND, f"Command not supported by FakeDomDriver: {command}")
+
+    def get(self, url: str) -> None:
+        if url == "about:blank" or url == "data:,":
+            self.load("<html><head></head><body></body></html>", url)
+        elif url.startswith("data:text/html,"):
+            self.load(unquote(url[len("data:text/html,"):]), url)
+        elif url.startswith("file://"):
+            with open(url2pathname(url[len("file://"):]), encoding="utf-8") as file:
+                self.load(file.read(), url)
+        else:
+            raise _CommandError(_UNKNOWN_ERROR, f"FakeDomDriver only loads file:// and data: urls. url: {url}")
+
+
+class FakeDomDriver(WebDriver):
+    """
+    WebDriver without browser: page_source (or the page loaded with `get`, only file:// and data: urls) is parsed
+    with lxml, and commands are answered from it (see FakeDomConnection)
+    """
+
+    def __init__(self, page_source: str = None, url: str = "about:blank") -> None:
+        super().__init__(command_executor=FakeDomConnection(page_source, url), desired_capabilities={})
+
+    @property
+    def connection(self) -> FakeDomConnection:
+        return self.command_executor
+
+    def load(self, page_source: str, url: str = "about:blank") -> None:
+        """Replaces current document with page_source"""
+        self.connection.load(page_source, url)
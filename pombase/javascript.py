@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+# JavaScript code executed in the browser with `PombaseCase.execute_script`.
+# Helpers are plain function declarations, prepended to the scripts that need them.
+
+HELPERS = """
+function pbFindElements(selector, by, context) {
+    context = context || document;
+    if (by === 'xpath') {
+        var doc = context.ownerDocument || context;
+        var result = doc.evaluate(selector, context, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var elements = [];
+        for (var i = 0; i < result.snapshotLength; i++) {
+            elements.push(result.snapshotItem(i));
+        }
+        return elements;
+    }
+    return Array.prototype.slice.call(context.querySelectorAll(selector));
+}
+
+function pbIsVisible(element) {
+    if (!(element.offsetWidth || element.offsetHeight || element.getClientRects().length)) {
+        return false;
+    }
+    var style = window.getComputedStyle(element);
+    return style.visibility !== 'hidden' && style.visibility !== 'collapse' && style.opacity !== '0';
+}
+
+function pbText(element) {
+    var text = element.innerText !== undefined ? element.innerText : element.textContent;
+    return (text || '').replace(/\\u00a0/g, ' ').split('\\n').map(function (line) {
+        return line.replace(/\\s+/g, ' ').trim();
+    }).filter(function (line) {
+        return line.length > 0;
+    }).join('\\n');
+}
+
+function pbIsValidCount(valid, count) {
+    if (valid[2] !== null) {
+        return valid[2].indexOf(count) >= 0;
+    }
+    return count >= valid[0] && (valid[1] === null || count <= valid[1]);
+}
+
+function pbFieldSnapshot(element) {
+    var tag = element.tagName.toLowerCase();
+    var selected = null;
+    if (tag === 'select') {
+        selected = Array.prototype.filter.call(element.options, function (option) {
+            return option.selected;
+        }).map(pbText);
+    }
+    var value = element.value !== undefined ? element.value : element.getAttribute('value');
+    return {
+        tag: tag,
+        type: element.getAttribute('type'),
+        text: pbText(element),
+        value: value === undefined ? null : value,
+        checked: !!(element.checked || element.selected),
+        selected: selected,
+        visible: pbIsVisible(element)
+    };
+}
+"""
+
+# arguments: selector, by ('css selector' or 'xpath'), multiple, only_visible
+# Returns the snapshot of the first element found (null if not found or not visible),
+# or a list with the snapshots of all the elements found if multiple is true
+FIELD_SNAPSHOT = HELPERS + """
+var elements = pbFindElements(arguments[0], arguments[1]);
+if (arguments[2]) {
+    if (arguments[3]) {
+        elements = elements.filter(pbIsVisible);
+    }
+    return elements.map(pbFieldSnapshot);
+}
+if (elements.length === 0 || !pbIsVisible(elements[0])) {
+    return null;
+}
+return pbFieldSnapshot(elements[0]);
+"""
+
+# arguments: list of nodes, in pre-order. Each node: [selector, by, only_visible, parent position (or null), field
+# values wanted, multiple]. Returns a list with one result per node: {count, visible, fields, frame}.
+# Descendants of a node found as an iframe are not searched (count null), because they are in a different document
+NODES_SNAPSHOT = HELPERS + """
+var nodes = arguments[0];
+var results = [];
+for (var i = 0; i < nodes.length; i++) {
+    var node = nodes[i];
+    var parent = node[3] === null ? null : results[node[3]];
+    if (parent !== null && (parent.frame || parent.count === null)) {
+        results.push({count: null, visible: null, fields: null, frame: false});
+        continue;
+    }
+    var elements = pbFindElements(node[0], node[1]);
+    var counted = node[2] ? elements.filter(pbIsVisible) : elements;
+    var fields = null;
+    if (node[4]) {
+        fields = (node[5] ? counted : counted.slice(0, 1)).map(pbFieldSnapshot);
+    }
+    results.push({
+        count: counted.length,
+        visible: elements.length > 0 && pbIsVisible(elements[0]),
+        fields: fields,
+        frame: elements.length > 0 && elements[0].tagName.toLowerCase() === 'iframe'
+    });
+}
+return results;
+"""
+
+# Helpers of table scripts. The epoch of a table element changes whenever the table changes (its subtree is modified,
+# or an input/change event is fired inside it). Epochs are unique in the page (a new table element has a new one), and
+# include a random page token, so they are not repeated after navigating to another page
+TABLE_HELPERS = HELPERS + """
+function pbTableEpoch(table) {
+    if (window.pbPageToken === undefined) {
+        window.pbPageToken = Math.random().toString(36).slice(2);
+        window.pbEpochCounter = 0;
+    }
+    if (table.pbEpoch === undefined) {
+        var change = function () {
+            table.pbEpoch = window.pbPageToken + ':' + (++window.pbEpochCounter);
+        };
+        change();
+        new MutationObserver(change).observe(
+            table, {subtree: true, childList: true, attributes: true, characterData: true});
+        table.addEventListener('input', change, true);
+        table.addEventListener('change', change, true);
+    }
+    return table.pbEpoch;
+}
+
+function pbFirstVisible(selector, by) {
+    var tables = pbFindElements(selector, by);
+    return tables.length > 0 && pbIsVisible(tables[0]) ? tables[0] : null;
+}
+"""
+
+# arguments: table selector, by, header cells ([relative xpath, only_visible] or null), data rows ([relative xpath,
+# only_visible] or null, to read only the header cells), data cells ([relative xpath, only_visible]). Header cells
+# and data rows are searched from the first table element found, and data cells from each data row.
+# Returns null if table is not found or not visible, or {headers, rows, epoch}: headers is a list with the snapshots of
+# the header cells (null if there are no header cells arguments), rows a list with a list of cell snapshots per row,
+# and epoch the table epoch (see TABLE_HELPERS) when it was read
+TABLE_SNAPSHOT = TABLE_HELPERS + """
+var table = pbFirstVisible(arguments[0], arguments[1]);
+if (table === null) {
+    return null;
+}
+
+function pbFindRelative(spec, context) {
+    var elements = pbFindElements(spec[0], 'xpath', context);
+    return spec[1] ? elements.filter(pbIsVisible) : elements;
+}
+
+var cellsSpec = arguments[4];
+return {
+    headers: arguments[2] === null ? null : pbFindRelative(arguments[2], table).map(pbFieldSnapshot),
+    rows: arguments[3] === null ? [] : pbFindRelative(arguments[3], table).map(function (row) {
+        return pbFindRelative(cellsSpec, row).map(pbFieldSnapshot);
+    }),
+    epoch: pbTableEpoch(table)
+};
+"""
+
+# arguments: table selector, by. Returns the epoch (see TABLE_HELPERS) of the first table element found, or null if
+# it is not found or not visible
+TABLE_EPOCH = TABLE_HELPERS + """
+var table = pbFirstVisible(arguments[0], arguments[1]);
+return table === null ? null : pbTableEpoch(table);
+"""
+
+# arguments: list of nodes, each one [selector, by, ancestors ([selector, by] each)]. Returns a list with one result
+# per node: true if the first element found is visible, false if not, or null if an ancestor is an iframe (node is in
+# a different document)
+NODES_VISIBLE = HELPERS + """
+return arguments[0].map(function (node) {
+    var inFrame = node[2].some(function (ancestor) {
+        var found = pbFindElements(ancestor[0], ancestor[1]);
+        return found.length > 0 && found[0].tagName.toLowerCase() === 'iframe';
+    });
+    if (inFrame) {
+        return null;
+    }
+    var elements = pbFindElements(node[0], node[1]);
+    return elements.length > 0 && pbIsVisible(elements[0]);
+});
+"""
+
+# arguments: list of nodes (in pre-order, first one is the loaded node), force_count_not_zero (for first node only),
+# ancestors of first node ([selector, by] each). Each node: [selector (or null), by, relative xpath (or null),
+# only_visible, valid count ([minimum, maximum, values]), multiple, children positions].
+# Same checks as GenericNode sequential loading: descendants of a multiple node are checked for every element found,
+# using their xpath relative to that element. Returns {failures: [[position, element indexes, count]], frame}.
+# frame is true if an iframe was found (nodes inside it can not be checked from current document)
+NODES_LOADED = HELPERS + """
+var nodes = arguments[0];
+var failures = [];
+var frame = false;
+
+function pbIsIframe(elements) {
+    return elements.length > 0 && elements[0].tagName.toLowerCase() === 'iframe';
+}
+
+function pbCheck(position, context, forceNotZero, indexes) {
+    var node = nodes[position];
+    var children = node[6];
+    if (node[0] !== null) {
+        var elements = (context === null || node[2] === null) ?
+            pbFindElements(node[0], node[1]) : pbFindElements(node[2], 'xpath', context);
+        var counted = node[3] ? elements.filter(pbIsVisible) : elements;
+        if (!pbIsValidCount(node[4], counted.length) || (forceNotZero && counted.length === 0)) {
+            failures.push([position, indexes, counted.length]);
+        }
+        if (children.length > 0 && pbIsIframe(elements)) {
+            frame = true;
+        }
+        if (node[5]) {
+            for (var k = 0; k < counted.length && k < elements.length; k++) {
+                for (var i = 0; i < children.length; i++) {
+                    pbCheck(children[i], elements[k], false, indexes.concat([k]));
+                }
+            }
+            return;
+        }
+    }
+    for (var j = 0; j < children.length; j++) {
+        pbCheck(children[j], context, false, indexes);
+    }
+}
+
+arguments[2].forEach(function (ancestor) {
+    if (pbIsIframe(pbFindElements(ancestor[0], ancestor[1]))) {
+        frame = true;
+    }
+});
+pbCheck(0, null, arguments[1], []);
+return {failures: failures, frame: frame};
+"""
+
+# Asynchronous (execute_async_script). arguments: selector, by, condition, condition parameter, only_visible,
+# timeout (milliseconds). Conditions (checked on the first element found, except count):
+# present, not_present, visible, not_visible, text (parameter: text), exact_text (parameter: text),
+# text_not_visible (parameter: text), count (parameter: [valid count, force_count_not_zero]),
+# mutation (selector is not used: true as soon as document changes, 50 ms later).
+# Condition is checked when document changes (MutationObserver and input/change/transition/animation events), and
+# also every 100 ms (visibility may change without document changes). No WebDriver calls are needed meanwhile.
+# Result: true (condition holds), false (timeout) or {error: message}
+WAIT_FOR = HELPERS + """
+var selector = arguments[0], by = arguments[1], condition = arguments[2], parameter = arguments[3];
+var onlyVisible = arguments[4], timeout = arguments[5], callback = arguments[arguments.length - 1];
+var finished = false, observer = null, timer = null, interval = null;
+var events = ['input', 'change', 'transitionend', 'animationend'];
+
+function pbTextVisible(elements, exact) {
+    if (elements.length === 0 || !pbIsVisible(elements[0])) {
+        return false;
+    }
+    var text = pbText(elements[0]);
+    return exact ? text === parameter.trim() : text.indexOf(parameter) >= 0;
+}
+
+function pbCondition() {
+    if (condition === 'mutation') {
+        return false;
+    }
+    var elements = pbFindElements(selector, by);
+    switch (condition) {
+        case 'present':
+            return elements.length > 0;
+        case 'not_present':
+            return elements.length === 0;
+        case 'visible':
+            return elements.length > 0 && pbIsVisible(elements[0]);
+        case 'not_visible':
+            return elements.length === 0 || !pbIsVisible(elements[0]);
+        case 'text':
+            return pbTextVisible(elements, false);
+        case 'exact_text':
+            return pbTextVisible(elements, true);
+        case 'text_not_visible':
+            return !pbTextVisible(elements, false);
+        case 'count':
+            var counted = onlyVisible ? elements.filter(pbIsVisible) : elements;
+            return pbIsValidCount(parameter[0], counted.length) && !(parameter[1] && counted.length === 0);
+    }
+    throw new Error('Unknown condition: ' + condition);
+}
+
+function pbFinish(result) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    if (observer !== null) {
+        observer.disconnect();
+    }
+    clearTimeout(timer);
+    clearInterval(interval);
+    events.forEach(function (name) {
+        document.removeEventListener(name, pbOnChange, true);
+    });
+    callback(result);
+}
+
+function pbCheck() {
+    try {
+        if (pbCondition()) {
+            pbFinish(true);
+        }
+    } catch (e) {
+        pbFinish({error: String(e)});
+    }
+}
+
+function pbOnChange() {
+    if (condition === 'mutation') {
+        // Changes usually come in bursts: wait a bit, so caller does not check after each of them
+        setTimeout(function () {
+            pbFinish(true);
+        }, 50);
+    } else {
+        pbCheck();
+    }
+}
+
+pbCheck();
+if (!finished) {
+    observer = new MutationObserver(pbOnChange);
+    observer.observe(document.documentElement, {subtree: true, childList: true, attributes: true, characterData: true});
+    events.forEach(function (name) {
+        document.addEventListener(name, pbOnChange, true);
+    });
+    if (condition !== 'mutation') {
+        interval = setInterval(pbCheck, 100);
+    }
+    timer = setTimeout(function () {
+        pbFinish(false);
+    }, timeout);
+}
+"""
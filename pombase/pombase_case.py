@@ -1,11 +1,16 @@
 from __future__ import annotations
-from typing import Optional, Union
+from typing import Optional, Union, Any, Iterator, TYPE_CHECKING
 import os
+import re
+import sys
+import math
+import time
+from contextlib import contextmanager
 from overrides import overrides, EnforceOverrides
 from selenium.webdriver.remote.webdriver import WebDriver
 from seleniumbase import BaseCase
 from seleniumbase.config.settings import HEADLESS_START_WIDTH, HEADLESS_START_HEIGHT, CHROME_START_WIDTH, \
-    CHROME_START_HEIGHT
+    CHROME_START_HEIGHT, SMALL_TIMEOUT, LARGE_TIMEOUT
 from seleniumbase.core.browser_launcher import validate_proxy_string, _set_firefox_options, \
     _add_chrome_disable_csp_extension, _add_chrome_proxy_extension, _set_safari_capabilities, _set_chrome_options
 from seleniumbase.core.download_helper import get_downloads_folder
@@ -16,6 +21,7 @@ from selenium.webdriver.ie.options import Options
 from selenium.webdriver.support.select import Select
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import ElementNotVisibleException, WebDriverException
 from msedge.selenium_tools import EdgeOptions
 # noinspection PyPackageRequirements
 from src.testproject.classes import StepSettings
@@ -30,6 +36,57 @@ from . import constant as constants
 from . import util as pb_util
 from . import web_node as web_node
 from . import types as pb_types
+from . import javascript as pb_js
+from . import session_pool as pb_session_pool
+from . import recording as pb_recording
+
+if TYPE_CHECKING:
+    # Imported only when used (it needs lxml)
+    from . import fake_dom as pb_fake_dom
+
+
+# Maximum time (seconds) of each browser wait (each execute_async_script call)
+_BROWSER_WAIT_CHUNK = 5
+# Maximum time (seconds) waiting for a page change, before checking again anyway
+_BROWSER_CHANGE_WAIT = 2
+# SeleniumBase waits do not try even once with a smaller timeout
+_MIN_SB_TIMEOUT = 0.1
+
+
+# PombaseCase attributes read by BaseCase.get_new_driver (with switch_to=False). Used to launch drivers in background
+_LAUNCHER_ATTRIBUTES = ("browser", "headless", "locale_code", "protocol", "servername", "port", "proxy_string",
+                        "user_agent", "cap_file", "cap_string", "disable_csp", "enable_ws", "enable_sync",
+                        "use_auto_ext", "no_sandbox", "disable_gpu", "incognito", "guest_mode", "devtools",
+                        "remote_debug", "swiftshader", "block_images", "chromium_arg", "firefox_arg", "firefox_pref",
+                        "user_data_dir", "extension_zip", "extension_dir", "mobile_emulator",
+                        "_BaseCase__device_width", "_BaseCase__device_height", "_BaseCase__device_pixel_ratio",
+                        "_testMethodName", "_sb_test_identifier", )
+
+
+def _recalculate_timeout(timeout: Optional[pb_types.TimeoutType]) -> Optional[pb_types.NumberType]:
+    # SeleniumBase only understands numbers (and uses its default timeout if it is 0)
+    if isinstance(timeout, pb_util.Deadline):
+        return max(timeout.remaining, _MIN_SB_TIMEOUT)
+    return timeout
+
+
+def _replace_timeout_in_message(exception: Exception,
+                                timeout: pb_types.NumberType,
+                                original_timeout: pb_types.NumberType) -> None:
+    # SeleniumBase errors say "... after {timeout} seconds!"
+    pattern = re.compile(rf"after {re.escape(str(timeout))} seconds?")
+    replacement = f"after {original_timeout} second{'' if original_timeout == 1 else 's'}"
+    if isinstance(exception, WebDriverException) and isinstance(exception.msg, str):
+        exception.msg = pattern.sub(replacement, exception.msg)
+    exception.args = tuple(pattern.sub(replacement, arg) if isinstance(arg, str) else arg for arg in exception.args)
+
+
+def _script_selector_by(selector: Union[str, web_node.GenericNode], by: str = None) -> tuple[str, str]:
+    # Scripts in pb_js only understand css selectors and xpaths
+    selector, by = _recalculate_selector_by(selector, by)
+    if by not in (By.CSS_SELECTOR, By.XPATH):
+        selector, by = web_node.as_xpath(selector, by), By.XPATH
+    return selector, by
 
 
 def _auth_user_pass(proxy_string: Optional[str],
@@ -67,7 +124,8 @@ def _auth_user_pass(proxy_string: Optional[str],
 
 def _recalculate_selector_by(selector: Union[str, web_node.GenericNode], by: str = None):
     if isinstance(selector, web_node.GenericNode):
-        return selector.compound_locator.selector, selector.compound_locator.by
+        optimized_locator = selector.optimized_locator
+        return optimized_locator.selector, optimized_locator.by
     elif by is None:
         return selector, web_node.infer_by_from_selector(selector)
     elif by == By.CSS_SELECTOR and web_node.infer_by_from_selector(selector) == By.XPATH:
@@ -84,6 +142,8 @@ class PombaseCase(BaseCase, EnforceOverrides):
         self.tp_project_name = None
         self.tp_job_name = None
         self.tp_test_name = None
+        self._session_pool_keys: dict[WebDriver, str] = {}
+        self._recording_number = 0
 
     @property
     def pbconfig(self) -> pb_config.PombaseConfig:
@@ -126,6 +186,15 @@ class PombaseCase(BaseCase, EnforceOverrides):
                        d_height=None,
                        d_p_r=None,
                        ):
+        # Drivers are only reused (session pool) by tests that ask for a driver with the same options
+        driver_options = {k: v for k, v in locals().items() if k not in ("self", "switch_to", "__class__")}
+        pool_key = repr(sorted(driver_options.items()))
+        if self.lazy_browser_enabled and len(getattr(self, "_drivers_list", [])) == 0:
+            return self._get_lazy_driver(driver_options, switch_to)
+        if self.pbconfig.pb_webdriver_replay_dir is not None:
+            return self._get_replay_driver(driver_options, switch_to)
+        if self.pbconfig.pb_fake_dom is True:
+            return self.get_fake_dom_driver(switch_to=switch_to)
         token = self.pbconfig.tp_dev_token
         if token is not None:
             self._BaseCase__check_scope()
@@ -398,7 +467,15 @@ class PombaseCase(BaseCase, EnforceOverrides):
             self._handle_new_driver(new_driver, browser_name, switch_to)
             return new_driver
         else:
-            return super().get_new_driver(browser,
+            if self.session_pool_enabled or self.warm_pool_size > 0:
+                pooled_driver = self.session_pool.acquire(pool_key)
+                if pooled_driver is not None:
+                    if self.session_pool_enabled:
+                        self._session_pool_keys[pooled_driver] = pool_key
+                    self._handle_new_driver(pooled_driver, pb_util.first_not_none(browser, self.browser), switch_to)
+                    self._warm_session_pool(pool_key, driver_options)
+                    return pooled_driver
+            new_driver = super().get_new_driver(browser,
                                           headless,
                                           locale_code,
                                           protocol,
@@ -431,6 +508,154 @@ class PombaseCase(BaseCase, EnforceOverrides):
                                           d_width,
                                           d_height,
                                           d_p_r, )
+            if self.session_pool_enabled:
+                self._session_pool_keys[new_driver] = pool_key
+            self._warm_session_pool(pool_key, driver_options)
+            if self.pbconfig.pb_webdriver_record_dir is not None:
+                os.makedirs(self.pbconfig.pb_webdriver_record_dir, exist_ok=True)
+                pb_recording.record_driver(new_driver, self._next_recording_path(self.pbconfig.pb_webdriver_record_dir))
+            return new_driver
+
+    def _next_recording_path(self, directory: str) -> str:
+        # One recording per driver: first driver of the test is number 0, second one is number 1...
+        number = self._recording_number
+        self._recording_number += 1
+        # noinspection PyUnresolvedReferences
+        return pb_recording.recording_path(directory, self._BaseCase__get_test_id(), number)
+
+    def _get_replay_driver(self, driver_options: dict, switch_to: bool) -> WebDriver:
+        path = self._next_recording_path(self.pbconfig.pb_webdriver_replay_dir)
+        if not os.path.exists(path):
+            raise RuntimeError(f"There is no WebDriver recording to replay: {path}")
+        new_driver = pb_recording.replay_driver(path)
+        # Browser is not really started, so there is no window to resize (commands not recorded can not be replayed)
+        self._register_driver(new_driver, pb_util.first_not_none(driver_options["browser"], self.browser), switch_to)
+        return new_driver
+
+    def get_fake_dom_driver(self,
+                            page_source: str = None,
+                            url: str = "about:blank",
+                            switch_to: bool = True, ) -> pb_fake_dom.FakeDomDriver:
+        """
+        New browserless driver, that answers WebDriver commands using page_source (or the file:// url opened later).
+        See pb_fake_dom. Used by get_new_driver if ini option pb_fake_dom is set
+        """
+        from . import fake_dom as pb_fake_dom
+        new_driver = pb_fake_dom.FakeDomDriver(page_source, url)
+        self._register_driver(new_driver, self.browser, switch_to)
+        return new_driver
+
+    def _register_driver(self, new_driver: WebDriver, browser_name: str, switch_to: bool) -> None:
+        # Same as _handle_new_driver, without setting window size
+        self._drivers_list.append(new_driver)
+        self._BaseCase__driver_browser_map[new_driver] = browser_name
+        if switch_to:
+            self.driver = new_driver
+            self.browser = browser_name
+
+    @property
+    def session_pool_enabled(self) -> bool:
+        """
+        True if drivers are reused across tests (ini option pb_session_pool). Not available for TestProject drivers
+        (each one reports its own test) nor with SeleniumBase --reuse-session
+        """
+        return self.pbconfig.pb_session_pool is True \
+            and self.pbconfig.tp_dev_token is None \
+            and getattr(self, "_reuse_session", False) is not True \
+            and not self._special_drivers_enabled
+
+    @property
+    def _special_drivers_enabled(self) -> bool:
+        # Recorded (replayed or fake) drivers can not be shared by several tests
+        return self.pbconfig.pb_webdriver_record_dir is not None \
+            or self.pbconfig.pb_webdriver_replay_dir is not None \
+            or self.pbconfig.pb_fake_dom is True
+
+    @property
+    def lazy_browser_enabled(self) -> bool:
+        """
+        True if the first browser is started the first time it is used, instead of in setUp (ini option
+        pb_lazy_browser). Not available with SeleniumBase --reuse-session
+        """
+        return self.pbconfig.pb_lazy_browser is True and getattr(self, "_reuse_session", False) is not True
+
+    def _get_lazy_driver(self, driver_options: dict, switch_to: bool) -> pb_webdriver.LazyDriver:
+        def launch() -> WebDriver:
+            return self.get_new_driver(switch_to=self.driver is lazy_driver, **driver_options)
+
+        def on_start(lazy: pb_webdriver.LazyDriver, new_driver: WebDriver) -> None:
+            # From now on, the real driver is used instead of the lazy one
+            self._drivers_list.remove(new_driver)
+            self._drivers_list[self._drivers_list.index(lazy)] = new_driver
+            self._BaseCase__driver_browser_map.pop(lazy, None)
+            if self._default_driver is lazy:
+                self._default_driver = new_driver
+
+        lazy_driver = pb_webdriver.LazyDriver(launch, on_start)
+        self._register_driver(lazy_driver, pb_util.first_not_none(driver_options["browser"], self.browser), switch_to)
+        return lazy_driver
+
+    def _stop_lazy_drivers(self) -> None:
+        # Browsers not used by the test are not started at the end (i.e. to take failure screenshots)
+        for driver in getattr(self, "_drivers_list", []):
+            if isinstance(driver, pb_webdriver.LazyDriver):
+                driver.stop_lazily()
+
+    @overrides
+    def save_teardown_screenshot(self) -> None:
+        self._stop_lazy_drivers()
+        super().save_teardown_screenshot()
+
+    @overrides
+    def tearDown(self) -> None:
+        self._stop_lazy_drivers()
+        super().tearDown()
+
+    @property
+    def warm_pool_size(self) -> int:
+        """
+        Number of drivers kept pre-launched in background (ini option pb_warm_pool_size). Same restrictions as
+        session_pool_enabled
+        """
+        if self.pbconfig.pb_warm_pool_size <= 0 \
+                or self.pbconfig.tp_dev_token is not None \
+                or getattr(self, "_reuse_session", False) is True \
+                or self._special_drivers_enabled:
+            return 0
+        return self.pbconfig.pb_warm_pool_size
+
+    @property
+    def session_pool(self) -> pb_session_pool.SessionPool:
+        return pb_session_pool.get_session_pool(self.pbconfig.pb_session_pool_max_reuse)
+
+    def _warm_session_pool(self, pool_key: str, driver_options: dict) -> None:
+        # Next drivers with the same options are launched in background, by a new PombaseCase that only has the options
+        # needed to launch a driver (so the background thread does not share any state with this one)
+        if self.warm_pool_size <= 0:
+            return
+        launcher: PombaseCase = self.__class__.__new__(self.__class__)
+        launcher.__dict__.update({name: getattr(self, name, None) for name in _LAUNCHER_ATTRIBUTES})
+        launcher._drivers_list = []
+        launcher._BaseCase__driver_browser_map = {}
+
+        def launch() -> WebDriver:
+            new_driver = BaseCase.get_new_driver(launcher, switch_to=False, **driver_options)
+            launcher._drivers_list.remove(new_driver)
+            launcher._BaseCase__driver_browser_map.pop(new_driver, None)
+            return new_driver
+
+        self.session_pool.warm(pool_key, launch, self.warm_pool_size)
+
+    # noinspection PyPep8Naming
+    @overrides
+    def _BaseCase__quit_all_drivers(self) -> None:
+        # Drivers taken from (or added to) the session pool are given back to it, instead of quitting them
+        for driver in list(self._drivers_list):
+            pool_key = self._session_pool_keys.pop(driver, None)
+            if pool_key is not None and self.session_pool.release(driver, pool_key):
+                self._drivers_list.remove(driver)
+        # noinspection PyUnresolvedReferences
+        super()._BaseCase__quit_all_drivers()
 
     def _handle_new_driver(self, new_driver: WebDriver, browser_name: str, switch_to: bool) -> None:
         self._drivers_list.append(new_driver)
@@ -574,6 +799,249 @@ class PombaseCase(BaseCase, EnforceOverrides):
         selected: list[WebElement] = select.all_selected_options
         return [item.text for item in selected]
 
+    def get_field_snapshot(self,
+                           selector: Union[str, web_node.GenericNode],
+                           by: str = None,
+                           timeout: pb_types.TimeoutType = None, ) -> dict:
+        """
+        Waits until element is visible, and returns (in only one browser call) a dict with keys:
+        tag, type, text, value, checked, selected (texts of selected options), visible
+        """
+        timeout = self._sb_timeout(timeout, SMALL_TIMEOUT)
+        selector, by = _script_selector_by(selector, by)
+        if "::shadow" in selector:
+            return self._get_field_snapshot_by_properties(selector, by, timeout)
+        success, snapshot = pb_util.wait_until(self.execute_script,
+                                               args=[pb_js.FIELD_SNAPSHOT, selector, by, False, False],
+                                               timeout=timeout,
+                                               expected=None,
+                                               equals=False, )
+        if success is False:
+            raise ElementNotVisibleException(f"Element {selector} was not visible after {timeout} seconds")
+        return snapshot
+
+    def get_field_snapshots(self, selector: Union[str, web_node.GenericNode], by: str = None) -> list[dict]:
+        """Same as get_field_snapshot, but for all elements found (only visible ones if node ignores invisible)"""
+        node = web_node.node_from(selector, by)
+        selector, by = _script_selector_by(node)
+        if "::shadow" in selector:
+            return [self._get_field_snapshot_by_properties(n, None, None) for n in node.get_multiple_nodes()]
+        return self.execute_script(pb_js.FIELD_SNAPSHOT, selector, by, True, node.ignore_invisible)
+
+    def _get_field_snapshot_by_properties(self,
+                                          selector: Union[str, web_node.GenericNode],
+                                          by: Optional[str],
+                                          timeout: Optional[pb_types.TimeoutType]) -> dict:
+        # Same dict as get_field_snapshot, reading each property with its own browser call. Used for shadow DOM
+        # selectors, that pb_js.FIELD_SNAPSHOT does not understand (SeleniumBase methods do)
+        tag_name = self.get_tag_name(selector, by, timeout)
+        element_type = self.get_attribute(selector, "type", by, timeout, hard_fail=False)
+        is_checkable = pb_util.caseless_equal(tag_name, "input") and isinstance(element_type, str) \
+            and pb_util.caseless_text_in_texts(element_type, ["checkbox", "radio"])
+        is_select = pb_util.caseless_equal(tag_name, "select")
+        return {
+            "tag": tag_name,
+            "type": element_type,
+            "text": self.get_text(selector, by, timeout),
+            "value": self.get_attribute(selector, "value", by, timeout, hard_fail=False),
+            "checked": self.is_selected(selector, by, timeout) if is_checkable else None,
+            "selected": self.get_selected_options(selector, by, timeout) if is_select else None,
+            "visible": True,
+        }
+
+    def get_nodes_snapshot(self, nodes: list[web_node.GenericNode]) -> list[dict]:
+        """
+        Searches all nodes in only one browser call. Nodes must be in pre-order (parents before children).
+        Returns one dict per node with keys: count, visible, fields (field snapshots, only for leaf nodes), frame
+        """
+        positions = {node: position for position, node in enumerate(nodes)}
+        specs = []
+        for node in nodes:
+            selector, by = _script_selector_by(node)
+            specs.append(
+                [selector, by, node.ignore_invisible, positions.get(node.parent), node.is_leaf, node.is_multiple],
+            )
+        return self.execute_script(pb_js.NODES_SNAPSHOT, specs)
+
+    def get_table_snapshot(self, table: web_node.TableNode, with_rows: bool = True) -> Optional[dict]:
+        """
+        Reads the header cells and all the data cells of table in only one browser call (data cells are not read, and
+        rows is an empty list, if with_rows is False).
+        Returns None if table is not visible, or a dict with keys: headers (field snapshots of the header cells, None
+        if table has no header cell locator), rows (list with the field snapshots of the cells of each data row),
+        epoch (see get_table_epoch)
+        """
+        selector, by = _script_selector_by(table)
+
+        def relative(node: Optional[web_node.GenericNode], locator: web_node.Locator) -> Optional[list]:
+            if node is None or locator is None:
+                return None
+            return [locator.as_xpath_selector(), node.ignore_invisible]
+
+        # Cells nodes of each row are created on demand, with default ignore_invisible
+        cells = [table.data_cell_locator.as_xpath_selector(), web_node.MultipleWebNode.default_ignore_invisible]
+        return self.execute_script(pb_js.TABLE_SNAPSHOT,
+                                   selector,
+                                   by,
+                                   relative(table.mwn_header_cells, table.header_cell_locator),
+                                   relative(table.mwn_data_rows, table.data_row_locator) if with_rows else None,
+                                   cells, )
+
+    def get_table_epoch(self, table: web_node.TableNode) -> Optional[str]:
+        """
+        Value that changes whenever table changes (see pb_js.TABLE_HELPERS), or None if table is not visible.
+        Much lighter than get_table_snapshot: used to know if a previous table snapshot is still valid
+        """
+        selector, by = _script_selector_by(table)
+        return self.execute_script(pb_js.TABLE_EPOCH, selector, by)
+
+    def are_nodes_visible(self, nodes: list[web_node.GenericNode]) -> list[bool]:
+        """
+        Checks visibility of all nodes (same as `is_element_visible` for each one) in only one browser call.
+        Nodes inside an iframe or a shadow root can not be checked this way, so they are checked one by one
+        """
+        batched = []
+        specs = []
+        for node in nodes:
+            selector, by = _script_selector_by(node)
+            if "::shadow" not in selector:
+                ancestors = [_script_selector_by(a) for a in node.ancestors if a.locator is not None]
+                batched.append(node)
+                specs.append([selector, by, ancestors])
+        results = {}
+        if len(specs) > 0:
+            try:
+                results = dict(zip(batched, self.execute_script(pb_js.NODES_VISIBLE, specs)))
+            except WebDriverException:
+                pass
+        return [node.is_element_visible() if results.get(node) is None else results[node] for node in nodes]
+
+    def get_nodes_load_state(self,
+                             nodes: list[web_node.GenericNode],
+                             relative_xpaths: list[Optional[str]],
+                             force_count_not_zero: bool = True, ) -> dict:
+        """
+        Checks counts of all nodes in only one browser call. nodes[0] is the loaded node, the rest must be its
+        descendants, in pre-order. relative_xpaths are used for descendants of multiple nodes.
+        Returns a dict with keys: failures (list of [node position, element indexes, count]),
+        frame (True if an iframe was found, so nodes inside it could not be checked)
+        """
+        positions = {node: position for position, node in enumerate(nodes)}
+        specs = []
+        for node, relative_xpath in zip(nodes, relative_xpaths):
+            selector, by = _script_selector_by(node) if node.locator is not None else (None, None)
+            specs.append([selector,
+                          by,
+                          relative_xpath,
+                          node.ignore_invisible,
+                          web_node.valid_count_bounds(node.valid_count),
+                          node.is_multiple,
+                          [positions[child] for child in node.children], ])
+        ancestors = [_script_selector_by(node) for node in nodes[0].ancestors if node.locator is not None]
+        return self.execute_script(pb_js.NODES_LOADED, specs, force_count_not_zero, ancestors)
+
+    @property
+    def browser_waits_enabled(self) -> bool:
+        """
+        False if disabled with ini option pb_disable_browser_waits, or if current driver is a browserless FakeDomDriver
+        (its document only changes with commands, so waiting in the "browser" would just repeat the same check)
+        """
+        return self.pbconfig.pb_disable_browser_waits is False and not self._is_fake_dom_driver()
+
+    def _is_fake_dom_driver(self) -> bool:
+        # fake_dom module is already imported if any FakeDomDriver was created (importing it here would need lxml)
+        fake_dom = sys.modules.get(f"{__package__}.fake_dom")
+        return fake_dom is not None and isinstance(getattr(self, "driver", None), fake_dom.FakeDomDriver)
+
+    def wait_in_browser(self,
+                        selector: Union[str, web_node.GenericNode],
+                        by: str = None,
+                        condition: str = "visible",
+                        parameter: Any = None,
+                        timeout: pb_types.TimeoutType = None, ) -> Optional[bool]:
+        """
+        Waits in the browser, using a MutationObserver, until condition holds (see pb_js.WAIT_FOR for conditions).
+        No WebDriver calls are done while waiting, and there is no delay after condition holds.
+        Returns True if condition holds before timeout, False if not, or None if the wait can not be done in the
+        browser (disabled with pb_disable_browser_waits, script error...), so the usual polling should be used.
+        """
+        if self.browser_waits_enabled is False:
+            return None
+        deadline = pb_util.Deadline.from_timeout(timeout)
+        only_visible = selector.ignore_invisible if isinstance(selector, web_node.GenericNode) else False
+        selector, by = _script_selector_by(selector, by)
+        if "::shadow" in selector:
+            return None
+        # Used if the browser answers before the chunk ends (i.e., a replay driver answers recorded results at once)
+        delays = pb_util.get_default_poll_schedule().delays()
+        while True:
+            chunk = min(deadline.remaining, _BROWSER_WAIT_CHUNK)
+            chunk_start = time.time()
+            try:
+                result = self.driver.execute_async_script(
+                    pb_js.WAIT_FOR, selector, by, condition, parameter, only_visible, int(chunk * 1000),
+                )
+            except WebDriverException:
+                # i.e., page unloaded while waiting
+                return None
+            if result is True:
+                return True
+            if result is not False:
+                # Script error
+                return None
+            if deadline.expired:
+                return False
+            if time.time() - chunk_start < chunk:
+                # Condition was not waited for the whole chunk: back off instead of asking again at once
+                time.sleep(min(next(delays), deadline.remaining))
+                if deadline.expired:
+                    return False
+
+    def wait_for_change(self, timeout: pb_types.TimeoutType = None) -> bool:
+        """
+        Waits (at most a couple of seconds) until page changes. Returns False if page did not change or browser waits
+        are not available. Used as `wait_for_change` in pb_util.wait_until
+        """
+        if timeout is None:
+            timeout = _BROWSER_CHANGE_WAIT
+        timeout = min(pb_util.remaining_timeout(timeout), _BROWSER_CHANGE_WAIT)
+        return self.wait_in_browser("html", condition="mutation", timeout=timeout) is True
+
+    def _sb_timeout(self, timeout: Optional[pb_types.NumberType], default: pb_types.NumberType = LARGE_TIMEOUT):
+        # Same timeout that SeleniumBase uses (see BaseCase.__get_new_timeout)
+        if not timeout:
+            timeout = default
+        if self.timeout_multiplier and timeout == default:
+            try:
+                timeout = int(math.ceil(max(float(self.timeout_multiplier), 0.5) * timeout))
+            except ValueError:
+                pass
+        return timeout
+
+    @contextmanager
+    def _browser_wait_first(self,
+                            selector: str,
+                            by: str,
+                            condition: str,
+                            parameter: Any,
+                            timeout: Optional[pb_types.TimeoutType]) -> Iterator[Optional[pb_types.NumberType]]:
+        # Waits in the browser, and yields the timeout for the SeleniumBase wait that follows (that finds the element
+        # at once if the browser wait succeeded, or raises the usual SeleniumBase error if not, reporting the original
+        # timeout instead of the small one it was given)
+        if self.browser_waits_enabled is False:
+            yield _recalculate_timeout(timeout)
+            return
+        if not isinstance(timeout, pb_util.Deadline):
+            timeout = pb_util.Deadline(self._sb_timeout(timeout))
+        if self.wait_in_browser(selector, by, condition, parameter, timeout) is not False:
+            yield _recalculate_timeout(timeout)
+            return
+        try:
+            yield _MIN_SB_TIMEOUT
+        except Exception as e:
+            _replace_timeout_in_message(e, _MIN_SB_TIMEOUT, timeout.timeout)
+            raise
+
     def deselect_all_options(self,
                              selector: Union[str, web_node.GenericNode],
                              by: str = None,
@@ -590,37 +1058,44 @@ class PombaseCase(BaseCase, EnforceOverrides):
     @overrides
     def click(self, selector, by=By.CSS_SELECTOR, timeout=None, delay=0):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().click(selector, by, timeout, delay)
 
     @overrides
     def slow_click(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().slow_click(selector, by, timeout)
 
     @overrides
     def double_click(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().double_click(selector, by, timeout)
 
     @overrides
     def click_chain(self, selectors_list, by=By.CSS_SELECTOR, timeout=None, spacing=0):
         if isinstance(selectors_list, web_node.GenericNode):
             selectors_list, by = [selectors_list.locator.selector], selectors_list.locator.by
+        timeout = _recalculate_timeout(timeout)
         super().click_chain(selectors_list, by, timeout, spacing)
 
     @overrides
     def update_text(self, selector, text, by=By.CSS_SELECTOR, timeout=None, retry=False):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().update_text(selector, text, by, timeout, retry)
 
     @overrides
     def add_text(self, selector, text, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().add_text(selector, text, by, timeout)
 
     @overrides
     def type(self, selector, text, by=By.CSS_SELECTOR, timeout=None, retry=False):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().type(selector, text, by, timeout, retry)
 
     @overrides
@@ -631,11 +1106,13 @@ class PombaseCase(BaseCase, EnforceOverrides):
     @overrides
     def clear(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().clear(selector, by, timeout)
 
     @overrides
     def focus(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().focus(selector, by, timeout)
 
     @overrides
@@ -661,16 +1138,19 @@ class PombaseCase(BaseCase, EnforceOverrides):
     @overrides
     def get_text(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().get_text(selector, by, timeout)
 
     @overrides
     def get_attribute(self, selector, attribute, by=By.CSS_SELECTOR, timeout=None, hard_fail=True):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().get_attribute(selector, attribute, by, timeout, hard_fail)
 
     @overrides
     def set_attribute(self, selector, attribute, value, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().set_attribute(selector, attribute, value, by, timeout)
 
     @overrides
@@ -686,6 +1166,7 @@ class PombaseCase(BaseCase, EnforceOverrides):
     @overrides
     def remove_attribute(self, selector, attribute, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().remove_attribute(selector, attribute, by, timeout)
 
     @overrides
@@ -696,11 +1177,13 @@ class PombaseCase(BaseCase, EnforceOverrides):
     @overrides
     def get_property_value(self, selector, property, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().get_property_value(selector, property, by, timeout)
 
     @overrides
     def get_image_url(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().get_image_url(selector, by, timeout)
 
     @overrides
@@ -716,11 +1199,13 @@ class PombaseCase(BaseCase, EnforceOverrides):
     @overrides
     def click_visible_elements(self, selector, by=By.CSS_SELECTOR, limit=0, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().click_visible_elements(selector, by, limit, timeout)
 
     @overrides
     def click_nth_visible_element(self, selector, number, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().click_nth_visible_element(selector, number, by, timeout)
 
     @overrides
@@ -731,11 +1216,13 @@ class PombaseCase(BaseCase, EnforceOverrides):
     @overrides
     def is_checked(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().is_checked(selector, by, timeout)
 
     @overrides
     def is_selected(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().is_selected(selector, by, timeout)
 
     @overrides
@@ -778,6 +1265,7 @@ class PombaseCase(BaseCase, EnforceOverrides):
                         timeout=None):
         hover_selector, hover_by = _recalculate_selector_by(hover_selector, hover_by)
         click_selector, click_by = _recalculate_selector_by(click_selector, click_by)
+        timeout = _recalculate_timeout(timeout)
         return super().hover_and_click(hover_selector, click_selector, hover_by, click_by, timeout)
 
     @overrides
@@ -785,6 +1273,7 @@ class PombaseCase(BaseCase, EnforceOverrides):
                                timeout=None):
         hover_selector, hover_by = _recalculate_selector_by(hover_selector, hover_by)
         click_selector, click_by = _recalculate_selector_by(click_selector, click_by)
+        timeout = _recalculate_timeout(timeout)
         return super().hover_and_double_click(hover_selector, click_selector, hover_by, click_by, timeout)
 
     @overrides
@@ -792,31 +1281,37 @@ class PombaseCase(BaseCase, EnforceOverrides):
                       timeout=None):
         drag_selector, drag_by = _recalculate_selector_by(drag_selector, drag_by)
         drop_selector, drop_by = _recalculate_selector_by(drop_selector, drop_by)
+        timeout = _recalculate_timeout(timeout)
         return super().drag_and_drop(drag_selector, drop_selector, drag_by, drop_by, timeout)
 
     @overrides
     def drag_and_drop_with_offset(self, selector, x, y, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().drag_and_drop_with_offset(selector, x, y, by, timeout)
 
     @overrides
     def select_option_by_text(self, dropdown_selector, option, dropdown_by=By.CSS_SELECTOR, timeout=None):
         dropdown_selector, dropdown_by = _recalculate_selector_by(dropdown_selector, dropdown_by)
+        timeout = _recalculate_timeout(timeout)
         super().select_option_by_text(dropdown_selector, option, dropdown_by, timeout)
 
     @overrides
     def select_option_by_index(self, dropdown_selector, option, dropdown_by=By.CSS_SELECTOR, timeout=None):
         dropdown_selector, dropdown_by = _recalculate_selector_by(dropdown_selector, dropdown_by)
+        timeout = _recalculate_timeout(timeout)
         super().select_option_by_index(dropdown_selector, option, dropdown_by, timeout)
 
     @overrides
     def select_option_by_value(self, dropdown_selector, option, dropdown_by=By.CSS_SELECTOR, timeout=None):
         dropdown_selector, dropdown_by = _recalculate_selector_by(dropdown_selector, dropdown_by)
+        timeout = _recalculate_timeout(timeout)
         super().select_option_by_value(dropdown_selector, option, dropdown_by, timeout)
 
     @overrides
     def switch_to_frame(self, frame, timeout=None):
         frame, _ = _recalculate_selector_by(frame)
+        timeout = _recalculate_timeout(timeout)
         super().switch_to_frame(frame, timeout)
 
     @overrides
@@ -862,21 +1357,25 @@ class PombaseCase(BaseCase, EnforceOverrides):
     @overrides
     def scroll_to(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().scroll_to(selector, by, timeout)
 
     @overrides
     def scroll_to_element(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().scroll_to_element(selector, by, timeout)
 
     @overrides
     def slow_scroll_to(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().slow_scroll_to(selector, by, timeout)
 
     @overrides
     def slow_scroll_to_element(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().slow_scroll_to_element(selector, by, timeout)
 
     @overrides
@@ -932,66 +1431,79 @@ class PombaseCase(BaseCase, EnforceOverrides):
     @overrides
     def choose_file(self, selector, file_path, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().choose_file(selector, file_path, by, timeout)
 
     @overrides
     def set_value(self, selector, text, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().set_value(selector, text, by, timeout)
 
     @overrides
     def js_update_text(self, selector, text, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().js_update_text(selector, text, by, timeout)
 
     @overrides
     def js_type(self, selector, text, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().js_type(selector, text, by, timeout)
 
     @overrides
     def set_text(self, selector, text, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().set_text(selector, text, by, timeout)
 
     @overrides
     def jquery_update_text(self, selector, text, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().jquery_update_text(selector, text, by, timeout)
 
     @overrides
     def input(self, selector, text, by=By.CSS_SELECTOR, timeout=None, retry=False):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().input(selector, text, by, timeout, retry)
 
     @overrides
     def fill(self, selector, text, by=By.CSS_SELECTOR, timeout=None, retry=False):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().fill(selector, text, by, timeout, retry)
 
     @overrides
     def write(self, selector, text, by=By.CSS_SELECTOR, timeout=None, retry=False):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().write(selector, text, by, timeout, retry)
 
     @overrides
     def send_keys(self, selector, text, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         super().send_keys(selector, text, by, timeout)
 
     @overrides
     def wait_for_element_visible(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
-        return super().wait_for_element_visible(selector, by, timeout)
+        with self._browser_wait_first(selector, by, "visible", None, timeout) as timeout:
+            return super().wait_for_element_visible(selector, by, timeout)
 
     @overrides
     def wait_for_element_not_present(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
-        return super().wait_for_element_not_present(selector, by, timeout)
+        with self._browser_wait_first(selector, by, "not_present", None, timeout) as timeout:
+            return super().wait_for_element_not_present(selector, by, timeout)
 
     @overrides
     def assert_element_not_present(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().assert_element_not_present(selector, by, timeout)
 
     @overrides
@@ -1002,36 +1514,43 @@ class PombaseCase(BaseCase, EnforceOverrides):
     @overrides
     def wait_for_element_present(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
-        return super().wait_for_element_present(selector, by, timeout)
+        with self._browser_wait_first(selector, by, "present", None, timeout) as timeout:
+            return super().wait_for_element_present(selector, by, timeout)
 
     @overrides
     def wait_for_element(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
-        return super().wait_for_element(selector, by, timeout)
+        with self._browser_wait_first(selector, by, "visible", None, timeout) as timeout:
+            return super().wait_for_element(selector, by, timeout)
 
     @overrides
     def get_element(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().get_element(selector, by, timeout)
 
     @overrides
     def assert_element_present(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().assert_element_present(selector, by, timeout)
 
     @overrides
     def find_element(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().find_element(selector, by, timeout)
 
     @overrides
     def assert_element(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().assert_element(selector, by, timeout)
 
     @overrides
     def assert_element_visible(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().assert_element_visible(selector, by, timeout)
 
     @overrides
@@ -1053,84 +1572,101 @@ class PombaseCase(BaseCase, EnforceOverrides):
     @overrides
     def wait_for_text_visible(self, text, selector="html", by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
-        return super().wait_for_text_visible(text, selector, by, timeout)
+        with self._browser_wait_first(selector, by, "text", text, timeout) as timeout:
+            return super().wait_for_text_visible(text, selector, by, timeout)
 
     @overrides
     def wait_for_exact_text_visible(self, text, selector="html", by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
-        return super().wait_for_exact_text_visible(text, selector, by, timeout)
+        with self._browser_wait_first(selector, by, "exact_text", text, timeout) as timeout:
+            return super().wait_for_exact_text_visible(text, selector, by, timeout)
 
     @overrides
     def wait_for_text(self, text, selector="html", by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
-        return super().wait_for_text(text, selector, by, timeout)
+        with self._browser_wait_first(selector, by, "text", text, timeout) as timeout:
+            return super().wait_for_text(text, selector, by, timeout)
 
     @overrides
     def find_text(self, text, selector="html", by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().find_text(text, selector, by, timeout)
 
     @overrides
     def assert_text_visible(self, text, selector="html", by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().assert_text_visible(text, selector, by, timeout)
 
     @overrides
     def assert_text(self, text, selector="html", by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().assert_text(text, selector, by, timeout)
 
     @overrides
     def assert_exact_text(self, text, selector="html", by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().assert_exact_text(text, selector, by, timeout)
 
     @overrides
     def wait_for_element_absent(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
-        return super().wait_for_element_absent(selector, by, timeout)
+        with self._browser_wait_first(selector, by, "not_present", None, timeout) as timeout:
+            return super().wait_for_element_absent(selector, by, timeout)
 
     @overrides
     def assert_element_absent(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().assert_element_absent(selector, by, timeout)
 
     @overrides
     def wait_for_element_not_visible(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
-        return super().wait_for_element_not_visible(selector, by, timeout)
+        with self._browser_wait_first(selector, by, "not_visible", None, timeout) as timeout:
+            return super().wait_for_element_not_visible(selector, by, timeout)
 
     @overrides
     def assert_element_not_visible(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().assert_element_not_visible(selector, by, timeout)
 
     @overrides
     def wait_for_text_not_visible(self, text, selector="html", by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
-        return super().wait_for_text_not_visible(text, selector, by, timeout)
+        with self._browser_wait_first(selector, by, "text_not_visible", text, timeout) as timeout:
+            return super().wait_for_text_not_visible(text, selector, by, timeout)
 
     @overrides
     def assert_text_not_visible(self, text, selector="html", by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().assert_text_not_visible(text, selector, by, timeout)
 
     @overrides
     def deferred_assert_element(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().deferred_assert_element(selector, by, timeout)
 
     @overrides
     def deferred_assert_text(self, text, selector="html", by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().deferred_assert_text(text, selector, by, timeout)
 
     @overrides
     def delayed_assert_element(self, selector, by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().delayed_assert_element(selector, by, timeout)
 
     @overrides
     def delayed_assert_text(self, text, selector="html", by=By.CSS_SELECTOR, timeout=None):
         selector, by = _recalculate_selector_by(selector, by)
+        timeout = _recalculate_timeout(timeout)
         return super().delayed_assert_text(text, selector, by, timeout)
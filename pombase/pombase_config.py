@@ -34,6 +34,53 @@ class PombaseConfig:
         v: pytest_plugin.PytestVar = pytest_plugin.PytestVar.PB_DISABLE_TESTPROJECT
         return v.ini_value(self.pytest_config)
 
+    @property
+    def pb_disable_browser_waits(self) -> bool:
+        v: pytest_plugin.PytestVar = pytest_plugin.PytestVar.PB_DISABLE_BROWSER_WAITS
+        return v.ini_value(self.pytest_config)
+
+    @property
+    def pb_poll_schedule(self) -> str:
+        v: pytest_plugin.PytestVar = pytest_plugin.PytestVar.PB_POLL_SCHEDULE
+        return v.ini_value(self.pytest_config)
+
+    @property
+    def pb_session_pool(self) -> bool:
+        v: pytest_plugin.PytestVar = pytest_plugin.PytestVar.PB_SESSION_POOL
+        return v.ini_value(self.pytest_config)
+
+    @property
+    def pb_session_pool_max_reuse(self) -> int:
+        v: pytest_plugin.PytestVar = pytest_plugin.PytestVar.PB_SESSION_POOL_MAX_REUSE
+        value = v.ini_value(self.pytest_config)
+        return int(value) if value is not None else 0
+
+    @property
+    def pb_warm_pool_size(self) -> int:
+        v: pytest_plugin.PytestVar = pytest_plugin.PytestVar.PB_WARM_POOL_SIZE
+        value = v.ini_value(self.pytest_config)
+        return int(value) if value is not None else 0
+
+    @property
+    def pb_lazy_browser(self) -> bool:
+        v: pytest_plugin.PytestVar = pytest_plugin.PytestVar.PB_LAZY_BROWSER
+        return v.ini_value(self.pytest_config)
+
+    @property
+    def pb_webdriver_record_dir(self) -> Optional[str]:
+        v: pytest_plugin.PytestVar = pytest_plugin.PytestVar.PB_WEBDRIVER_RECORD_DIR
+        return v.ini_value(self.pytest_config)
+
+    @property
+    def pb_webdriver_replay_dir(self) -> Optional[str]:
+        v: pytest_plugin.PytestVar = pytest_plugin.PytestVar.PB_WEBDRIVER_REPLAY_DIR
+        return v.ini_value(self.pytest_config)
+
+    @property
+    def pb_fake_dom(self) -> bool:
+        v: pytest_plugin.PytestVar = pytest_plugin.PytestVar.PB_FAKE_DOM
+        return v.ini_value(self.pytest_config)
+
     @property
     def tp_dev_token(self) -> Optional[str]:
         if self.pb_disable_testproject:
@@ -16,6 +16,8 @@ from . import constant as constants
 from . import pombase_config as pb_config
 from . import pombase_case as pombase_case
 from . import util as pb_util
+from . import aio as pb_aio
+from . import session_pool as pb_session_pool
 
 PytestVariableType = Literal['string', 'pathlist', 'args', 'linelist', 'bool']
 
@@ -25,6 +27,61 @@ class PytestVar(Enum):
     """Enumeration of environment variable names used"""
 
     PB_DISABLE_TESTPROJECT: PytestVar = ("PB_DISABLE_TESTPROJECT", "Disable TestProject", "bool", False)
+    PB_DISABLE_BROWSER_WAITS: PytestVar = (
+        "PB_DISABLE_BROWSER_WAITS",
+        "Disable waits done in the browser (MutationObserver), and use python polling instead",
+        "bool",
+        False,
+    )
+    PB_POLL_SCHEDULE: PytestVar = (
+        "PB_POLL_SCHEDULE",
+        "Default poll schedule of waits done in python: 'constant[:step]' (0.5 seconds if step is not given) or "
+        "'backoff[:initial=0.02/0.05/0.1,factor=2,cap=1,jitter=0.1]'",
+        "string",
+        "constant",
+    )
+    PB_SESSION_POOL: PytestVar = (
+        "PB_SESSION_POOL",
+        "Reuse browser sessions across tests (reset between tests) instead of starting a new browser for each test",
+        "bool",
+        False,
+    )
+    PB_SESSION_POOL_MAX_REUSE: PytestVar = (
+        "PB_SESSION_POOL_MAX_REUSE",
+        "Number of tests a pooled browser session is used for before it is replaced (0: no limit)",
+        "string",
+        "50",
+    )
+    PB_WARM_POOL_SIZE: PytestVar = (
+        "PB_WARM_POOL_SIZE",
+        "Number of browsers kept pre-launched in background, so tests do not wait for browser startup (0: disabled)",
+        "string",
+        "0",
+    )
+    PB_LAZY_BROWSER: PytestVar = (
+        "PB_LAZY_BROWSER",
+        "Start the browser the first time the test uses it, instead of before the test",
+        "bool",
+        False,
+    )
+    PB_WEBDRIVER_RECORD_DIR: PytestVar = (
+        "PB_WEBDRIVER_RECORD_DIR",
+        "Folder where all WebDriver commands (and responses) of each test are recorded",
+        "string",
+        None,
+    )
+    PB_WEBDRIVER_REPLAY_DIR: PytestVar = (
+        "PB_WEBDRIVER_REPLAY_DIR",
+        "Folder with WebDriver recordings (see pb_webdriver_record_dir) replayed instead of using a browser",
+        "string",
+        None,
+    )
+    PB_FAKE_DOM: PytestVar = (
+        "PB_FAKE_DOM",
+        "Use browserless drivers (static HTML parsed with lxml, see pombase.fake_dom) instead of browsers",
+        "bool",
+        False,
+    )
     TP_DEV_TOKEN: PytestVar = ("TP_DEV_TOKEN", "TestProject developer token", "string", None)
     TP_AGENT_URL: PytestVar = ("TP_AGENT_URL", "TestProject agent url", "string", None)
     TP_DEFAULT_TIMEOUT: PytestVar = (
@@ -117,7 +174,10 @@ class PytestVar(Enum):
         v = os.environ.get(self.env_var_name, None)
         return v if v not in constants.ALMOST_NONE else None
 
-    def ini_value(self, config: PytestConfig) -> Union[str, list, list[str], bool]:
+    def ini_value(self, config: Optional[PytestConfig]) -> Union[str, list, list[str], bool]:
+        # Without pytest config (i.e., PombaseCase used outside pytest), the default value is used
+        if config is None:
+            return self.default_value
         v = config.getini(self.ini_name)
         return v if v not in constants.ALMOST_NONE else None
 
@@ -147,6 +207,11 @@ def pytest_addoption(parser: argparsing.Parser) -> None:
 
 def pytest_configure(config: PytestConfig) -> None:
     pb_config.PombaseConfig().pytest_config = config
+    pb_util.set_default_poll_schedule(pb_config.PombaseConfig().pb_poll_schedule)
+
+
+def pytest_unconfigure() -> None:
+    pb_session_pool.close_session_pool()
 
 
 # noinspection PyProtectedMember,PyUnresolvedReferences
@@ -164,6 +229,7 @@ def pb(request: FixtureRequest):
         @overrides
         def tearDown(self):
             self.save_teardown_screenshot()
+            pb_aio.shutdown_executor(self)
             super().tearDown()
 
         def base_method(self):
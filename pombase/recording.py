@@ -0,0 +1,155 @@
+from __future__ import annotations
+import gzip
+import json
+import os
+import threading
+from typing import Any, Optional
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# Recording and replay of WebDriver traffic (ini options pb_webdriver_record_dir and pb_webdriver_replay_dir).
+# A recording is a gzipped JSON lines file: first line is the session ({session_id, capabilities, w3c}), and then one
+# line per command: [command, params, response]. Replay serves the recorded responses, in the same order, without any
+# browser: page-object logic runs exactly as it did when recording (as long as it sends the same commands).
+# Waits (polled from python, or done in the browser in chunks) may check their condition a different number of times
+# than when recording, because they stop at a deadline and replayed responses come at once. So when a read command
+# (see _POLLED_COMMANDS) is sent again with the same params, replay does not fail if the recording has a different
+# command there: it answers with the last response to that command (if it was polled more times than recorded) or
+# skips the recorded repetitions of read commands (if it was polled fewer times). Anything else that does not match
+# the recording raises a RuntimeError.
+
+# Commands whose params are checked in replay (besides the command name), to detect that replay went another way
+_CHECKED_PARAMS = {
+    Command.FIND_ELEMENT: ("using", "value"),
+    Command.FIND_ELEMENTS: ("using", "value"),
+    Command.FIND_CHILD_ELEMENT: ("using", "value"),
+    Command.FIND_CHILD_ELEMENTS: ("using", "value"),
+    Command.GET: ("url",),
+}
+
+# Commands that do not change the page, so repeating or skipping them in replay does not change what comes next.
+# Scripts are assumed to be polls when they are sent again with the same arguments
+_POLLED_COMMANDS = {
+    Command.FIND_ELEMENT, Command.FIND_ELEMENTS, Command.FIND_CHILD_ELEMENT, Command.FIND_CHILD_ELEMENTS,
+    Command.GET_ELEMENT_TEXT, Command.GET_ELEMENT_TAG_NAME, Command.GET_ELEMENT_ATTRIBUTE, Command.GET_ELEMENT_PROPERTY,
+    Command.GET_ELEMENT_VALUE_OF_CSS_PROPERTY, Command.IS_ELEMENT_SELECTED, Command.IS_ELEMENT_ENABLED,
+    Command.IS_ELEMENT_DISPLAYED, Command.GET_ELEMENT_SIZE, Command.GET_ELEMENT_LOCATION, Command.GET_ELEMENT_RECT,
+    Command.GET_CURRENT_URL, Command.GET_TITLE, Command.GET_PAGE_SOURCE, Command.GET_WINDOW_HANDLES,
+    Command.GET_CURRENT_WINDOW_HANDLE, Command.W3C_GET_WINDOW_HANDLES, Command.W3C_GET_CURRENT_WINDOW_HANDLE,
+    Command.EXECUTE_SCRIPT, Command.W3C_EXECUTE_SCRIPT, Command.EXECUTE_ASYNC_SCRIPT, Command.W3C_EXECUTE_SCRIPT_ASYNC,
+}
+# Browser waits (pb_js.WAIT_FOR) get the time they can wait as last argument, that is different in every call
+_TIMED_COMMANDS = {Command.EXECUTE_ASYNC_SCRIPT, Command.W3C_EXECUTE_SCRIPT_ASYNC}
+
+
+def _poll_key(command: str, params: dict) -> Optional[str]:
+    # Same key for the same read command with the same params (None if command is not a read command)
+    if command not in _POLLED_COMMANDS:
+        return None
+    if command in _TIMED_COMMANDS:
+        params = {**params, "args": list(params.get("args", []))[:-1]}
+    return command + json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+
+class RecordingConnection:
+    """Command executor that records every command sent (and its response) through `connection`"""
+
+    def __init__(self, connection: Any, path: str, session: dict) -> None:
+        self.connection = connection
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._write(session)
+
+    def _write(self, entry: Any) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def execute(self, command: str, params: dict) -> dict:
+        response = self.connection.execute(command, params)
+        # Serialized now: WebDriver.execute replaces element references in response with WebElement objects
+        self._write([command, params, response])
+        if command == Command.QUIT:
+            self.close()
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.connection, name)
+
+
+class ReplayConnection:
+    """
+    Command executor that answers with the responses of a recording, without any browser.
+    Read commands polled a different number of times than when recording are tolerated (see module comment)
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            lines = file.read().splitlines()
+        self.session: dict = json.loads(lines[0])
+        self.entries: list[list] = [json.loads(line) for line in lines[1:]]
+        self.position = 0
+        self.w3c = self.session["w3c"]
+        # Poll key -> last response replayed
+        self._polled: dict[str, dict] = {}
+
+    def execute(self, command: str, params: dict) -> dict:
+        if command == Command.NEW_SESSION:
+            response = {"sessionId": self.session["session_id"], "capabilities": self.session["capabilities"]}
+            return {"value": response} if self.w3c else {**response, "status": 0}
+        key = _poll_key(command, params)
+        position = self.position
+        # Polled fewer times than when recording: recorded repetitions are skipped
+        while position < len(self.entries) and not self._matches(position, command, params) \
+                and _poll_key(*self.entries[position][:2]) in self._polled:
+            position += 1
+        if position < len(self.entries) and self._matches(position, command, params):
+            response = self.entries[position][2]
+            self.position = position + 1
+            if key is not None:
+                self._polled[key] = response
+            return response
+        if key in self._polled:
+            # Polled more times than when recording: same response as last time
+            return self._polled[key]
+        if self.position >= len(self.entries):
+            raise RuntimeError(f"Replay of {self.path} has no more commands. Command: {command}, params: {params}")
+        recorded_command, recorded_params, _ = self.entries[self.position]
+        raise RuntimeError(
+            f"Replay of {self.path} does not match at command {self.position}. "
+            f"Recorded: {recorded_command} {recorded_params}. Sent: {command} {params}",
+        )
+
+    def _matches(self, position: int, command: str, params: dict) -> bool:
+        recorded_command, recorded_params, _ = self.entries[position]
+        checked = _CHECKED_PARAMS.get(command, ())
+        return recorded_command == command and all(recorded_params.get(key) == params.get(key) for key in checked)
+
+    @property
+    def finished(self) -> bool:
+        return self.position >= len(self.entries)
+
+
+def record_driver(driver: WebDriver, path: str) -> None:
+    """From now on, all commands sent by driver (and their responses) are recorded in path"""
+    session = {"session_id": driver.session_id, "capabilities": driver.capabilities, "w3c": driver.w3c}
+    driver.command_executor = RecordingConnection(driver.command_executor, path, session)
+
+
+def replay_driver(path: str) -> WebDriver:
+    """Driver that replays the recording in path (see record_driver)"""
+    return WebDriver(command_executor=ReplayConnection(path), desired_capabilities={})
+
+
+def recording_path(directory: str, test_id: str, number: int) -> str:
+    """File of the recording of driver `number` (0 for first driver) of a test"""
+    file_name = "".join(c if c.isalnum() or c in "._-" else "_" for c in test_id)
+    return os.path.join(directory, f"{file_name}.{number}.jsonl.gz")
@@ -0,0 +1,222 @@
+from __future__ import annotations
+import atexit
+import logging
+import threading
+from typing import Callable, Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from . import util as pb_util
+
+# Browser sessions reused across tests (ini option pb_session_pool). When a test ends, its drivers are reset and kept
+# idle (instead of quitting them), and a later test that asks for a driver with the same options gets one of them.
+# Each process (pytest-xdist worker) has its own pool.
+# The pool can also keep some drivers pre-launched (ini option pb_warm_pool_size): a background thread starts them
+# while tests run, so `get_new_driver` does not have to wait for the browser to start.
+
+_logger = logging.getLogger(__name__)
+
+# After this number of consecutive failed launches, a key is not warmed anymore
+_MAX_WARM_FAILURES = 3
+# Maximum time (seconds) waiting for a driver that is being pre-launched, before launching a new one instead
+WARM_DRIVER_TIMEOUT = 30
+
+_RESET_STORAGE_SCRIPT = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+class SessionPool:
+    """Idle drivers, grouped by the options used to create them (key)"""
+
+    def __init__(self, max_reuse: int = 0) -> None:
+        """max_reuse: number of tests a driver can be used for before it is quit (0 means no limit)"""
+        self.max_reuse = max_reuse
+        self._idle: dict[str, list[WebDriver]] = {}
+        self._uses: dict[WebDriver, int] = {}
+        self._lock = threading.Condition()
+        # Pre-warming: key -> [factory, size], drivers being launched and consecutive failures per key
+        self._warm: dict[str, list] = {}
+        self._starting: dict[str, int] = {}
+        self._failures: dict[str, int] = {}
+        self._warm_thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def acquire(self, key: str, timeout: float = WARM_DRIVER_TIMEOUT) -> Optional[WebDriver]:
+        """
+        Returns a healthy idle driver created with options `key`, or None if there is none.
+        If there is none but one is being pre-launched, waits for it (it is already started, so it is ready sooner
+        than a new one), at most `timeout` seconds (then None is returned, so a new driver is launched as usual)
+        """
+        deadline = pb_util.Deadline(timeout)
+        while True:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                while len(idle) == 0 and self._starting.get(key, 0) > 0 and not deadline.expired:
+                    self._lock.wait(deadline.remaining)
+                if len(idle) == 0:
+                    return None
+                driver = idle.pop(0)
+                self._lock.notify_all()
+            if self.is_healthy(driver):
+                return driver
+            self.discard(driver)
+
+    def release(self, driver: WebDriver, key: str) -> bool:
+        """
+        Resets driver and keeps it idle, so it can be acquired by next tests.
+        Returns False (and quits driver) if driver reached max_reuse or could not be reset.
+        """
+        with self._lock:
+            uses = self._uses.get(driver, 0) + 1
+            self._uses[driver] = uses
+        if (0 < self.max_reuse <= uses) or not self.reset(driver):
+            self.discard(driver)
+            return False
+        with self._lock:
+            if self._closed:
+                discard = True
+            else:
+                discard = False
+                self._idle.setdefault(key, []).append(driver)
+                self._lock.notify_all()
+        if discard:
+            self.discard(driver)
+            return False
+        return True
+
+    def warm(self, key: str, factory: Callable[[], WebDriver], size: int) -> None:
+        """
+        Keeps `size` idle drivers with options `key` pre-launched (calling `factory` in a background thread).
+        Drivers given back with `release` count as idle drivers too.
+        """
+        with self._lock:
+            if self._closed or size <= 0:
+                return
+            self._warm[key] = [factory, size]
+            if self._warm_thread is None:
+                self._warm_thread = threading.Thread(target=self._warm_loop, name="pombase-warm-pool", daemon=True)
+                self._warm_thread.start()
+            self._lock.notify_all()
+
+    def _next_warm_key(self) -> Optional[str]:
+        # Called with the lock held. Key that needs one more driver launched
+        for key, (_, size) in self._warm.items():
+            if len(self._idle.get(key, [])) + self._starting.get(key, 0) < size:
+                return key
+        return None
+
+    def _warm_loop(self) -> None:
+        while True:
+            with self._lock:
+                key = self._next_warm_key()
+                while key is None and not self._closed:
+                    self._lock.wait()
+                    key = self._next_warm_key()
+                if self._closed:
+                    return
+                factory = self._warm[key][0]
+                self._starting[key] = self._starting.get(key, 0) + 1
+            driver = None
+            # noinspection PyBroadException
+            try:
+                driver = factory()
+            except Exception:
+                _logger.warning("Driver could not be pre-launched", exc_info=True)
+            with self._lock:
+                self._starting[key] -= 1
+                if driver is None:
+                    self._failures[key] = self._failures.get(key, 0) + 1
+                    if self._failures[key] >= _MAX_WARM_FAILURES:
+                        self._warm.pop(key, None)
+                elif not self._closed:
+                    self._failures[key] = 0
+                    self._idle.setdefault(key, []).append(driver)
+                closed = self._closed
+                self._lock.notify_all()
+            if driver is not None and closed:
+                self.discard(driver)
+
+    @staticmethod
+    def is_healthy(driver: WebDriver) -> bool:
+        # noinspection PyBroadException
+        try:
+            return len(driver.window_handles) > 0 and driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def reset(driver: WebDriver) -> bool:
+        """
+        Leaves driver as a new one: only one window, no cookies nor storage, and about:blank loaded.
+        Returns False if driver could not be reset.
+        """
+        # noinspection PyBroadException
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            # Storage can only be cleared for the current origin, so it is done before leaving the page
+            driver.execute_script(_RESET_STORAGE_SCRIPT)
+            driver.delete_all_cookies()
+            if hasattr(driver, "execute_cdp_cmd"):
+                # Chromium: cookies of all domains, not only the current one
+                # noinspection PyBroadException,TryExceptPass
+                try:
+                    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                except Exception:
+                    pass
+            driver.get("about:blank")
+            return True
+        except Exception:
+            return False
+
+    def discard(self, driver: WebDriver) -> None:
+        with self._lock:
+            self._uses.pop(driver, None)
+        # noinspection PyBroadException,TryExceptPass
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Stops pre-launching drivers and quits all idle drivers"""
+        with self._lock:
+            self._closed = True
+            drivers = [driver for idle in self._idle.values() for driver in idle]
+            self._idle = {}
+            self._lock.notify_all()
+        for driver in drivers:
+            self.discard(driver)
+
+    @property
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(map(len, self._idle.values()))
+
+    @property
+    def starting_count(self) -> int:
+        with self._lock:
+            return sum(self._starting.values())
+
+
+_pool: Optional[SessionPool] = None
+
+
+def get_session_pool(max_reuse: int = 0) -> SessionPool:
+    """Session pool of this process (created the first time, with max_reuse)"""
+    global _pool
+    if _pool is None:
+        _pool = SessionPool(max_reuse)
+        atexit.register(close_session_pool)
+    return _pool
+
+
+def close_session_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
@@ -1,5 +1,10 @@
 from __future__ import annotations
-from typing import Union
+from typing import Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .util import Deadline
 
 # Type alias
 NumberType = Union[int, float]
+# Timeouts can be a number of seconds or a Deadline (see util.Deadline)
+TimeoutType = Union[int, float, "Deadline"]
@@ -1,6 +1,9 @@
 from __future__ import annotations
 import re
-from typing import Callable, TypeVar, Any, Sequence, Mapping, MutableMapping, Iterable, Optional
+import random
+from abc import ABC, abstractmethod
+from typing import Callable, TypeVar, Any, Sequence, Mapping, MutableMapping, Iterable, Iterator, Optional, Union, \
+    TYPE_CHECKING
 from datetime import datetime, date as dt_date, time as dt_time
 from time import time as t_time, sleep
 from unicodedata import normalize
@@ -10,17 +13,182 @@ from seleniumbase.config.settings import LARGE_TIMEOUT
 
 from . import types as pb_types
 
+if TYPE_CHECKING:
+    from .web_node import GenericNode
+
 T = TypeVar('T')
 
 
+class Deadline:
+    """
+    Moment when a wait (including all its nested waits) must end.
+    Can be used wherever a timeout is expected: nested calls get only the remaining time, instead of the full timeout.
+    """
+
+    def __init__(self, timeout: pb_types.NumberType) -> None:
+        if timeout < 0:
+            raise RuntimeError(f"timeout should be >= 0. timeout = {timeout}")
+        self.timeout = timeout
+        self.stop = t_time() + timeout
+
+    @classmethod
+    def from_timeout(cls,
+                     timeout: Optional[pb_types.TimeoutType],
+                     default: pb_types.NumberType = LARGE_TIMEOUT) -> Deadline:
+        """Returns timeout if it is already a Deadline (so the budget is shared), or a new Deadline if not"""
+        if isinstance(timeout, Deadline):
+            return timeout
+        return cls(default if timeout is None else timeout)
+
+    @property
+    def remaining(self) -> float:
+        return max(self.stop - t_time(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return t_time() >= self.stop
+
+    def __float__(self) -> float:
+        return self.remaining
+
+    def __repr__(self) -> str:
+        return f"Deadline(timeout={self.timeout}, remaining={self.remaining:.3f})"
+
+    def __str__(self) -> str:
+        # Used in error messages ("... after {timeout} seconds")
+        return str(self.timeout)
+
+
+def remaining_timeout(timeout: Optional[pb_types.TimeoutType]) -> Optional[pb_types.NumberType]:
+    """Remaining time if timeout is a Deadline, else timeout itself"""
+    if isinstance(timeout, Deadline):
+        return timeout.remaining
+    return timeout
+
+
+class PollSchedule(ABC):
+    """Delays (in seconds) between the checks of a wait. Subclass it and implement `delays` to define a new schedule"""
+
+    @abstractmethod
+    def delays(self) -> Iterator[float]:
+        """Infinite iterator: delay before second check, before third check, and so on"""
+
+
+class ConstantPollSchedule(PollSchedule):
+    """Same delay between all checks"""
+
+    def __init__(self, step: pb_types.NumberType = 0.5) -> None:
+        if step <= 0:
+            raise RuntimeError(f"step should be > 0. step = {step}")
+        self.step = step
+
+    def delays(self) -> Iterator[float]:
+        while True:
+            yield self.step
+
+    def __repr__(self) -> str:
+        return f"ConstantPollSchedule(step={self.step})"
+
+
+class BackoffPollSchedule(PollSchedule):
+    """
+    Fast initial burst of checks (`initial` delays), then exponential backoff (each delay is `factor` times the previous
+    one) up to `cap` seconds. Each delay is randomly changed up to `jitter` (fraction of the delay, 0.1 is +-10%),
+    so parallel tests do not poll a shared grid at the same moments.
+    """
+
+    def __init__(self,
+                 initial: Sequence[pb_types.NumberType] = (0.02, 0.05, 0.1),
+                 factor: pb_types.NumberType = 2,
+                 cap: pb_types.NumberType = 1,
+                 jitter: pb_types.NumberType = 0.1) -> None:
+        if len(initial) == 0 or min(initial) <= 0:
+            raise RuntimeError(f"initial delays should not be empty and all of them > 0. initial = {initial}")
+        if factor < 1:
+            raise RuntimeError(f"factor should be >= 1. factor = {factor}")
+        if cap <= 0:
+            raise RuntimeError(f"cap should be > 0. cap = {cap}")
+        if not 0 <= jitter < 1:
+            raise RuntimeError(f"jitter should be >= 0 and < 1. jitter = {jitter}")
+        self.initial = tuple(initial)
+        self.factor = factor
+        self.cap = cap
+        self.jitter = jitter
+
+    def delays(self) -> Iterator[float]:
+        delay = 0
+        for delay in self.initial:
+            yield self._jittered(min(delay, self.cap))
+        while True:
+            delay = min(delay * self.factor, self.cap)
+            yield self._jittered(delay)
+
+    def _jittered(self, delay: pb_types.NumberType) -> float:
+        if self.jitter == 0:
+            return delay
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def __repr__(self) -> str:
+        return f"BackoffPollSchedule(initial={self.initial}, factor={self.factor}, cap={self.cap}, " \
+               f"jitter={self.jitter})"
+
+
+PollScheduleType = Union[PollSchedule, str]
+
+_default_poll_schedule: PollSchedule = ConstantPollSchedule()
+
+
+def poll_schedule_from_str(value: str) -> PollSchedule:
+    """
+    Parses a poll schedule description (as used in ini option `pb_poll_schedule`):
+
+    - `constant` or `constant:<step>`. Example: `constant:0.25`
+    - `backoff` or `backoff:<key>=<value>,...`, with keys `initial` (delays separated by `/`), `factor`, `cap`
+      and `jitter`. Example: `backoff:initial=0.02/0.05/0.1,factor=2,cap=1,jitter=0.1`
+    """
+    kind, _, params = value.strip().partition(":")
+    kind = kind.strip().lower()
+    params = params.strip()
+    try:
+        if kind == "constant":
+            return ConstantPollSchedule(float(params)) if params else ConstantPollSchedule()
+        if kind == "backoff":
+            kwargs = {}
+            for param in filter(None, (p.strip() for p in params.split(","))):
+                key, _, param_value = param.partition("=")
+                key = key.strip()
+                if key == "initial":
+                    kwargs[key] = tuple(float(v) for v in param_value.split("/"))
+                elif key in ("factor", "cap", "jitter"):
+                    kwargs[key] = float(param_value)
+                else:
+                    raise RuntimeError(f"Unknown backoff poll schedule parameter: {key}")
+            return BackoffPollSchedule(**kwargs)
+    except ValueError as e:
+        raise RuntimeError(f"Incorrect poll schedule: {value}") from e
+    raise RuntimeError(f"Unknown poll schedule: {value}. Valid values start with 'constant' or 'backoff'")
+
+
+def get_default_poll_schedule() -> PollSchedule:
+    return _default_poll_schedule
+
+
+def set_default_poll_schedule(schedule: PollScheduleType) -> None:
+    """Poll schedule used by `wait_until` when neither `step` nor `poll_schedule` are given"""
+    global _default_poll_schedule
+    _default_poll_schedule = poll_schedule_from_str(schedule) if isinstance(schedule, str) else schedule
+
+
 def wait_until(f: Callable[..., T],
                args: list = None,
                kwargs: dict = None,
-               timeout: Optional[pb_types.NumberType] = None,
-               step: pb_types.NumberType = 0.5,
+               timeout: Optional[pb_types.TimeoutType] = None,
+               step: Optional[pb_types.NumberType] = None,
                expected: Any = True,
                equals: bool = True,
-               raise_error: str = None, ) -> (bool, T):
+               raise_error: str = None,
+               wait_for_change: Callable[[pb_types.NumberType], bool] = None,
+               poll_schedule: Optional[PollScheduleType] = None, ) -> (bool, T):
     """
     Waits until Callable `f` returns the `expected` value
     (or something different from the expected value if `equals` is False).
@@ -30,12 +198,18 @@ def wait_until(f: Callable[..., T],
     :param f: The Callable object (usually function or method)
     :param args: List of positional arguments passed to f. Default: []
     :param kwargs: Dictionary of keyword arguments passed to f. Default: {}
-    :param timeout: Timeout in seconds
-    :param step: Wait time between each check
+    :param timeout: Timeout in seconds, or a Deadline
+    :param step: Wait time between each check (same as `poll_schedule=ConstantPollSchedule(step)`)
     :param expected: Expected value
     :param equals: If True, wait until f(*args, **kwargs) == expected.
                    If False, wait until f(*args, **kwargs) != expected.
     :param raise_error: If not None, raises an Error if timeout is reached
+    :param wait_for_change: If not None, it is called between checks (with the remaining time) instead of waiting
+                            `step` seconds. It should return True as soon as f may return a different value
+                            (i.e. when the page changes), or False if it can not wait (poll schedule is used then)
+    :param poll_schedule: PollSchedule (or its description, see `poll_schedule_from_str`) used between checks.
+                          Default: ConstantPollSchedule(step) if `step` is given, else the default poll schedule
+                          (see `set_default_poll_schedule` and ini option `pb_poll_schedule`)
     :return: Tuple(success, value). success is True if the waiting succeeded,
              and value is the last value returned by f(*args, **kwargs)
     """
@@ -46,10 +220,17 @@ def wait_until(f: Callable[..., T],
     if timeout is None:
         timeout = LARGE_TIMEOUT
 
-    if timeout < 0:
+    if not isinstance(timeout, Deadline) and timeout < 0:
         raise RuntimeError(f"timeout should be >= 0. timeout = {timeout}")
-    if step <= 0:
-        raise RuntimeError(f"step should be > 0. step = {step}")
+    if step is not None and poll_schedule is not None:
+        raise RuntimeError("Only one of step and poll_schedule can be given")
+    if step is not None:
+        poll_schedule = ConstantPollSchedule(step)
+    elif poll_schedule is None:
+        poll_schedule = _default_poll_schedule
+    elif isinstance(poll_schedule, str):
+        poll_schedule = poll_schedule_from_str(poll_schedule)
+    delays = poll_schedule.delays()
 
     if equals is True:
         default_value = None if expected is not None else False
@@ -57,8 +238,7 @@ def wait_until(f: Callable[..., T],
         default_value = expected
 
     current = t_time()
-    start = current
-    stop = start + timeout
+    stop = timeout.stop if isinstance(timeout, Deadline) else current + timeout
 
     value = default_value
     # noinspection PyBroadException,TryExceptPass
@@ -72,8 +252,11 @@ def wait_until(f: Callable[..., T],
         if (value == expected) is equals:
             return True, value
         after = t_time()
-        if after < current + step:
-            sleep(current + step - after)
+        if wait_for_change is None or wait_for_change(max(stop - after, 0)) is not True:
+            after = t_time()
+            next_check = min(current + next(delays), stop)
+            if after < next_check:
+                sleep(next_check - after)
         current = t_time()
         if current <= stop:
             # noinspection PyBroadException,TryExceptPass
@@ -86,13 +269,107 @@ def wait_until(f: Callable[..., T],
     else:
         if raise_error is not None:
             raise TimeoutError(
-                f"{raise_error}. f='{f}', args='{args}', kwargs='{kwargs}', timeout='{timeout}', step='{step}', "
-                f"expected='{expected}', equals='{equals}', last value={value}",
+                f"{raise_error}. f='{f}', args='{args}', kwargs='{kwargs}', timeout='{timeout}', "
+                f"poll_schedule='{poll_schedule}', expected='{expected}', equals='{equals}', last value={value}",
             )
         else:
             return False, value
 
 
+ConditionType = Union[Callable[[], Any], "GenericNode"]
+
+
+class _Conditions:
+    # Evaluates all conditions together: callables are called (condition holds if result is truthy, and is False if
+    # it raises an Exception), and nodes are checked for visibility in one browser call per PombaseCase
+
+    def __init__(self, conditions: Sequence[ConditionType]) -> None:
+        if len(conditions) == 0:
+            raise RuntimeError("At least one condition should be given")
+        self.conditions = list(conditions)
+        self.values: list[bool] = [False] * len(self.conditions)
+        self.nodes_by_pbc: dict[Any, list[int]] = {}
+        for i, condition in enumerate(self.conditions):
+            if not callable(condition):
+                self.nodes_by_pbc.setdefault(condition.pbc, []).append(i)
+
+    def evaluate(self) -> list[bool]:
+        values = [False] * len(self.conditions)
+        for i, condition in enumerate(self.conditions):
+            if callable(condition):
+                # noinspection PyBroadException,TryExceptPass
+                try:
+                    values[i] = bool(condition())
+                except Exception:
+                    pass
+        for pbc, positions in self.nodes_by_pbc.items():
+            # noinspection PyBroadException,TryExceptPass
+            try:
+                visible = pbc.are_nodes_visible([self.conditions[i] for i in positions])
+                for i, value in zip(positions, visible):
+                    values[i] = value
+            except Exception:
+                pass
+        self.values = values
+        return values
+
+    @property
+    def wait_for_change(self) -> Optional[Callable[[pb_types.NumberType], bool]]:
+        # Waiting for page changes is only useful if all conditions are nodes of the same page
+        if len(self.nodes_by_pbc) == 1 and sum(map(len, self.nodes_by_pbc.values())) == len(self.conditions):
+            pbc = next(iter(self.nodes_by_pbc))
+            return pbc.wait_for_change
+        return None
+
+
+def wait_until_any(conditions: Sequence[ConditionType],
+                   timeout: Optional[pb_types.TimeoutType] = None,
+                   poll_schedule: Optional[PollScheduleType] = None,
+                   raise_error: str = None, ) -> (bool, Optional[int]):
+    """
+    Waits until at least one of the conditions holds. All conditions are checked together in each poll, so waiting for
+    one of several outcomes (i.e. success message or error message) needs only one timeout.
+
+    :param conditions: Callables without arguments (condition holds if they return a truthy value) or nodes
+                       (condition holds if node is visible). Nodes are checked in only one browser call
+    :param timeout: Timeout in seconds, or a Deadline
+    :param poll_schedule: Poll schedule (see `wait_until`)
+    :param raise_error: If not None, raises an Error if timeout is reached
+    :return: Tuple(success, index). index is the position (in `conditions`) of the first condition that holds,
+             or None if timeout is reached
+    """
+    evaluation = _Conditions(conditions)
+    success, _ = wait_until(lambda: any(evaluation.evaluate()),
+                            timeout=timeout,
+                            poll_schedule=poll_schedule,
+                            raise_error=raise_error,
+                            wait_for_change=evaluation.wait_for_change, )
+    return success, evaluation.values.index(True) if success else None
+
+
+def wait_until_all(conditions: Sequence[ConditionType],
+                   timeout: Optional[pb_types.TimeoutType] = None,
+                   poll_schedule: Optional[PollScheduleType] = None,
+                   raise_error: str = None, ) -> (bool, list[bool]):
+    """
+    Waits until all conditions hold at the same time. All conditions are checked together in each poll.
+
+    :param conditions: Same as in `wait_until_any`
+    :param timeout: Timeout in seconds, or a Deadline
+    :param poll_schedule: Poll schedule (see `wait_until`)
+    :param raise_error: If not None, raises an Error if timeout is reached
+    :return: Tuple(success, values). values has one bool per condition (last check), so it tells which conditions
+             do not hold if timeout is reached
+    """
+    evaluation = _Conditions(conditions)
+    success, _ = wait_until(lambda: all(evaluation.evaluate()),
+                            timeout=timeout,
+                            poll_schedule=poll_schedule,
+                            raise_error=raise_error,
+                            wait_for_change=evaluation.wait_for_change, )
+    return success, evaluation.values
+
+
 class ParserInfoEs(parserinfo):
     HMS = [('h', 'hour', 'hours', 'hora', 'horas'),
            ('m', 'minute', 'minutes', 'minuto', 'minutos'),
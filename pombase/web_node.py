@@ -1,54 +1,79 @@
 from __future__ import annotations
 
+import operator
+import re
+import sys
 from collections import namedtuple
-from functools import reduce
+from functools import reduce, lru_cache, cached_property
 from inflection import underscore
-from typing import Union, Iterable, Optional, Any, Callable, TypeVar
-from anytree import findall, findall_by_attr, AnyNode, RenderTree, AsciiStyle
+from typing import Union, Iterable, Optional, Any, Callable, TypeVar, Sequence
+from anytree import AnyNode, RenderTree, AsciiStyle
 from itertools import count
 from overrides import overrides, EnforceOverrides, final
 from copy import copy as python_copy
 from selenium.webdriver.remote.webelement import WebElement
 from cssselect.xpath import GenericTranslator
 from selenium.webdriver.common.by import By
-from seleniumbase.config.settings import LARGE_TIMEOUT
 
 from . import pombase_case as pombase_case
 from . import types as pb_types
+from . import aio as pb_aio
 from . import util as pb_util
 
 NodeCount = Union[None, int, range, count, Iterable[int]]
+# Stop of the range used as valid_count when there is no maximum count (see _normalized_valid_count)
+_UNBOUNDED_COUNT = sys.maxsize
 SelectorByTuple = namedtuple("SelectorByTuple", "selector by")
 
 
 class Locator:
+    """
+    Immutable (and hashable) locator.
+
+    Derived forms (`selector`, `by`, `as_css_selector()`, `as_xpath_selector()`...) are calculated only once,
+    the first time they are needed, and then cached in the instance.
+    """
     translator = GenericTranslator()
 
     def __init__(self, selector: str, by: str = None, index: int = None) -> None:
         if len(selector) == 0:
             raise RuntimeError(f"Validation error. Locator.selector should not be empty: selector={selector}")
-        self._selector = selector
-        self._by = by
-        self._index = index
+        object.__setattr__(self, "_selector", selector)
+        object.__setattr__(self, "_by", by)
+        object.__setattr__(self, "_index", index)
 
     def __repr__(self):
         return f"Locator(_selector={self._selector}, _by={self._by}, _index={self._index})"
 
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise AttributeError(f"Locator is immutable. Can not set attribute '{key}': {self}")
+
+    def __delattr__(self, key: str) -> None:
+        raise AttributeError(f"Locator is immutable. Can not delete attribute '{key}': {self}")
+
+    def __copy__(self) -> Locator:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> Locator:
+        return self
+
     def copy_overriding(self, selector: str = None, by: str = None, index: int = None) -> Locator:
-        return Locator(
-            selector=pb_util.first_not_none(selector, self._selector),
-            by=pb_util.first_not_none(by, self._by),
-            index=pb_util.first_not_none(index, self._index),
-        )
+        selector = pb_util.first_not_none(selector, self._selector)
+        by = pb_util.first_not_none(by, self._by)
+        index = pb_util.first_not_none(index, self._index)
+        if selector == self._selector and by == self._by and index == self._index:
+            # Immutable, so no need to create a new instance
+            return self
+        return Locator(selector=selector, by=by, index=index)
 
-    @property
+    @cached_property
     def selector(self) -> str:
         if self._index is not None:
             xpath = as_xpath(self._selector, self._by)
             return f"({xpath})[{self._index + 1}]"
         return self._selector
 
-    @property
+    @cached_property
     def by(self) -> str:
         if self._index is not None:
             return By.XPATH
@@ -61,55 +86,68 @@ class Locator:
     def index(self) -> Optional[int]:
         return self._index
 
-    def as_css_selector(self) -> Optional[str]:
+    @cached_property
+    def _css_selector(self) -> Optional[str]:
         if self.index is not None:
             return None
         else:
             return as_css(self.selector, self.by)
 
-    def as_xpath_selector(self) -> str:
+    @cached_property
+    def _xpath_selector(self) -> str:
         if self.index is not None:
             return self.selector
         else:
             return as_xpath(self.selector, self.by)
 
+    def as_css_selector(self) -> Optional[str]:
+        return self._css_selector
+
+    def as_xpath_selector(self) -> str:
+        return self._xpath_selector
+
     def as_selector_by_tuple(self) -> SelectorByTuple:
         return SelectorByTuple(self.selector, self.by)
 
     def __eq__(self, other: Any) -> bool:
-        try:
-            other = get_locator(other)
-        except TypeError:
-            return False
-        except AssertionError:
-            return False
-        if other is not None and other.selector == self.selector and other.by == self.by:
+        # Only locators are compared (equal objects must have the same hash). Use get_locator to compare other values
+        if other is self:
             return True
-        else:
-            return False
+        if not isinstance(other, Locator):
+            return NotImplemented
+        return other.selector == self.selector and other.by == self.by
+
+    def __hash__(self) -> int:
+        return hash((self.selector, self.by))
 
     def append(self, locator: Locator) -> Locator:
-        self_as_css = self.as_css_selector()
-        locator_as_css = locator.as_css_selector()
-        if self_as_css is not None and locator_as_css is not None:
-            return Locator(f"{self_as_css} {locator_as_css}")
+        return _append_locators(self, locator)
+
+
+@lru_cache(maxsize=1024)
+def _append_locators(first: Locator, second: Locator) -> Locator:
+    # Locators are immutable, so the result can be safely cached (and shared)
+    first_as_css = first.as_css_selector()
+    second_as_css = second.as_css_selector()
+    if first_as_css is not None and second_as_css is not None:
+        return Locator(f"{first_as_css} {second_as_css}")
+    else:
+        first_as_xpath = first.as_xpath_selector()
+        second_as_xpath = second.as_xpath_selector()
+        xpath = first_as_xpath
+        if second_as_xpath.startswith("/"):
+            # Reset xpath
+            xpath = ""
         else:
-            self_as_xpath = self.as_xpath_selector()
-            locator_as_xpath = locator.as_xpath_selector()
-            xpath = self_as_xpath
-            if locator_as_xpath.startswith("/"):
-                # Reset xpath
-                xpath = ""
-            else:
-                if locator_as_xpath.startswith("("):
-                    # Put "(" in the beginning
-                    xpath = f"({xpath}"
-                    locator_as_xpath = locator_as_xpath[1:]
-                if locator_as_xpath.startswith("."):
-                    # Remove "."
-                    locator_as_xpath = locator_as_xpath[1:]
-            xpath = f"{xpath}{locator_as_xpath}"
-            return Locator(xpath)
+            if second_as_xpath.startswith("("):
+                # Put "(" in the beginning
+                xpath = f"({xpath}"
+                second_as_xpath = second_as_xpath[1:]
+            if second_as_xpath.startswith("."):
+                # Remove "."
+                second_as_xpath = second_as_xpath[1:]
+        xpath = f"{xpath}{second_as_xpath}"
+        return Locator(xpath)
 
 
 class GenericNode(AnyNode, EnforceOverrides):
@@ -139,10 +177,7 @@ class GenericNode(AnyNode, EnforceOverrides):
             locator = override_parent
             override_parent = None
 
-        if valid_count is None:
-            valid_count = count()
-        if isinstance(valid_count, int):
-            valid_count = [valid_count]
+        valid_count = _normalized_valid_count(valid_count)
 
         # locator and valid_count are related
         if locator is not None and locator.index is not None:
@@ -190,22 +225,26 @@ class GenericNode(AnyNode, EnforceOverrides):
         # for key, value in kwargs.items():
         #     setattr(self, key, value)
 
-        # Validation -> Not here, but in _post_attach
-        # self.validate()
-        self.parent = parent
+        # Validation -> Not here, but in _post_attach (deferred until init_node finishes)
+        self._validation_deferred = True
+        try:
+            self.parent = parent
 
-        # Init node
-        self.init_node()
+            # Init node
+            validated = self._build_node()
+        finally:
+            del self._validation_deferred
 
-        # Validation -> Again, not here, but in _post_attach
-        # self.validate()
+        # Whole tree validated once (unless an ancestor is also deferring validation)
+        if validated is False and self._is_validation_deferred() is False:
+            self.validate_tree()
 
     ######################
     # Computed properties
     ######################
     @property
     def max_valid_count(self) -> Optional[int]:
-        if type(self.valid_count) == count:
+        if type(self.valid_count) == count or _is_unbounded(self.valid_count):
             return None
         else:
             return max(self.valid_count)
@@ -245,7 +284,18 @@ class GenericNode(AnyNode, EnforceOverrides):
             raise AttributeError
 
     def __setattr__(self, key: str, value: Any) -> None:
-        if not isinstance(value, GenericNode) or key == "parent" or key.startswith("_"):
+        if key in ("locator", "override_parent"):
+            super().__setattr__(key, value)
+            self._invalidate_compound_locator()
+        elif key == "name":
+            old_name = self.__dict__.get("name", None)
+            super().__setattr__(key, value)
+            if old_name != value:
+                self._rename_in_name_index(old_name)
+                if self.parent is not None and self._is_validation_deferred() is False:
+                    self.validate()
+                    self._validate_unique_names_after_attach()
+        elif not isinstance(value, GenericNode) or key == "parent" or key.startswith("_"):
             super().__setattr__(key, value)
         elif self.separator not in key:
             value: GenericNode
@@ -320,18 +370,108 @@ class GenericNode(AnyNode, EnforceOverrides):
     ###################
     @property
     def compound_locator(self) -> Locator:
-        return compound(self.path)
+        locator = self._get_compound_locator_or_none()
+        return locator if locator is not None else Locator("html")
+
+    def _get_compound_locator_or_none(self) -> Optional[Locator]:
+        # Same result as compound(self.path), but calculated incrementally from parent's (cached) value.
+        # Invariant: if a node has a cached value, its parent has a cached value too, or the node has an
+        # override_parent (so its value does not depend on ancestors). See _invalidate_compound_locator
+        try:
+            return self.__dict__["_compound_locator_cache"][0]
+        except KeyError:
+            pass
+        if self.override_parent is not None:
+            locator = self.override_parent
+        else:
+            parent: Optional[GenericNode] = self.parent
+            parent_locator = parent._get_compound_locator_or_none() if parent is not None else None
+            if self.locator is None:
+                locator = parent_locator
+            elif parent_locator is None:
+                locator = self.locator
+            else:
+                locator = parent_locator.append(self.locator)
+        # Stored in a tuple, so None can be cached too
+        self.__dict__["_compound_locator_cache"] = (locator,)
+        return locator
+
+    @property
+    def optimized_locator(self) -> Locator:
+        # Same elements as compound_locator, but (usually) cheaper to evaluate in the browser
+        try:
+            return self.__dict__["_optimized_locator_cache"]
+        except KeyError:
+            pass
+        # Ensures invariant used in _invalidate_compound_locator
+        self._get_compound_locator_or_none()
+        locator = optimize_compound(self.path)
+        self.__dict__["_optimized_locator_cache"] = locator
+        return locator
+
+    def _invalidate_compound_locator(self) -> None:
+        # Thanks to the invariant, there is no need to visit descendants of a node without cached value
+        pending: list[GenericNode] = [self]
+        while len(pending) > 0:
+            node = pending.pop()
+            node.__dict__.pop("_optimized_locator_cache", None)
+            if node.__dict__.pop("_compound_locator_cache", None) is not None:
+                pending.extend(node.children)
 
     ##############
     # Validations
     ##############
+    @overrides
+    def _pre_detach(self, parent: GenericNode) -> None:
+        super()._pre_detach(parent)
+        named_nodes = self._named_nodes_in_subtree()
+        for ancestor in parent.iter_path_reverse():
+            ancestor: GenericNode
+            ancestor._remove_from_name_index(named_nodes)
+
+    @overrides
+    def _post_detach(self, parent: GenericNode) -> None:
+        super()._post_detach(parent)
+        self._invalidate_compound_locator()
+
     @overrides
     def _post_attach(self, parent: GenericNode) -> None:
         super()._post_attach(parent)
-        self.validate()
-        parent.validate()
-        self.validate_unique_descendant_names()
-        parent.find_nearest_named_ancestor_or_self().validate_unique_descendant_names()
+        self._invalidate_compound_locator()
+        named_nodes = self._named_nodes_in_subtree()
+        for ancestor in parent.iter_path_reverse():
+            ancestor: GenericNode
+            ancestor._add_to_name_index(named_nodes)
+        if self._is_validation_deferred() is False:
+            self.validate()
+            parent.validate()
+            self._validate_unique_names_after_attach()
+
+    def _is_validation_deferred(self) -> bool:
+        return any(node.__dict__.get("_validation_deferred", False) for node in self.iter_path_reverse())
+
+    def _validate_unique_names_after_attach(self) -> None:
+        # Subtree was already validated, so only nodes that now have a new nearest named ancestor are checked
+        if self.name is not None:
+            self._validate_unique_name()
+        else:
+            pending: list[GenericNode] = list(self.children)
+            while len(pending) > 0:
+                node = pending.pop()
+                if node.name is not None:
+                    node._validate_unique_name()
+                else:
+                    pending.extend(node.children)
+
+    def validate_tree(self) -> None:
+        """Validates the whole subtree, including names of its nodes in their nearest named ancestors"""
+        if self.parent is not None:
+            parent: GenericNode = self.parent
+            parent.validate()
+        for node in (self,) + self.descendants:
+            node: GenericNode
+            node.validate()
+            node._validate_unique_name()
 
     def validate(self) -> None:
         if self.name is None:
@@ -371,30 +511,79 @@ class GenericNode(AnyNode, EnforceOverrides):
 
     def validate_unique_descendant_names(self) -> None:
         nearest = self.find_nearest_named_ancestor_or_self()
-        named: list[GenericNode] = list(findall(nearest, lambda node: node.name is not None))
-        if nearest in named:
-            named.remove(nearest)
-        named = [node for node in named if node.parent.find_nearest_named_ancestor_or_self() == nearest]
+        named = [node for nodes in nearest._get_name_index().values() for node in nodes
+                 if node.parent.find_nearest_named_ancestor_or_self() == nearest]
         for node in named:
-            found = nearest._find_directly_descendant_from_nearest_named_ancestor(node.name)
-            if len(found) != 1:
-                raise RuntimeError(f"Found {len(found)} nodes with name '{node.name}' starting from node: {nearest}")
-            found_node = found.pop()
-            if found_node != node:
-                raise RuntimeError(f"Found one node with name '{node.name}', but it is not the expected node. \n"
-                                   f"Real: {found_node} \nExpected: {node}")
+            node._validate_unique_name()
+
+    def _validate_unique_name(self) -> None:
+        if self.name is None or self.parent is None:
+            return
+        parent: GenericNode = self.parent
+        nearest = parent.find_nearest_named_ancestor_or_self()
+        found = nearest._find_directly_descendant_from_nearest_named_ancestor(self.name)
+        if len(found) != 1:
+            raise RuntimeError(f"Found {len(found)} nodes with name '{self.name}' starting from node: {nearest}")
+        found_node = found.pop()
+        if found_node != self:
+            raise RuntimeError(f"Found one node with name '{self.name}', but it is not the expected node. \n"
+                               f"Real: {found_node} \nExpected: {self}")
 
     def _find_directly_descendant_from_nearest_named_ancestor(self, name: str) -> set[GenericNode]:
         nearest = self.find_nearest_named_ancestor_or_self()
-        nodes: list[GenericNode] = findall_by_attr(self, name)
+        nodes = self._get_name_index().get(name, set())
         return {node for node in nodes if node.parent.find_nearest_named_ancestor_or_self() == nearest and node != self}
 
+    #############
+    # Name index
+    #############
+    def _get_name_index(self) -> dict[str, set[GenericNode]]:
+        # Named descendants (any depth) by name. Maintained incrementally in _post_attach/_pre_detach
+        return self.__dict__.setdefault("_name_index", {})
+
+    def _named_nodes_in_subtree(self) -> list[GenericNode]:
+        named_nodes = [node for nodes in self._get_name_index().values() for node in nodes]
+        if self.name is not None:
+            named_nodes.append(self)
+        return named_nodes
+
+    def _add_to_name_index(self, named_nodes: Iterable[GenericNode]) -> None:
+        name_index = self._get_name_index()
+        for node in named_nodes:
+            name_index.setdefault(node.name, set()).add(node)
+
+    def _remove_from_name_index(self, named_nodes: Iterable[GenericNode], name: str = None) -> None:
+        name_index = self._get_name_index()
+        for node in named_nodes:
+            node_name = node.name if name is None else name
+            nodes = name_index.get(node_name, None)
+            if nodes is not None:
+                nodes.discard(node)
+                if len(nodes) == 0:
+                    del name_index[node_name]
+
+    def _rename_in_name_index(self, old_name: Optional[str]) -> None:
+        if self.parent is None:
+            return
+        parent: GenericNode = self.parent
+        for ancestor in parent.iter_path_reverse():
+            ancestor: GenericNode
+            if old_name is not None:
+                ancestor._remove_from_name_index([self], old_name)
+            if self.name is not None:
+                ancestor._add_to_name_index([self])
+
     ############
     # Init node
     ############
     def init_node(self) -> None:
         pass
 
+    def _build_node(self) -> bool:
+        # Builds node's subtree. Returns True if the built subtree is already known to be valid
+        self.init_node()
+        return False
+
     ################
     # Finding nodes
     ################
@@ -433,16 +622,11 @@ class GenericNode(AnyNode, EnforceOverrides):
             names.remove("")
         if len(names) == 0:
             raise RuntimeError(f"Invalid path: {path}")
-        nodes = set(findall_by_attr(self, names[0]))
-        if self in nodes:
-            nodes.remove(self)
+        nodes = set(self._get_name_index().get(names[0], set()))
         for name in names[1:]:
             new_nodes = set()
             for node in nodes:
-                found = set(findall_by_attr(node, name))
-                if node in found:
-                    found.remove(node)
-                new_nodes = new_nodes.union(found)
+                new_nodes.update(node._get_name_index().get(name, set()))
             nodes = new_nodes
         return nodes
 
@@ -450,31 +634,37 @@ class GenericNode(AnyNode, EnforceOverrides):
     # Copy Node
     ###############
     def copy(self: T, recursive: bool = False) -> T:
-        # store parent
-        parent = self.parent
-        self.parent = None
-
-        # Do not want to copy children
-        children = self.children
-        for child in children:
-            child.parent = None
-
-        node = python_copy(self)
-        # Restore parent
-        self.parent = parent
-
+        node = self._shallow_clone()
         if recursive:
-            for child in children:
-                child: GenericNode
-                child_copy = child.copy(True)
-                child_copy.parent = node
-
-        # restore children
-        for child in children:
-            child.parent = self
+            mapping: dict[GenericNode, GenericNode] = {self: node}
+            self._clone_children_into(node, mapping)
+            for clone in mapping.values():
+                clone._remap_node_references(mapping)
+        return node
 
+    def _shallow_clone(self: T) -> T:
+        node = python_copy(self)
+        # Do not share tree state with self (new empty children list is created by anytree when needed)
+        for key in _TREE_STATE_KEYS:
+            node.__dict__.pop(key, None)
+        node.__dict__["_name_index"] = {}
         return node
 
+    def _clone_children_into(self, target: GenericNode, mapping: dict[GenericNode, GenericNode]) -> None:
+        # Clones self descendants as target descendants. Clones are added to mapping (original -> clone)
+        for child in self.children:
+            child: GenericNode
+            child_clone = child._shallow_clone()
+            mapping[child] = child_clone
+            child_clone.parent = target
+            child._clone_children_into(child_clone, mapping)
+
+    def _remap_node_references(self, mapping: dict[GenericNode, GenericNode]) -> None:
+        # Attributes pointing to original nodes (i.e., self.swn_title, or nodes in a list created in init_node) must
+        # point to their clones. Containers are copied, so they are not shared with the original node (i.e., _kwargs)
+        for key, value in self.__dict__.items():
+            self.__dict__[key] = _remap_value(value, mapping)
+
     ##########
     # Replace
     ##########
@@ -505,30 +695,74 @@ class GenericNode(AnyNode, EnforceOverrides):
         else:
             return False
 
-    def get_multiple_nodes(self) -> list[SingleWebNode]:
+    def get_multiple_nodes(self) -> Sequence[SingleWebNode]:
         if self.is_multiple is False or self.locator is False:
             return []
-        if self.name is not None and self.parent is not None:
-            # Remove previous nodes (if any) to avoid duplicated names
-            i = 0
-            prev_nodes = findall_by_attr(self.parent, f"{self.name}_{i}", maxlevel=2)
-            while len(prev_nodes) > 0:
-                for prev_node in prev_nodes:
-                    prev_node: GenericNode
-                    prev_node.parent = None
-                i = i + 1
-                prev_nodes = findall_by_attr(self.parent, f"{self.name}_{i}", maxlevel=2)
-        # Create new nodes
-        nodes = []
-        for i in range(self.count()):
-            new_node = self.copy(recursive=True)
-            new_node.locator = self.locator.copy_overriding(index=i)
-            new_node.valid_count = range(2)
-            if new_node.name is not None:
-                new_node.name = f"{new_node.name}_{i}"
-            new_node.parent = self.parent
-            nodes.append(new_node.to_web_node())
-        return nodes
+        num_nodes = self.count()
+        self._reconcile_multiple_nodes(num_nodes)
+        # New nodes are created only when accessed
+        return MultipleNodesView(self, num_nodes)
+
+    def _reconcile_multiple_nodes(self, num_nodes: int) -> None:
+        # Previous nodes are kept while they are still equivalent to a new one. Surplus nodes are removed
+        nodes: dict[int, SingleWebNode] = self.__dict__.setdefault("_multiple_nodes", {})
+        # anytree builds a new children tuple on every access, so children are compared one by one
+        key = (self.locator, self.override_parent, self.name, self.parent, self.children)
+        previous_key = self.__dict__.get("_multiple_nodes_key", None)
+        keep_all = previous_key is not None and previous_key[:3] == key[:3] and previous_key[3] is key[3] and \
+            len(previous_key[4]) == len(key[4]) and all(x is y for x, y in zip(previous_key[4], key[4]))
+        self.__dict__["_multiple_nodes_key"] = key
+        for index, node in list(nodes.items()):
+            if keep_all is False or index >= num_nodes or node.parent is not self.parent:
+                del nodes[index]
+                if node.parent is not None:
+                    node.parent = None
+
+    def _get_multiple_node(self, index: int) -> SingleWebNode:
+        nodes: dict[int, SingleWebNode] = self.__dict__.setdefault("_multiple_nodes", {})
+        node = nodes.get(index)
+        if node is not None and node._is_generated_subtree_unchanged() is False:
+            # Nodes were attached to it (i.e., by a caller of get_multiple_nodes): a new one is generated, so they are
+            # not found again (twice if they are attached again)
+            if node.parent is not None:
+                node.parent = None
+            node = None
+        if node is None:
+            node = self._build_multiple_node(index)
+            node.__dict__["_generated_subtree"] = set(node.descendants)
+            nodes[index] = node
+        return node
+
+    def _add_to_generated_subtree(self, node: GenericNode) -> None:
+        # node (just attached to self subtree) does not prevent self from being reused (see _get_multiple_node)
+        self.__dict__["_generated_subtree"].add(node)
+
+    def _is_generated_subtree_unchanged(self) -> bool:
+        # True if only generated nodes were attached to self subtree since it was generated. Nodes generated by the
+        # multiple nodes of the subtree (and their subtrees) are not checked here, but when they are reused
+        generated = self.__dict__["_generated_subtree"]
+
+        def unchanged(node: GenericNode) -> bool:
+            for child in node.children:
+                if child in generated:
+                    if unchanged(child) is False:
+                        return False
+                elif "_generated_subtree" not in child.__dict__:
+                    return False
+            return True
+
+        return unchanged(self)
+
+    def _build_multiple_node(self, index: int) -> SingleWebNode:
+        new_node = self.copy(recursive=True)
+        new_node.locator = self.locator.copy_overriding(index=index)
+        new_node.valid_count = range(2)
+        if new_node.name is not None:
+            new_node.name = f"{new_node.name}_{index}"
+        # Converted before attaching, so the replacement does not change self.parent children
+        new_node = new_node.to_web_node()
+        new_node.parent = self.parent
+        return new_node
 
     def _has_valid_count(self, force_count_not_zero: bool = False) -> bool:
         num_elements = self.count()
@@ -542,14 +776,22 @@ class GenericNode(AnyNode, EnforceOverrides):
         return self._has_valid_count()
 
     def wait_until_valid_count_succeeded(self,
-                                         timeout: pb_types.NumberType = None,
+                                         timeout: pb_types.TimeoutType = None,
                                          raise_error: bool = True,
                                          force_count_not_zero: bool = True, ) -> bool:
-        if timeout is None:
-            timeout = LARGE_TIMEOUT
-        plural = "s" if timeout == 1 or timeout == 1.0 else ""
+        timeout = pb_util.Deadline.from_timeout(timeout)
+        plural = "s" if timeout.timeout == 1 else ""
         raise_error = f"WebNode had not valid count after {timeout} second{plural}, " \
                       f"force_count_not_zero={force_count_not_zero}: {self}" if raise_error is True else None
+        # Browser wait (no polling) if available
+        success = self.pbc.wait_in_browser(self,
+                                           condition="count",
+                                           parameter=[valid_count_bounds(self.valid_count), force_count_not_zero],
+                                           timeout=timeout)
+        if success is not None:
+            if success is False and raise_error is not None:
+                raise TimeoutError(raise_error)
+            return success
         success, _ = pb_util.wait_until(self._has_valid_count,
                                         args=[force_count_not_zero, ],
                                         timeout=timeout,
@@ -560,9 +802,100 @@ class GenericNode(AnyNode, EnforceOverrides):
     # Loaded
     #########
     def wait_until_loaded_succeeded(self,
-                                    timeout: pb_types.NumberType = None,
+                                    timeout: pb_types.TimeoutType = None,
                                     raise_error: bool = True,
                                     force_count_not_zero: bool = True, ) -> bool:
+        """
+        Waits until node and all its descendants have a valid count, and then runs the custom
+        override_wait_until_loaded logic of every node (children first).
+        Counts of all nodes are checked in only one browser call per poll.
+        If an iframe is found, wait_until_loaded_succeeded_sequentially is used instead.
+        Timeout is shared by all the checks and custom logic (see pb_util.Deadline).
+        """
+        timeout = pb_util.Deadline.from_timeout(timeout)
+        loaded = self._wait_until_counts_loaded(timeout, raise_error, force_count_not_zero)
+        if loaded is None:
+            return self.wait_until_loaded_succeeded_sequentially(timeout, raise_error, force_count_not_zero)
+        if loaded is False:
+            return False
+
+        # Custom wait_until_loaded logic
+        try:
+            self._run_override_wait_until_loaded(timeout)
+        except Exception as e:
+            if raise_error is True:
+                raise e
+            else:
+                return False
+
+        # All validations passed
+        return True
+
+    def _wait_until_counts_loaded(self,
+                                  timeout: pb_types.TimeoutType,
+                                  raise_error: bool,
+                                  force_count_not_zero: bool) -> Optional[bool]:
+        # Returns None if nodes can not be checked in only one browser call (iframes)
+        timeout = pb_util.Deadline.from_timeout(timeout)
+        nodes: list[GenericNode] = [self, *self.descendants]
+        relative_xpaths = [self._xpath_relative_to_multiple_ancestor(node) for node in nodes]
+        state = {}
+
+        def counts_loaded() -> bool:
+            state.update(self.pbc.get_nodes_load_state(nodes, relative_xpaths, force_count_not_zero))
+            return state["frame"] is True or len(state["failures"]) == 0
+
+        success, _ = pb_util.wait_until(counts_loaded, timeout=timeout, wait_for_change=self.pbc.wait_for_change)
+        if state.get("frame") is True:
+            return None
+        if success is True:
+            return True
+        if raise_error is True:
+            if "failures" in state:
+                failures = []
+                for position, indexes, num_elements in state["failures"]:
+                    node = nodes[position]
+                    where = f" (elements {indexes} of multiple ancestors)" if len(indexes) > 0 else ""
+                    failures.append(f"{node}{where}: count={num_elements}, valid_count={node.valid_count}")
+                details = "\n".join(failures)
+            else:
+                details = "Nodes could not be checked"
+            plural = "s" if timeout.timeout == 1 else ""
+            raise TimeoutError(f"WebNode not loaded after {timeout} second{plural}, "
+                               f"force_count_not_zero={force_count_not_zero}: {self}\n{details}")
+        return False
+
+    def _xpath_relative_to_multiple_ancestor(self, node: GenericNode) -> Optional[str]:
+        # Descendants of a multiple node are checked for each of its elements (like in get_multiple_nodes)
+        chain: list[GenericNode] = []
+        while node is not self:
+            chain.insert(0, node)
+            node = node.parent
+            if node.is_multiple and node.locator is not None:
+                return _relative_xpath(chain)
+        return None
+
+    def _run_override_wait_until_loaded(self, timeout: pb_types.TimeoutType) -> None:
+        if self.is_multiple and self.locator is not None:
+            # Like in sequential loading, descendants logic runs in the nodes generated for every element
+            if any(node._has_override_wait_until_loaded() for node in self.descendants):
+                for node in self.get_multiple_nodes():
+                    node._run_override_wait_until_loaded(timeout)
+        else:
+            for child in self.children:
+                child: GenericNode
+                child._run_override_wait_until_loaded(timeout)
+        self.override_wait_until_loaded(timeout)
+
+    def _has_override_wait_until_loaded(self) -> bool:
+        return type(self).override_wait_until_loaded is not GenericNode.override_wait_until_loaded
+
+    def wait_until_loaded_succeeded_sequentially(self,
+                                                 timeout: pb_types.TimeoutType = None,
+                                                 raise_error: bool = True,
+                                                 force_count_not_zero: bool = True, ) -> bool:
+        """Previous wait_until_loaded_succeeded: one wait (and browser calls) per node, switching to iframes"""
+        timeout = pb_util.Deadline.from_timeout(timeout)
         element_in_iframe = self.is_element_in_an_iframe()
         # Handle special case: if locator is None, no valid_count validation.
         if self.locator is not None:
@@ -583,12 +916,12 @@ class GenericNode(AnyNode, EnforceOverrides):
         if self.is_multiple:
             multiples = self.get_multiple_nodes()
             for node in multiples:
-                node.wait_until_loaded_succeeded(timeout, raise_error)
+                node.wait_until_loaded_succeeded_sequentially(timeout, raise_error)
                 children = children + list(node.children)
         else:
             children = list(self.children)
         for node in children:
-            loaded = node.wait_until_loaded_succeeded(timeout, raise_error, force_count_not_zero=False)
+            loaded = node.wait_until_loaded_succeeded_sequentially(timeout, raise_error, force_count_not_zero=False)
             if loaded is False:
                 if element_in_iframe is True:
                     self.switch_to_default_content()
@@ -609,19 +942,19 @@ class GenericNode(AnyNode, EnforceOverrides):
             # All validations passed
             return True
 
-    def override_wait_until_loaded(self, timeout: pb_types.NumberType = None) -> None:
+    def override_wait_until_loaded(self, timeout: pb_types.TimeoutType = None) -> None:
         pass
 
     ######################
     # get/set field value
     ######################
-    def override_get_field_value(self, timeout: pb_types.NumberType = None) -> Any:
+    def override_get_field_value(self, timeout: pb_types.TimeoutType = None) -> Any:
         return self.default_get_field_value(timeout)
 
-    def override_set_field_value(self, value: Any, timeout: pb_types.NumberType = None) -> None:
+    def override_set_field_value(self, value: Any, timeout: pb_types.TimeoutType = None) -> None:
         self.default_set_field_value(value, timeout)
 
-    def get_field_value(self, timeout: pb_types.NumberType = None) -> Any:
+    def get_field_value(self, timeout: pb_types.TimeoutType = None) -> Any:
         for node in self.path[:-1]:
             node: GenericNode
             rel_name = node.relative_name_of_descendant(self)
@@ -631,7 +964,7 @@ class GenericNode(AnyNode, EnforceOverrides):
         else:
             return self.override_get_field_value(timeout)
 
-    def set_field_value(self, value: Any, timeout: pb_types.NumberType = None) -> None:
+    def set_field_value(self, value: Any, timeout: pb_types.TimeoutType = None) -> None:
         if value is None:
             return
         for node in self.path[:-1]:
@@ -644,27 +977,13 @@ class GenericNode(AnyNode, EnforceOverrides):
         else:
             self.override_set_field_value(value, timeout)
 
-    def default_get_field_value(self, timeout: pb_types.NumberType = None) -> Any:
+    def default_get_field_value(self, timeout: pb_types.TimeoutType = None) -> Any:
         if self.is_multiple:
-            return [node.default_get_field_value(timeout) for node in self.get_multiple_nodes()]
+            return [field_value_from_snapshot(snapshot) for snapshot in self.get_field_snapshots()]
         else:
-            tag_name = self.get_tag_name(timeout)
-            text = self.get_text(timeout)
-            if pb_util.caseless_equal(tag_name, "input"):
-                element_type = self.get_attribute("type", timeout, hard_fail=False)
-                if isinstance(element_type, str) \
-                        and pb_util.caseless_text_in_texts(element_type, ["checkbox", "radio"]):
-                    return self.is_selected()
-                elif text in [None, ""]:
-                    return self.get_attribute("value", timeout, hard_fail=False)
-                else:
-                    return text
-            elif pb_util.caseless_equal(tag_name, "select"):
-                return self.get_selected_options()
-            else:
-                return text
+            return field_value_from_snapshot(self.get_field_snapshot(timeout))
 
-    def default_set_field_value(self, value: Any, timeout: pb_types.NumberType = None) -> None:
+    def default_set_field_value(self, value: Any, timeout: pb_types.TimeoutType = None) -> None:
         if self.is_multiple and isinstance(value, list):
             nodes = self.get_multiple_nodes()
             for i in range(len(value)):
@@ -725,11 +1044,10 @@ class GenericNode(AnyNode, EnforceOverrides):
 
     def wait_until_field_value_succeeded(self,
                                          condition: Union[Callable[[Any], bool], Any],
-                                         timeout: pb_types.NumberType = None,
+                                         timeout: pb_types.TimeoutType = None,
                                          equals: bool = True,
                                          raise_error: bool = True) -> bool:
-        if timeout is None:
-            timeout = LARGE_TIMEOUT
+        timeout = pb_util.Deadline.from_timeout(timeout)
         if raise_error is True:
             raise_error = f"Timeout in wait_until_field_value_is: " \
                           f"condition={condition}, timeout={timeout}, equals={equals}. Node: {self}"
@@ -739,65 +1057,142 @@ class GenericNode(AnyNode, EnforceOverrides):
             success, _ = pb_util.wait_until(lambda: condition(self.get_field_value(timeout)),
                                             timeout=timeout,
                                             equals=equals,
-                                            raise_error=raise_error)
+                                            raise_error=raise_error,
+                                            wait_for_change=self.pbc.wait_for_change)
             return success
         else:
             success, _ = pb_util.wait_until(lambda: self.get_field_value(timeout),
                                             expected=condition,
                                             timeout=timeout,
                                             equals=equals,
-                                            raise_error=raise_error)
+                                            raise_error=raise_error,
+                                            wait_for_change=self.pbc.wait_for_change)
             return success
 
+    ########
+    # Async
+    ########
+    async def arun(self, method: Union[str, Callable[..., R]], *args: Any, **kwargs: Any) -> R:
+        """
+        Runs a method of the node (or any callable) in the worker thread of its PombaseCase (see pb_aio), so the event
+        loop is not blocked. Example: `await node.arun("get_text")`
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+        return await pb_aio.run(self.pbc, method, *args, **kwargs)
+
+    async def aclick(self, timeout: pb_types.TimeoutType = None) -> None:
+        await self.arun(self.click, timeout=timeout)
+
+    async def aupdate_text(self, text: str, timeout: pb_types.TimeoutType = None) -> None:
+        await self.arun(self.update_text, text, timeout=timeout)
+
+    async def aget_text(self, timeout: pb_types.TimeoutType = None) -> str:
+        return await self.arun(self.get_text, timeout=timeout)
+
+    async def aget_field_value(self, timeout: pb_types.TimeoutType = None) -> Any:
+        return await self.arun(self.get_field_value, timeout=timeout)
+
+    async def aset_field_value(self, value: Any, timeout: pb_types.TimeoutType = None) -> None:
+        await self.arun(self.set_field_value, value, timeout=timeout)
+
+    async def await_loaded(self,
+                           timeout: pb_types.TimeoutType = None,
+                           raise_error: bool = True,
+                           force_count_not_zero: bool = True, ) -> bool:
+        """Async wait_until_loaded_succeeded"""
+        return await self.arun(self.wait_until_loaded_succeeded, timeout, raise_error, force_count_not_zero)
+
     #######################
     # PomBaseCase methods
     #######################
     def count(self) -> int:
         return self.pbc.count(selector=self)
 
-    def is_iframe(self, timeout: pb_types.NumberType = None) -> bool:
+    def is_iframe(self, timeout: pb_types.TimeoutType = None) -> bool:
         return self.pbc.is_iframe(selector=self, timeout=timeout)
 
     def switch_to_default_content(self) -> None:
         self.pbc.switch_to_default_content()
 
-    def get_tag_name(self, timeout: pb_types.NumberType = None) -> str:
+    def get_tag_name(self, timeout: pb_types.TimeoutType = None) -> str:
         return self.pbc.get_tag_name(selector=self, timeout=timeout)
 
-    def get_selected_options(self, timeout: pb_types.NumberType = None) -> list[str]:
+    def get_field_snapshot(self, timeout: pb_types.TimeoutType = None) -> dict:
+        return self.pbc.get_field_snapshot(selector=self, timeout=timeout)
+
+    def get_field_snapshots(self) -> list[dict]:
+        return self.pbc.get_field_snapshots(selector=self)
+
+    def snapshot(self) -> dict:
+        """
+        Reads the whole subtree in only one browser call.
+        Returns a nested dict keyed by full_name. Each value is a dict with keys: count, visible, valid_count
+        (True if count is valid), value (field value, only for leaf nodes) and children (named descendants).
+        Unnamed descendants are not included (but their named descendants are).
+        Nodes inside an iframe are not searched, so their count is None.
+        """
+        nodes: list[GenericNode] = [self, *self.descendants]
+        results = self.pbc.get_nodes_snapshot(nodes)
+        entries: dict[GenericNode, dict] = {}
+        for node, result in zip(nodes, results):
+            num_elements = result["count"]
+            fields = result["fields"]
+            if fields is None:
+                value = None
+            elif node.is_multiple:
+                value = [field_value_from_snapshot(field) for field in fields]
+            else:
+                value = field_value_from_snapshot(fields[0]) if len(fields) > 0 else None
+            entry = {
+                "count": num_elements,
+                "visible": result["visible"],
+                "valid_count": num_elements in node.valid_count if num_elements is not None else None,
+                "value": value,
+                "children": {},
+            }
+            entries[node] = entry
+            if node is not self and node.name is not None:
+                parent: GenericNode = node.parent
+                while parent is not self and parent.name is None:
+                    parent = parent.parent
+                entries[parent]["children"][node.full_name] = entry
+        return {self.full_name: entries[self]}
+
+    def get_selected_options(self, timeout: pb_types.TimeoutType = None) -> list[str]:
         return self.pbc.get_selected_options(selector=self, timeout=timeout)
 
-    def deselect_all_options(self, timeout: pb_types.NumberType = None) -> None:
+    def deselect_all_options(self, timeout: pb_types.TimeoutType = None) -> None:
         return self.pbc.deselect_all_options(selector=self, timeout=timeout)
 
     #######################
     # SeleniumBase methods
     #######################
-    def click(self, timeout: pb_types.NumberType = None, delay: int = 0) -> None:
+    def click(self, timeout: pb_types.TimeoutType = None, delay: int = 0) -> None:
         self.pbc.click(selector=self, timeout=timeout, delay=delay)
 
-    def slow_click(self, timeout: pb_types.NumberType = None) -> None:
+    def slow_click(self, timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.slow_click(selector=self, timeout=timeout)
 
-    def double_click(self, timeout: pb_types.NumberType = None) -> None:
+    def double_click(self, timeout: pb_types.TimeoutType = None) -> None:
         return self.pbc.double_click(selector=self, timeout=timeout)
 
-    def click_chain(self, timeout: pb_types.NumberType = None, spacing: int = 0) -> None:
+    def click_chain(self, timeout: pb_types.TimeoutType = None, spacing: int = 0) -> None:
         self.pbc.click_chain(selector=self, timeout=timeout, spacing=spacing)
 
-    def add_text(self, text: str, timeout: pb_types.NumberType = None) -> None:
+    def add_text(self, text: str, timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.add_text(selector=self, text=text, timeout=timeout)
 
-    def update_text(self, text: str, timeout: pb_types.NumberType = None, retry: bool = False) -> None:
+    def update_text(self, text: str, timeout: pb_types.TimeoutType = None, retry: bool = False) -> None:
         self.pbc.update_text(selector=self, text=text, timeout=timeout, retry=retry)
 
     def submit(self) -> None:
         self.pbc.submit(selector=self)
 
-    def clear(self, timeout: pb_types.NumberType = None) -> None:
+    def clear(self, timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.clear(selector=self, timeout=timeout)
 
-    def focus(self, timeout: pb_types.NumberType = None) -> None:
+    def focus(self, timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.focus(selector=self, timeout=timeout)
 
     def is_element_present(self) -> bool:
@@ -812,31 +1207,31 @@ class GenericNode(AnyNode, EnforceOverrides):
     def is_text_visible(self, text: str) -> bool:
         return self.pbc.is_text_visible(text=text, selector=self)
 
-    def get_text(self, timeout: pb_types.NumberType = None) -> str:
+    def get_text(self, timeout: pb_types.TimeoutType = None) -> str:
         return self.pbc.get_text(selector=self, timeout=timeout)
 
     def get_attribute(self,
                       attribute: str,
-                      timeout: pb_types.NumberType = None,
+                      timeout: pb_types.TimeoutType = None,
                       hard_fail: bool = True, ) -> Union[None, str, bool, int]:
         return self.pbc.get_attribute(selector=self, attribute=attribute, timeout=timeout, hard_fail=hard_fail)
 
-    def set_attribute(self, attribute: str, value: Any, timeout: pb_types.NumberType = None) -> None:
+    def set_attribute(self, attribute: str, value: Any, timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.set_attribute(selector=self, attribute=attribute, value=value, timeout=timeout)
 
     def set_attributes(self, attribute: str, value: Any) -> None:
         self.pbc.set_attributes(selector=self, attribute=attribute, value=value)
 
-    def remove_attribute(self, attribute: str, timeout: pb_types.NumberType = None) -> None:
+    def remove_attribute(self, attribute: str, timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.remove_attribute(selector=self, attribute=attribute, timeout=timeout)
 
     def remove_attributes(self, attribute: str) -> None:
         self.pbc.remove_attributes(selector=self, attribute=attribute)
 
-    def get_property_value(self, property: str, timeout: pb_types.NumberType = None) -> str:
+    def get_property_value(self, property: str, timeout: pb_types.TimeoutType = None) -> str:
         return self.pbc.get_property_value(selector=self, property=property, timeout=timeout)
 
-    def get_image_url(self, timeout: pb_types.NumberType = None) -> Optional[str]:
+    def get_image_url(self, timeout: pb_types.TimeoutType = None) -> Optional[str]:
         return self.pbc.get_image_url(selector=self, timeout=timeout)
 
     def find_elements(self, limit: int = 0) -> list[WebElement]:
@@ -845,16 +1240,16 @@ class GenericNode(AnyNode, EnforceOverrides):
     def find_visible_elements(self, limit: int = 0) -> list[WebElement]:
         return self.pbc.find_visible_elements(selector=self, limit=limit)
 
-    def click_visible_elements(self, limit: int = 0, timeout: pb_types.NumberType = None) -> None:
+    def click_visible_elements(self, limit: int = 0, timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.click_visible_elements(selector=self, limit=limit, timeout=timeout)
 
-    def click_nth_visible_element(self, number, timeout: pb_types.NumberType = None) -> None:
+    def click_nth_visible_element(self, number, timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.click_nth_visible_element(selector=self, number=number, timeout=timeout)
 
     def click_if_visible(self) -> None:
         self.pbc.click_if_visible(selector=self)
 
-    def is_selected(self, timeout: pb_types.NumberType = None) -> bool:
+    def is_selected(self, timeout: pb_types.TimeoutType = None) -> bool:
         return self.pbc.is_selected(selector=self, timeout=timeout)
 
     def select_if_unselected(self) -> None:
@@ -881,7 +1276,7 @@ class GenericNode(AnyNode, EnforceOverrides):
     def hover_and_click(self,
                         click_selector: Union[str, GenericNode],
                         click_by: str = None,
-                        timeout: pb_types.NumberType = None, ) -> WebElement:
+                        timeout: pb_types.TimeoutType = None, ) -> WebElement:
         return self.pbc.hover_and_click(
             hover_selector=self,
             click_selector=click_selector,
@@ -892,7 +1287,7 @@ class GenericNode(AnyNode, EnforceOverrides):
     def hover_and_double_click(self,
                                click_selector: Union[str, GenericNode],
                                click_by: str = None,
-                               timeout: pb_types.NumberType = None, ) -> WebElement:
+                               timeout: pb_types.TimeoutType = None, ) -> WebElement:
         return self.pbc.hover_and_double_click(
             hover_selector=self,
             click_selector=click_selector,
@@ -903,7 +1298,7 @@ class GenericNode(AnyNode, EnforceOverrides):
     def drag_and_drop(self,
                       drop_selector: Union[str, GenericNode],
                       drop_by: str = None,
-                      timeout: pb_types.NumberType = None, ) -> WebElement:
+                      timeout: pb_types.TimeoutType = None, ) -> WebElement:
         return self.pbc.drag_and_drop(
             drag_selector=self,
             drop_selector=drop_selector,
@@ -911,19 +1306,19 @@ class GenericNode(AnyNode, EnforceOverrides):
             timeout=timeout,
         )
 
-    def drag_and_drop_with_offset(self, x: int, y: int, timeout: pb_types.NumberType = None) -> WebElement:
+    def drag_and_drop_with_offset(self, x: int, y: int, timeout: pb_types.TimeoutType = None) -> WebElement:
         return self.pbc.drag_and_drop_with_offset(selector=self, x=x, y=y, timeout=timeout)
 
-    def select_option_by_text(self, option: str, timeout: pb_types.NumberType = None) -> None:
+    def select_option_by_text(self, option: str, timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.select_option_by_text(dropdown_selector=self, option=option, timeout=timeout)
 
-    def select_option_by_index(self, option: int, timeout: pb_types.NumberType = None) -> None:
+    def select_option_by_index(self, option: int, timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.select_option_by_index(dropdown_selector=self, option=option, timeout=timeout)
 
-    def select_option_by_value(self, option: Union[str, int], timeout: pb_types.NumberType = None) -> None:
+    def select_option_by_value(self, option: Union[str, int], timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.select_option_by_value(dropdown_selector=self, option=option, timeout=timeout)
 
-    def switch_to_frame(self, timeout: pb_types.NumberType = None) -> None:
+    def switch_to_frame(self, timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.switch_to_frame(frame=self, timeout=timeout)
 
     def bring_to_front(self) -> None:
@@ -950,10 +1345,10 @@ class GenericNode(AnyNode, EnforceOverrides):
     def press_right_arrow(self="html", times: int = 1) -> None:
         self.pbc.press_right_arrow(selector=self, times=times)
 
-    def scroll_to(self, timeout: pb_types.NumberType = None) -> None:
+    def scroll_to(self, timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.scroll_to(selector=self, timeout=timeout)
 
-    def slow_scroll_to(self, timeout: pb_types.NumberType = None) -> None:
+    def slow_scroll_to(self, timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.slow_scroll_to(selector=self, timeout=timeout)
 
     def js_click(self, all_matches: bool = False) -> None:
@@ -986,71 +1381,71 @@ class GenericNode(AnyNode, EnforceOverrides):
     def remove_elements(self) -> None:
         self.pbc.remove_elements(selector=self)
 
-    def choose_file(self, file_path, timeout: pb_types.NumberType = None) -> None:
+    def choose_file(self, file_path, timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.choose_file(selector=self, file_path=file_path, timeout=timeout)
 
-    def set_value(self, text: str, timeout: pb_types.NumberType = None) -> None:
+    def set_value(self, text: str, timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.set_value(selector=self, text=text, timeout=timeout)
 
-    def js_update_text(self, text: str, timeout: pb_types.NumberType = None) -> None:
+    def js_update_text(self, text: str, timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.js_update_text(selector=self, text=text, timeout=timeout)
 
-    def jquery_update_text(self, text: str, timeout: pb_types.NumberType = None) -> None:
+    def jquery_update_text(self, text: str, timeout: pb_types.TimeoutType = None) -> None:
         self.pbc.jquery_update_text(selector=self, text=text, timeout=timeout)
 
     def post_message_and_highlight(self, message) -> None:
         self.pbc.post_message_and_highlight(message, self)
 
-    def wait_for_element_present(self, timeout: pb_types.NumberType = None) -> WebElement:
+    def wait_for_element_present(self, timeout: pb_types.TimeoutType = None) -> WebElement:
         return self.pbc.wait_for_element_present(selector=self, timeout=timeout)
 
-    def assert_element_present(self, timeout: pb_types.NumberType = None) -> bool:
+    def assert_element_present(self, timeout: pb_types.TimeoutType = None) -> bool:
         return self.pbc.assert_element_present(selector=self, timeout=timeout)
 
-    def wait_for_element_visible(self, timeout: pb_types.NumberType = None) -> WebElement:
+    def wait_for_element_visible(self, timeout: pb_types.TimeoutType = None) -> WebElement:
         return self.pbc.wait_for_element_visible(selector=self, timeout=timeout)
 
-    def assert_element_visible(self, timeout: pb_types.NumberType = None) -> bool:
+    def assert_element_visible(self, timeout: pb_types.TimeoutType = None) -> bool:
         return self.pbc.assert_element_visible(selector=self, timeout=timeout)
 
     def wait_for_exact_text_visible(self,
                                     text: str,
-                                    timeout: pb_types.NumberType = None) -> Union[bool, WebElement]:
+                                    timeout: pb_types.TimeoutType = None) -> Union[bool, WebElement]:
         return self.pbc.wait_for_exact_text_visible(text=text, selector=self, timeout=timeout)
 
     def wait_for_text_visible(self,
                               text: str,
-                              timeout: pb_types.NumberType = None) -> Union[bool, WebElement]:
+                              timeout: pb_types.TimeoutType = None) -> Union[bool, WebElement]:
         return self.pbc.wait_for_text_visible(text=text, selector=self, timeout=timeout)
 
-    def assert_text_visible(self, text: str, timeout: pb_types.NumberType = None) -> bool:
+    def assert_text_visible(self, text: str, timeout: pb_types.TimeoutType = None) -> bool:
         return self.pbc.assert_text_visible(text=text, selector=self, timeout=timeout)
 
-    def assert_exact_text(self, text: str, timeout: pb_types.NumberType = None) -> bool:
+    def assert_exact_text(self, text: str, timeout: pb_types.TimeoutType = None) -> bool:
         return self.pbc.assert_exact_text(text=text, selector=self, timeout=timeout)
 
-    def wait_for_element_not_present(self, timeout: pb_types.NumberType = None) -> bool:
+    def wait_for_element_not_present(self, timeout: pb_types.TimeoutType = None) -> bool:
         return self.pbc.wait_for_element_not_present(selector=self, timeout=timeout)
 
-    def assert_element_not_present(self, timeout: pb_types.NumberType = None) -> bool:
+    def assert_element_not_present(self, timeout: pb_types.TimeoutType = None) -> bool:
         return self.pbc.assert_element_not_present(selector=self, timeout=timeout)
 
-    def wait_for_element_not_visible(self, timeout: pb_types.NumberType = None) -> bool:
+    def wait_for_element_not_visible(self, timeout: pb_types.TimeoutType = None) -> bool:
         return self.pbc.wait_for_element_not_visible(selector=self, timeout=timeout)
 
-    def assert_element_not_visible(self, timeout: pb_types.NumberType = None) -> bool:
+    def assert_element_not_visible(self, timeout: pb_types.TimeoutType = None) -> bool:
         return self.pbc.assert_element_not_visible(selector=self, timeout=timeout)
 
-    def wait_for_text_not_visible(self, text: str, timeout: pb_types.NumberType = None) -> bool:
+    def wait_for_text_not_visible(self, text: str, timeout: pb_types.TimeoutType = None) -> bool:
         return self.pbc.wait_for_text_not_visible(text=text, selector=self, timeout=timeout)
 
-    def assert_text_not_visible(self, text: str, timeout: pb_types.NumberType = None) -> bool:
+    def assert_text_not_visible(self, text: str, timeout: pb_types.TimeoutType = None) -> bool:
         return self.pbc.assert_text_not_visible(text=text, selector=self, timeout=timeout)
 
-    def deferred_assert_element(self, timeout: pb_types.NumberType = None) -> bool:
+    def deferred_assert_element(self, timeout: pb_types.TimeoutType = None) -> bool:
         return self.pbc.deferred_assert_element(selector=self, timeout=timeout)
 
-    def deferred_assert_text(self, text: str, timeout: pb_types.NumberType = None) -> bool:
+    def deferred_assert_text(self, text: str, timeout: pb_types.TimeoutType = None) -> bool:
         return self.pbc.deferred_assert_text(text=text, selector=self, timeout=timeout)
 
 
@@ -1078,12 +1473,12 @@ class SingleWebNode(GenericNode):
     ######################
     @final
     @overrides
-    def get_field_value(self, timeout: pb_types.NumberType = None) -> Any:
+    def get_field_value(self, timeout: pb_types.TimeoutType = None) -> Any:
         return super().get_field_value(timeout)
 
     @final
     @overrides
-    def set_field_value(self, value: Any, timeout: pb_types.NumberType = None) -> None:
+    def set_field_value(self, value: Any, timeout: pb_types.TimeoutType = None) -> None:
         super().set_field_value(value, timeout)
 
 
@@ -1110,27 +1505,210 @@ class MultipleWebNode(GenericNode):
     # get/set field value
     ######################
     @overrides
-    def override_get_field_value(self, timeout: pb_types.NumberType = None) -> list:
+    def override_get_field_value(self, timeout: pb_types.TimeoutType = None) -> list:
         return self.default_get_field_value(timeout)
 
     @final
     @overrides
-    def get_field_value(self, timeout: pb_types.NumberType = None) -> list:
+    def get_field_value(self, timeout: pb_types.TimeoutType = None) -> list:
         return super().get_field_value(timeout)
 
     @final
     @overrides
-    def set_field_value(self, value: Any, timeout: pb_types.NumberType = None) -> None:
+    def set_field_value(self, value: Any, timeout: pb_types.TimeoutType = None) -> None:
         super().set_field_value(value, timeout)
 
 
+class MultipleNodesView(Sequence):
+    """
+    Nodes found by a multiple node, returned by GenericNode.get_multiple_nodes.
+    Length is the number of elements found when it was created. Each node is only created (and attached to multiple
+    node's parent) when it is accessed.
+    """
+
+    def __init__(self, multiple_node: GenericNode, length: int) -> None:
+        self._multiple_node = multiple_node
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[SingleWebNode, list[SingleWebNode]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        index = operator.index(index)
+        if index < 0:
+            index = index + self._length
+        if index < 0 or index >= self._length:
+            raise IndexError(f"Node index out of range: {index}. Length: {self._length}")
+        return self._multiple_node._get_multiple_node(index)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._multiple_node}, length={self._length})"
+
+
 class PageNode(GenericNode):
+    # Set to True to build (and validate) the page tree only once per class and name, and then clone it for every new
+    # instance. Only valid if init_node result is always the same (i.e., it does not depend on pbc or on instance
+    # attributes). Pages overriding __init__ are never cloned, because their tree may depend on __init__ arguments
+    use_template: bool = False
+    _templates: dict[tuple[type, str], PageNode] = {}
+
     @overrides
     def __init__(self, pbc: pombase_case.PombaseCase = None, name: str = None) -> None:
         if name is None and (self.default_name is None or len(self.default_name) == 0):
             name = underscore(self.__class__.__name__)
         super().__init__(name=name, pbc=pbc, valid_count=1)
 
+        if self._is_template_enabled() and self._get_template() is None:
+            template = self.copy(recursive=True)
+            template._pbc = None
+            PageNode._templates[(self.__class__, self.name)] = template
+
+    def _is_template_enabled(self) -> bool:
+        return self.use_template is True and self.__class__.__init__ is PageNode.__init__
+
+    def _get_template(self) -> Optional[PageNode]:
+        return PageNode._templates.get((self.__class__, self.name))
+
+    @classmethod
+    def clear_templates(cls) -> None:
+        for key in [key for key in PageNode._templates if issubclass(key[0], cls)]:
+            del PageNode._templates[key]
+
+    @overrides
+    def _build_node(self) -> bool:
+        template = self._get_template() if self._is_template_enabled() else None
+        if template is None:
+            return super()._build_node()
+
+        mapping: dict[GenericNode, GenericNode] = {template: self}
+        template._clone_children_into(self, mapping)
+        # Attributes created in init_node
+        for key, value in template.__dict__.items():
+            if key not in self.__dict__ and key not in _TREE_STATE_KEYS:
+                self.__dict__[key] = value
+        for node in mapping.values():
+            node._remap_node_references(mapping)
+        return True
+
+
+def _remap_value(value: Any, mapping: dict[GenericNode, GenericNode]) -> Any:
+    # Returns value with original nodes replaced by their clones. Lists, tuples, sets and dicts are copied recursively
+    if isinstance(value, GenericNode):
+        return mapping.get(value, value)
+    if isinstance(value, (list, set, dict)):
+        new_value = python_copy(value)
+        new_value.clear()
+        if isinstance(value, dict):
+            new_value.update((_remap_value(k, mapping), _remap_value(v, mapping)) for k, v in value.items())
+        elif isinstance(value, list):
+            new_value.extend(_remap_value(v, mapping) for v in value)
+        else:
+            new_value.update(_remap_value(v, mapping) for v in value)
+        return new_value
+    if isinstance(value, (tuple, frozenset)) and not hasattr(value, "_fields"):
+        return value.__class__(_remap_value(v, mapping) for v in value)
+    return value
+
+
+# Node attributes that are not copied when cloning a node
+_TREE_STATE_KEYS = ("_NodeMixin__parent", "_NodeMixin__children", "_name_index",
+                    "_compound_locator_cache", "_optimized_locator_cache", "_validation_deferred",
+                    "_multiple_nodes", "_multiple_nodes_key", "_generated_subtree", "_cached_table_snapshots")
+
+
+class TableSnapshot:
+    """
+    Contents of a table, read in only one browser call (see TableNode.get_table_snapshot), stored by columns:
+    header texts (None if table has no header cells) and the field values of the cells of each column (None for rows
+    without that cell). Row filters check a whole column at once, and indexes (see index_by) are built only once, both
+    without any browser call. epoch is the table epoch when the snapshot was read (see PombaseCase.get_table_epoch).
+    """
+
+    def __init__(self, headers: Optional[list[str]], rows: list[list[Any]], epoch: Optional[str] = None) -> None:
+        self.headers = headers
+        self.epoch = epoch
+        self._indexes: dict[int, dict[Any, list[int]]] = {}
+        num_columns = max([len(row) for row in rows] + [0 if headers is None else len(headers)])
+        self.columns: list[list[Any]] = [[row[i] if i < len(row) else None for row in rows] for i in range(num_columns)]
+        self._row_lengths = [len(row) for row in rows]
+
+    @classmethod
+    def from_script_result(cls, result: dict) -> TableSnapshot:
+        """Snapshot from the result of PombaseCase.get_table_snapshot"""
+        headers = None if result["headers"] is None else [header["text"].strip() for header in result["headers"]]
+        rows = [[field_value_from_snapshot(cell) for cell in row] for row in result["rows"]]
+        return cls(headers, rows, result.get("epoch"))
+
+    @cached_property
+    def header_lookup(self) -> Optional[HeaderLookup]:
+        return None if self.headers is None else HeaderLookup(self.headers)
+
+    @property
+    def num_rows(self) -> int:
+        return len(self._row_lengths)
+
+    @property
+    def num_columns(self) -> int:
+        return len(self.columns)
+
+    def column_index(self, column: Union[int, str]) -> int:
+        """column can be the index or the header text (see header_index)"""
+        if not isinstance(column, str):
+            return column
+        if self.header_lookup is None:
+            raise RuntimeError(f"Table has no header cells, so column '{column}' can not be found")
+        index = self.header_lookup.get(column)
+        if index is None:
+            raise RuntimeError(f"Table has no column '{column}'. Headers: {self.headers}")
+        return index
+
+    def column(self, column: Union[int, str]) -> list[Any]:
+        index = self.column_index(column)
+        if -self.num_columns <= index < self.num_columns:
+            return self.columns[index]
+        return [None] * self.num_rows
+
+    def rows(self) -> list[list[Any]]:
+        return [[values[row] for values in self.columns[:length]] for row, length in enumerate(self._row_lengths)]
+
+    def dicts(self) -> list[dict[str, Any]]:
+        if self.headers is None:
+            raise RuntimeError("Table has no header cells, so rows can not be read as dicts")
+        return [dict(zip(self.headers, row)) for row in self.rows()]
+
+    def filter_rows(self, row_filter: dict[Union[int, str], Callable[[Any], bool]]) -> list[int]:
+        """Indexes of the rows where no condition returns False (each condition receives the value of its column)"""
+        rows = list(range(self.num_rows))
+        for column, condition in row_filter.items():
+            values = self.column(column)
+            rows = [row for row in rows if condition(values[row]) is not False]
+        return rows
+
+    def index_by(self, column: Union[int, str]) -> dict[Any, list[int]]:
+        """Value of column -> indexes of the rows with that value (lists of selected options are used as tuples)"""
+        index = self.column_index(column)
+        if index not in self._indexes:
+            rows_by_value: dict[Any, list[int]] = {}
+            for row, value in enumerate(self.column(index)):
+                rows_by_value.setdefault(tuple(value) if isinstance(value, list) else value, []).append(row)
+            self._indexes[index] = rows_by_value
+        return self._indexes[index]
+
+    def rows_for(self, values: dict[Union[int, str], Any]) -> list[int]:
+        """Indexes of the rows whose columns have all the given values (using index_by)"""
+        rows = None
+        for column, value in values.items():
+            key = tuple(value) if isinstance(value, list) else value
+            found = self.index_by(column).get(key, [])
+            if rows is None:
+                rows = found
+            else:
+                found = set(found)
+                rows = [row for row in rows if row in found]
+        return list(range(self.num_rows)) if rows is None else list(rows)
+
 
 class TableNode(SingleWebNode):
     @overrides
@@ -1164,61 +1742,50 @@ class TableNode(SingleWebNode):
             if self.header_cell_locator is not None else None
         self.mwn_data_rows = MultipleWebNode(self.data_row_locator)
 
-    def get_header_cell_text(self, column: int, timeout: pb_types.NumberType = None) -> str:
+    def get_header_cell_text(self, column: int, timeout: pb_types.TimeoutType = None) -> str:
         return self.mwn_header_cells.get_multiple_nodes()[column].get_text(timeout)
 
-    def get_header_cells_texts(self, timeout: pb_types.NumberType = None) -> list[str]:
+    def get_header_cells_texts(self, timeout: pb_types.TimeoutType = None) -> list[str]:
         return [cell.get_text(timeout) for cell in self.mwn_header_cells.get_multiple_nodes()]
 
-    def get_header_cell_index(self, text: str, timeout: pb_types.NumberType = None) -> Optional[int]:
-        header_texts = [t.strip() for t in self.get_header_cells_texts(timeout)]
-        if text in header_texts:
-            return header_texts.index(text)
-
-        header_texts_lower = [t.lower() for t in header_texts]
-        if text in header_texts_lower:
-            return header_texts_lower.index(text)
-
-        header_texts_lower_underscore = [t.replace(" ", "_") for t in header_texts_lower]
-        if text in header_texts_lower_underscore:
-            return header_texts_lower_underscore.index(text)
-
-        indexes = [index for index, header in enumerate(header_texts) if text in header]
-        if len(indexes) > 0:
-            return indexes[0]
-
-        indexes = [index for index, header in enumerate(header_texts_lower) if text in header]
-        if len(indexes) > 0:
-            return indexes[0]
+    def get_header_cell_index(self, text: str, timeout: pb_types.TimeoutType = None) -> Optional[int]:
+        """
+        Index of the header cell that matches text (see header_index). Header texts are read only once while the table
+        does not change (see get_cached_table_snapshot), so usually only the table epoch is checked in the browser
+        """
+        header_lookup = self.get_cached_table_snapshot(timeout, with_rows=False).header_lookup
+        return None if header_lookup is None else header_lookup.get(text)
 
-        indexes = [index for index, header in enumerate(header_texts_lower_underscore) if text in header]
-        if len(indexes) > 0:
-            return indexes[0]
-
-        return None
-
-    def get_header_cell_node(self, text: str, timeout: pb_types.NumberType = None) -> Optional[SingleWebNode]:
+    def get_header_cell_node(self, text: str, timeout: pb_types.TimeoutType = None) -> Optional[SingleWebNode]:
         index = self.get_header_cell_index(text, timeout=timeout)
         if index is None:
             return None
         else:
             return self.mwn_header_cells.get_multiple_nodes()[index]
 
-    def get_data_row_cells(self, row: int, timeout: pb_types.NumberType = None) -> list[SingleWebNode]:
-        if timeout is None:
-            timeout = LARGE_TIMEOUT
+    def get_data_row_cells(self, row: int, timeout: pb_types.TimeoutType = None) -> Sequence[SingleWebNode]:
+        timeout = pb_util.Deadline.from_timeout(timeout)
         pb_util.wait_until(
             lambda: len(self.mwn_data_rows.get_multiple_nodes()) > row,
             timeout=timeout,
             raise_error=f"Table has not enough data rows. Row index searched: {row}",
         )
-        cells_node = MultipleWebNode(
-            self.data_cell_locator,
-            parent=self.mwn_data_rows.get_multiple_nodes()[row],
-        )
+        row_node = self.mwn_data_rows.get_multiple_nodes()[row]
+        # Row nodes are reused, so their cells node too
+        for cells_node in row_node.children:
+            if isinstance(cells_node, MultipleWebNode) and cells_node.locator == self.data_cell_locator:
+                break
+        else:
+            cells_node = MultipleWebNode(self.data_cell_locator, parent=row_node)
+            row_node._add_to_generated_subtree(cells_node)
         return cells_node.get_multiple_nodes()
 
-    def get_data_cell(self, row: int, column: Union[int, str], timeout: pb_types.NumberType = None) -> SingleWebNode:
+    def get_data_cell(self, row: int, column: Union[int, str], timeout: pb_types.TimeoutType = None) -> SingleWebNode:
+        if isinstance(column, str):
+            index = self.get_header_cell_index(column, timeout)
+            if index is None:
+                raise RuntimeError(f"TableNode has no column '{column}': {self}")
+            column = index
         return self.get_data_row_cells(row=row, timeout=timeout)[column]
 
     @property
@@ -1236,42 +1803,107 @@ class TableNode(SingleWebNode):
 
     def filter_rows(self,
                     row_filter: dict[Union[int, str], Callable[[Any], bool]],
-                    timeout: pb_types.NumberType = None) -> list[int]:
-        rows = []
-        column_index_cache = {}
-        for row_number in range(self.get_num_rows):
-            for column, condition in row_filter.items():
-                if isinstance(column, str):
-                    if column not in column_index_cache:
-                        column_index_cache[column] = self.get_header_cell_index(column, timeout=timeout)
-                    column = column_index_cache[column]
-                cell_value = self.get_data_cell(row_number, column, timeout=timeout).get_field_value(timeout=timeout)
-                if condition(cell_value) is False:
-                    break
-            else:
-                rows.append(row_number)
-        return rows
+                    timeout: pb_types.TimeoutType = None) -> list[int]:
+        """Indexes of the data rows that match row_filter (see TableSnapshot.filter_rows), in only one browser call"""
+        return self.get_table_snapshot(timeout).filter_rows(row_filter)
 
     def wait_until_num_rows_succeeded(self,
                                       num_rows: int,
                                       row_filter: dict[Union[int, str], Callable[[Any], bool]] = None,
-                                      timeout: pb_types.NumberType = None,
+                                      timeout: pb_types.TimeoutType = None,
                                       raise_error: bool = True) -> bool:
         if row_filter is None:
             row_filter = {}
-        if timeout is None:
-            timeout = LARGE_TIMEOUT
-        plural = "s" if timeout == 1 or timeout == 1.0 else ""
+        timeout = pb_util.Deadline.from_timeout(timeout)
+        plural = "s" if timeout.timeout == 1 else ""
         raise_error = f"TableNode had not {num_rows} rows using filter {row_filter} after {timeout} second{plural}: " \
                       f"{self}" if raise_error is True else None
+
+        def num_filtered_rows() -> int:
+            # Only one browser call per poll (a table that is not visible has no visible rows)
+            result = self.pbc.get_table_snapshot(self)
+            return 0 if result is None else len(TableSnapshot.from_script_result(result).filter_rows(row_filter))
+
         success, _ = pb_util.wait_until(
-            lambda: len(self.filter_rows(row_filter, timeout)),
+            num_filtered_rows,
             timeout=timeout,
             expected=num_rows,
             raise_error=raise_error,
         )
         return success
 
+    ##############
+    # Bulk reading
+    ##############
+    def get_table_snapshot(self, timeout: pb_types.TimeoutType = None, with_rows: bool = True) -> TableSnapshot:
+        """
+        Waits until table is visible, and reads its header cells and all its data cells (only header cells if with_rows
+        is False) in only one browser call. See PombaseCase.get_table_snapshot
+        """
+        timeout = pb_util.Deadline.from_timeout(timeout)
+        plural = "s" if timeout.timeout == 1 else ""
+        _, result = pb_util.wait_until(
+            self.pbc.get_table_snapshot,
+            args=[self, with_rows],
+            timeout=timeout,
+            expected=None,
+            equals=False,
+            raise_error=f"TableNode was not visible after {timeout} second{plural}: {self}",
+        )
+        return TableSnapshot.from_script_result(result)
+
+    def to_rows(self, timeout: pb_types.TimeoutType = None) -> list[list[Any]]:
+        """Field values of the cells of every data row, read in only one browser call"""
+        return self.get_table_snapshot(timeout).rows()
+
+    def to_dicts(self, timeout: pb_types.TimeoutType = None) -> list[dict[str, Any]]:
+        """Same as to_rows, but each row is a dict: header cell text -> field value of the cell in that column"""
+        return self.get_table_snapshot(timeout).dicts()
+
+    def column(self, column: Union[int, str], timeout: pb_types.TimeoutType = None) -> list[Any]:
+        """
+        Field values of the cells of a column (None for rows without that cell), read in only one browser call.
+        column can be the index or the header text (see get_header_cell_index)
+        """
+        return self.get_table_snapshot(timeout).column(column)
+
+    def get_cached_table_snapshot(self,
+                                  timeout: pb_types.TimeoutType = None,
+                                  with_rows: bool = True) -> TableSnapshot:
+        """
+        Same as get_table_snapshot, but previous snapshot is reused while the table does not change (checked with
+        PombaseCase.get_table_epoch, a much lighter browser call). Changes that do not modify the table element
+        (i.e., a stylesheet that hides some rows) are not noticed.
+        If with_rows is False, a previous snapshot with rows can also be reused.
+        """
+        # with_rows -> last snapshot read
+        cache: dict[bool, TableSnapshot] = self.__dict__.setdefault("_cached_table_snapshots", {})
+        candidates = [cache.get(True)] if with_rows else [cache.get(True), cache.get(False)]
+        candidates = [snapshot for snapshot in candidates if snapshot is not None and snapshot.epoch is not None]
+        if len(candidates) > 0:
+            epoch = self.pbc.get_table_epoch(self)
+            for snapshot in candidates:
+                if snapshot.epoch == epoch:
+                    return snapshot
+        snapshot = self.get_table_snapshot(timeout, with_rows)
+        cache[with_rows] = snapshot
+        return snapshot
+
+    def index_by(self, column: Union[int, str], timeout: pb_types.TimeoutType = None) -> dict[Any, list[int]]:
+        """
+        Value of column -> indexes of the data rows with that value. Built only once while the table does not change
+        (see get_cached_table_snapshot)
+        """
+        return self.get_cached_table_snapshot(timeout).index_by(column)
+
+    def row_for(self, timeout: pb_types.TimeoutType = None, **values: Any) -> Optional[int]:
+        """
+        Index of the first data row whose columns have the given values (None if there is none), using index_by.
+        Column names are matched as in get_header_cell_index. Example: table.row_for(email="x@y.com")
+        """
+        rows = self.get_cached_table_snapshot(timeout).rows_for(values)
+        return rows[0] if len(rows) > 0 else None
+
 
 def node_from(selector: Union[str, GenericNode], by: str = None) -> GenericNode:
     if isinstance(selector, GenericNode):
@@ -1280,6 +1912,105 @@ def node_from(selector: Union[str, GenericNode], by: str = None) -> GenericNode:
         return GenericNode(Locator(selector, by))
 
 
+def valid_count_bounds(valid_count: NodeCount) -> list:
+    # [minimum, maximum, values]: values are only used (and the others are None) if they are not a simple interval
+    valid_count = _normalized_valid_count(valid_count)
+    if isinstance(valid_count, range) and valid_count.step == 1:
+        return [valid_count.start, None if _is_unbounded(valid_count) else valid_count.stop - 1, None]
+    return [None, None, sorted(valid_count)]
+
+
+def _normalized_valid_count(valid_count: NodeCount) -> Iterable[int]:
+    # None means any count, and an int only that count. An itertools.count is replaced by the same values as a range:
+    # each `in` check consumes a count, so later checks (and valid_count_bounds) would use a wrong minimum
+    if valid_count is None:
+        return range(_UNBOUNDED_COUNT)
+    if isinstance(valid_count, int):
+        return [valid_count]
+    if isinstance(valid_count, count):
+        # A copy is consumed instead
+        values = python_copy(valid_count)
+        start = next(values)
+        step = next(values) - start
+        if step == 0:
+            return [start]
+        return range(start, _UNBOUNDED_COUNT if step > 0 else -_UNBOUNDED_COUNT, step)
+    return valid_count
+
+
+def _is_unbounded(valid_count: NodeCount) -> bool:
+    return isinstance(valid_count, range) and valid_count.step > 0 and valid_count.stop == _UNBOUNDED_COUNT
+
+
+def _relative_xpath(nodes: list[GenericNode]) -> Optional[str]:
+    # Xpath of nodes compound locator, relative to the element of nodes[0] parent. None if some node does not depend
+    # on its ancestors (override_parent or absolute xpath)
+    locators = []
+    for node in nodes:
+        if node.override_parent is not None:
+            return None
+        if node.locator is not None:
+            if node.locator.by == By.XPATH and node.locator.selector.startswith("/"):
+                return None
+            locators.append(node.locator)
+    if len(locators) == 0:
+        return None
+    return reduce(lambda l1, l2: l1.append(l2), locators).as_xpath_selector()
+
+
+def field_value_from_snapshot(snapshot: dict) -> Any:
+    # Same rules as previous default_get_field_value (see PombaseCase.get_field_snapshot)
+    tag_name = snapshot["tag"]
+    text = snapshot["text"]
+    if pb_util.caseless_equal(tag_name, "input"):
+        element_type = snapshot["type"]
+        if isinstance(element_type, str) and pb_util.caseless_text_in_texts(element_type, ["checkbox", "radio"]):
+            return snapshot["checked"]
+        elif text in [None, ""]:
+            return snapshot["value"]
+        else:
+            return text
+    elif pb_util.caseless_equal(tag_name, "select"):
+        return snapshot["selected"]
+    else:
+        return text
+
+
+class HeaderLookup:
+    """
+    Precomputed header_index for some header texts, so each lookup is a dict lookup: exact, lowercase and underscore
+    forms of the headers are computed at once, and substring matches the first time each text is looked up
+    """
+
+    def __init__(self, header_texts: Sequence[str]) -> None:
+        self.header_texts = [t.strip() for t in header_texts]
+        header_texts_lower = [t.lower() for t in self.header_texts]
+        header_texts_lower_underscore = [t.replace(" ", "_") for t in header_texts_lower]
+        # Same priority as header_index: all the exact matches first, then the lowercase ones, then the underscore ones
+        self._forms = (self.header_texts, header_texts_lower, header_texts_lower_underscore)
+        self._lookup: dict[str, Optional[int]] = {}
+        for forms in self._forms:
+            for index, form in enumerate(forms):
+                self._lookup.setdefault(form, index)
+
+    def get(self, text: str) -> Optional[int]:
+        if text not in self._lookup:
+            self._lookup[text] = next(
+                (index for forms in self._forms for index, header in enumerate(forms) if text in header),
+                None,
+            )
+        return self._lookup[text]
+
+
+def header_index(header_texts: Sequence[str], text: str) -> Optional[int]:
+    """
+    Index of the header that matches text (see TableNode.get_header_cell_index): first an exact match, then the same
+    ignoring case (and using underscores instead of spaces), and then headers that contain text, in the same order
+    """
+    return HeaderLookup(header_texts).get(text)
+
+
+@lru_cache(maxsize=1024)
 def as_css(selector: str, by: str = None) -> Optional[str]:
     if by is None:
         by = infer_by_from_selector(selector)
@@ -1303,6 +2034,7 @@ def as_css(selector: str, by: str = None) -> Optional[str]:
         raise RuntimeError(f"Unknown 'by': {by}")
 
 
+@lru_cache(maxsize=1024)
 def as_xpath(selector: str, by: str = None) -> str:
     if by is None:
         by = infer_by_from_selector(selector)
@@ -1341,6 +2073,169 @@ def compound(locators: Iterable[Optional[PseudoLocatorType]]) -> Locator:
         return reduce(lambda l1, l2: l1.append(l2), loc_list)
 
 
+def optimize_compound(locators: Iterable[Optional[PseudoLocatorType]]) -> Locator:
+    """
+    Same elements as `compound(locators)`, but using a selector that is cheaper to evaluate in the browser.
+
+    - Steps before the last anchor (override_parent or absolute xpath) are not used at all.
+    - If every step can be expressed as CSS, result is a CSS selector (child steps become `>` combinators).
+    - Otherwise, result is the compound xpath with redundant axes collapsed (see `optimize_xpath`).
+    """
+    loc_list: list[Locator] = []
+    for pseudo_loc in locators:
+        if isinstance(pseudo_loc, GenericNode) and pseudo_loc.override_parent is not None:
+            loc_list = [pseudo_loc.override_parent]
+        else:
+            loc = get_locator(pseudo_loc)
+            if loc is not None:
+                if loc.by == By.XPATH and loc.selector.startswith("/"):
+                    # Absolute xpath: previous locators are ignored anyway
+                    loc_list = [loc]
+                else:
+                    loc_list.append(loc)
+    if len(loc_list) == 0:
+        return Locator("html")
+
+    css_steps = []
+    for loc in loc_list:
+        css_step = _as_css_step(loc)
+        if css_step is None or (len(css_steps) == 0 and css_step.startswith(">")):
+            break
+        css_steps.append(css_step)
+    else:
+        return Locator(" ".join(css_steps), By.CSS_SELECTOR)
+
+    xpath = reduce(lambda l1, l2: l1.append(l2), loc_list).as_xpath_selector()
+    return Locator(optimize_xpath(xpath), By.XPATH)
+
+
+@lru_cache(maxsize=1024)
+def optimize_xpath(xpath: str) -> str:
+    """
+    Collapses redundant axes in an xpath (string literals are not modified). For example:
+    `.//div/descendant-or-self::*/span/./a` -> `.//div//span/a`
+    """
+    parts = _XPATH_LITERAL_RE.split(xpath)
+    literals = _XPATH_LITERAL_RE.findall(xpath)
+    optimized = []
+    for i, part in enumerate(parts):
+        part = _XPATH_REDUNDANT_DESCENDANT_RE.sub("//", part)
+        part = _XPATH_REDUNDANT_SELF_RE.sub("", part)
+        optimized.append(part)
+        if i < len(literals):
+            optimized.append(literals[i])
+    return "".join(optimized)
+
+
+_XPATH_LITERAL_RE = re.compile(r"'[^']*'|\"[^\"]*\"")
+# Only followed by a step in the child (or attribute) axis, where both forms are equivalent
+_XPATH_REDUNDANT_DESCENDANT_RE = re.compile(r"/{1,2}descendant-or-self::(?:\*|node\(\))/(?![\w-]+::)(?=[\w*@])")
+_XPATH_REDUNDANT_SELF_RE = re.compile(r"/(?:\.|self::node\(\))(?=/)")
+_XPATH_NAME_TEST_RE = re.compile(r"\*|[A-Za-z_][\w-]*")
+_XPATH_LITERAL = r"('[^']*'|\"[^\"]*\")"
+_XPATH_PREDICATES_AS_CSS: list[tuple[re.Pattern, Callable[[re.Match], Optional[str]]]] = [
+    (re.compile(r"@([\w-]+)"),
+     lambda m: f"[{m.group(1)}]"),
+    (re.compile(rf"@([\w-]+)\s*=\s*{_XPATH_LITERAL}"),
+     lambda m: _css_attribute(m.group(1), "=", m.group(2))),
+    (re.compile(rf"contains\(\s*@([\w-]+)\s*,\s*{_XPATH_LITERAL}\s*\)"),
+     lambda m: _css_attribute(m.group(1), "*=", m.group(2))),
+    (re.compile(rf"starts-with\(\s*@([\w-]+)\s*,\s*{_XPATH_LITERAL}\s*\)"),
+     lambda m: _css_attribute(m.group(1), "^=", m.group(2))),
+    (re.compile(r"(?:@class\s+and\s+)?contains\(\s*concat\(\s*' '\s*,\s*normalize-space\(\s*@class\s*\)\s*,"
+                r"\s*' '\s*\)\s*,\s*' ([^\s']+) '\s*\)"),
+     lambda m: _css_attribute("class", "~=", f"'{m.group(1)}'")),
+]
+# Attribute values that CSS matches case-insensitively in HTML documents (but xpath does not)
+_CSS_CASE_INSENSITIVE_ATTRIBUTES = frozenset([
+    "accept", "accept-charset", "align", "alink", "axis", "bgcolor", "charset", "checked", "clear", "codetype",
+    "color", "compact", "declare", "defer", "dir", "direction", "disabled", "enctype", "face", "frame", "hreflang",
+    "http-equiv", "lang", "language", "link", "media", "method", "multiple", "nohref", "noresize", "noshade",
+    "nowrap", "readonly", "rel", "rev", "rules", "scope", "scrolling", "selected", "shape", "target", "text", "type",
+    "valign", "valuetype", "vlink",
+])
+
+
+def _as_css_step(locator: Locator) -> Optional[str]:
+    # CSS equivalent of locator, as a step of a compound selector (can start with ">" combinator)
+    css = locator.as_css_selector()
+    if css is not None:
+        return css
+    if locator.index is not None:
+        return None
+    return _xpath_as_css_step(locator.as_xpath_selector())
+
+
+@lru_cache(maxsize=1024)
+def _xpath_as_css_step(xpath: str) -> Optional[str]:
+    # Only simple relative xpaths: ./tag/tag[@attr='value']//*[contains(@attr,'value')]...
+    if not xpath.startswith("./"):
+        return None
+    css = []
+    pos = 1
+    while pos < len(xpath):
+        if xpath.startswith("//", pos):
+            pos = pos + 2
+        elif xpath.startswith("/", pos):
+            css.append(">")
+            pos = pos + 1
+        else:
+            return None
+        match = _XPATH_NAME_TEST_RE.match(xpath, pos)
+        if match is None:
+            return None
+        step = match.group(0)
+        pos = match.end()
+        if xpath.startswith(("::", "("), pos):
+            # Axis or function
+            return None
+        while xpath.startswith("[", pos):
+            end = _xpath_predicate_end(xpath, pos)
+            if end is None:
+                return None
+            predicate = xpath[pos + 1:end].strip()
+            for regex, to_css in _XPATH_PREDICATES_AS_CSS:
+                predicate_match = regex.fullmatch(predicate)
+                if predicate_match is not None:
+                    predicate_css = to_css(predicate_match)
+                    break
+            else:
+                predicate_css = None
+            if predicate_css is None:
+                return None
+            step = f"{step}{predicate_css}"
+            pos = end + 1
+        css.append(step)
+    return " ".join(css) if len(css) > 0 else None
+
+
+def _xpath_predicate_end(xpath: str, start: int) -> Optional[int]:
+    depth = 0
+    quote = None
+    for pos in range(start, len(xpath)):
+        char = xpath[pos]
+        if quote is not None:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == "[":
+            depth = depth + 1
+        elif char == "]":
+            depth = depth - 1
+            if depth == 0:
+                return pos
+    return None
+
+
+def _css_attribute(name: str, operator: str, xpath_literal: str) -> Optional[str]:
+    value = xpath_literal[1:-1]
+    if name.lower() in _CSS_CASE_INSENSITIVE_ATTRIBUTES or "\\" in value or "\n" in value:
+        return None
+    quote = '"' if "'" in value else "'"
+    return f"[{name}{operator}{quote}{value}{quote}]"
+
+
 def infer_by_from_selector(selector: str) -> str:
     if selector == "." \
             or selector.startswith("./") \
@@ -1368,3 +2263,5 @@ def get_locator(obj: PseudoLocatorType) -> Optional[Locator]:
 
 PseudoLocatorType = Union[Locator, str, dict, Iterable, GenericNode]
 T = TypeVar('T', bound=GenericNode)
+# Result of any callable (see GenericNode.arun)
+R = TypeVar('R')
@@ -1,5 +1,7 @@
 from __future__ import annotations
+from typing import Any, Callable, Optional
 from selenium.common.exceptions import InvalidArgumentException, WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
 # noinspection PyPackageRequirements
 from src.testproject.sdk.drivers import webdriver as tp_webdriver
 # noinspection PyPackageRequirements
@@ -55,3 +57,50 @@ class Remote(tp_webdriver.Remote):
 
 class Generic(tp_webdriver.Generic):
     pass
+
+
+class LazyDriver:
+    """
+    Driver whose browser is not started until it is really used: `launch` is called (and its result used for
+    everything) the first time any attribute of the driver is needed.
+    After `stop_lazily` is called, an unstarted driver is never started: using it raises WebDriverException
+    (so failure screenshots or logs of a test that never used the browser do not start one), and `quit` does nothing.
+    """
+
+    def __init__(self,
+                 launch: Callable[[], WebDriver],
+                 on_start: Optional[Callable[[LazyDriver, WebDriver], None]] = None, ) -> None:
+        object.__setattr__(self, "_launch", launch)
+        object.__setattr__(self, "_on_start", on_start)
+        object.__setattr__(self, "_driver", None)
+        object.__setattr__(self, "_stopped", False)
+
+    @property
+    def started(self) -> bool:
+        return self._driver is not None
+
+    def start(self) -> WebDriver:
+        if self._driver is None:
+            if self._stopped:
+                raise WebDriverException("Browser was not started, and it will not be started anymore")
+            object.__setattr__(self, "_driver", self._launch())
+            if self._on_start is not None:
+                self._on_start(self, self._driver)
+        return self._driver
+
+    def stop_lazily(self) -> None:
+        object.__setattr__(self, "_stopped", True)
+
+    def quit(self) -> None:
+        if self._driver is not None:
+            self._driver.quit()
+        self.stop_lazily()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.start(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.start(), name, value)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._driver if self._driver is not None else 'not started'})"
@@ -1 +1,21 @@
+from __future__ import annotations
+import os
+from pytest import fixture, MonkeyPatch
+from _pytest.fixtures import FixtureRequest
+
 pytest_plugins = "pombase.pytest_plugin"
+
+HTML_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "html")
+
+
+@fixture()
+def fake_pb(request: FixtureRequest, monkeypatch: MonkeyPatch):
+    """Same as pb fixture, but using a browserless FakeDomDriver (see pombase.fake_dom) instead of a browser"""
+    from pombase import PombaseConfig
+    monkeypatch.setattr(PombaseConfig, "pb_fake_dom", property(lambda self: True))
+    return request.getfixturevalue("pb")
+
+
+def html_url(file_name: str) -> str:
+    """file:// url of a saved page in tests/html"""
+    return "file://" + os.path.join(HTML_DIR, file_name)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from overrides import overrides
+from pombase import PombaseCase, PageNode, SingleWebNode, AsyncPombaseCase
+from pombase import aio as pb_aio
+
+FORM_PAGE = """<html><body>
+<form><input id="name" value="Ann"><span id="title">Form</span></form>
+</body></html>"""
+
+
+class FormPage(PageNode):
+
+    @overrides
+    def init_node(self) -> None:
+        super().init_node()
+
+        self.swn_name = SingleWebNode("#name")
+        self.swn_title = SingleWebNode("#title")
+
+
+class TestAsync:
+
+    def test_calls_run_in_worker_thread(self, fake_pb: PombaseCase):
+        async_pb = AsyncPombaseCase(fake_pb)
+        threads = []
+
+        def record_thread() -> str:
+            threads.append(threading.current_thread())
+            return "done"
+
+        async def main() -> None:
+            assert await pb_aio.run(fake_pb, record_thread) == "done"
+            assert await pb_aio.run(fake_pb, record_thread) == "done"
+
+        try:
+            asyncio.run(main())
+            assert threads[0] is not threading.current_thread()
+            assert threads[0] is threads[1]
+            assert threads[0].name.startswith("pombase-")
+            # Attributes that are not methods are returned as they are
+            assert async_pb.driver is None
+            assert async_pb.pbconfig is fake_pb.pbconfig
+        finally:
+            pb_aio.shutdown_executor(fake_pb)
+
+    def test_event_loop_is_not_blocked(self, fake_pb: PombaseCase):
+        ticks = []
+
+        async def ticker() -> None:
+            for _ in range(3):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.05)
+
+        async def main() -> None:
+            await asyncio.gather(pb_aio.run(fake_pb, time.sleep, 0.3), ticker())
+
+        try:
+            start = time.monotonic()
+            asyncio.run(main())
+            assert len(ticks) == 3
+            assert ticks[-1] - start < 0.3
+        finally:
+            pb_aio.shutdown_executor(fake_pb)
+
+    def test_node_actions(self, fake_pb: PombaseCase):
+        fake_pb.driver.load(FORM_PAGE)
+        page = FormPage(fake_pb)
+
+        async def main() -> tuple:
+            await page.await_loaded(timeout=1)
+            await page.swn_name.aupdate_text("Bob")
+            return await page.swn_name.aget_field_value(), await page.swn_title.aget_text()
+
+        try:
+            assert asyncio.run(main()) == ("Bob", "Form")
+            assert page.swn_name.get_field_value() == "Bob"
+        finally:
+            pb_aio.shutdown_executor(fake_pb)
+
+    def test_pombase_case_methods(self, fake_pb: PombaseCase):
+        fake_pb.driver.load(FORM_PAGE)
+        async_pb = AsyncPombaseCase(fake_pb)
+
+        async def main() -> str:
+            await async_pb.update_text("#name", "Cid")
+            return await async_pb.get_attribute("#name", "value")
+
+        try:
+            assert asyncio.run(main()) == "Cid"
+        finally:
+            pb_aio.shutdown_executor(fake_pb)
+
+    def test_executor_is_created_again_after_shutdown(self, fake_pb: PombaseCase):
+        executor = pb_aio.get_executor(fake_pb)
+        assert pb_aio.get_executor(fake_pb) is executor
+        pb_aio.shutdown_executor(fake_pb)
+        try:
+            assert pb_aio.get_executor(fake_pb) is not executor
+        finally:
+            pb_aio.shutdown_executor(fake_pb)
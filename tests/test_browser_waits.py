@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import time
+import pytest
+from pombase import PombaseCase, ConstantPollSchedule
+from pombase import util as pb_util
+
+
+class TestBrowserWaits:
+
+    def test_failed_wait_reports_original_timeout(self, fake_pb: PombaseCase):
+        fake_pb.driver.load("<html><body><div id='present'>Text</div></body></html>")
+        with pytest.raises(Exception, match=r"after 0.5 seconds!"):
+            fake_pb.wait_for_element_visible("#missing", timeout=0.5)
+        with pytest.raises(Exception, match=r"after 1 second!"):
+            fake_pb.wait_for_text_visible("Other", "#present", timeout=1)
+
+    def test_successful_wait(self, fake_pb: PombaseCase):
+        fake_pb.driver.load("<html><body><div id='present'>Text</div></body></html>")
+        assert fake_pb.wait_for_element_visible("#present", timeout=3).text == "Text"
+
+    def test_early_answers_are_not_asked_again_at_once(self, fake_pb: PombaseCase, monkeypatch: pytest.MonkeyPatch):
+        # Fake DOM plays the role of a browser (or a replay driver) that answers False before the wait ends
+        monkeypatch.setattr(PombaseCase, "_is_fake_dom_driver", lambda self: False)
+        monkeypatch.setattr(pb_util, "_default_poll_schedule", ConstantPollSchedule(0.1))
+        fake_pb.driver.load("<html><body><div id='present'>Text</div></body></html>")
+        calls = []
+        execute_async_script = fake_pb.driver.execute_async_script
+
+        def counted_execute_async_script(*args):
+            calls.append(args)
+            return execute_async_script(*args)
+
+        monkeypatch.setattr(fake_pb.driver, "execute_async_script", counted_execute_async_script)
+        start = time.time()
+        assert fake_pb.wait_in_browser("#missing", timeout=0.5) is False
+        assert 0.45 < time.time() - start < 1
+        assert 3 <= len(calls) <= 7
+        calls.clear()
+        assert fake_pb.wait_in_browser("#present", timeout=0.5) is True
+        assert len(calls) == 1
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import pytest
+from pombase import PombaseCase, wait_until
+from tests.conftest import html_url
+
+
+class TestFakeDom:
+
+    def test_pombase_import_does_not_need_lxml(self):
+        code = "import sys, pombase; print('pombase.fake_dom' in sys.modules, 'lxml' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        assert output.split() == ["False", "False"]
+
+    def test_fake_dom_driver(self, fake_pb: PombaseCase):
+        from pombase.fake_dom import FakeDomDriver
+        assert isinstance(fake_pb.driver, FakeDomDriver)
+        fake_pb.open(html_url("web_tables.html"))
+        assert fake_pb.get_text("div.main-header") == "Web Tables"
+        fake_pb.update_text("#searchBox", "Vega")
+        assert fake_pb.get_attribute("#searchBox", "value") == "Vega"
+        assert fake_pb.is_element_visible("div.action-buttons")
+        assert not fake_pb.is_element_present("#missing")
+
+    def test_failing_waits_are_not_done_in_browser(self, fake_pb: PombaseCase, monkeypatch: pytest.MonkeyPatch):
+        fake_pb.open(html_url("web_tables.html"))
+        calls = []
+        execute_async_script = fake_pb.driver.execute_async_script
+
+        def counted_execute_async_script(*args):
+            calls.append(args)
+            return execute_async_script(*args)
+
+        monkeypatch.setattr(fake_pb.driver, "execute_async_script", counted_execute_async_script)
+        assert fake_pb.browser_waits_enabled is False
+        assert fake_pb.wait_for_change(1) is False
+        with pytest.raises(Exception, match="#missing"):
+            fake_pb.wait_for_element_visible("#missing", timeout=0.5)
+        assert wait_until(lambda: False, timeout=0.5, wait_for_change=fake_pb.wait_for_change) == (False, False)
+        assert calls == []
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import pytest
+from pombase import PombaseCase
+from pombase import util as pb_util
+from seleniumbase.config.settings import SMALL_TIMEOUT
+
+PAGE = """
+<html><body>
+<input id="name" type="text" value="John">
+<input id="agree" type="checkbox" checked>
+<select id="color"><option>Red</option><option selected>Blue</option></select>
+<div id="title">Title</div>
+</body></html>
+"""
+
+
+class TestFieldSnapshot:
+
+    @pytest.mark.parametrize("selector", ["#name", "#agree", "#color", "#title"])
+    def test_properties_path_matches_script(self, fake_pb: PombaseCase, selector: str):
+        fake_pb.driver.load(PAGE)
+        snapshot = fake_pb.get_field_snapshot(selector)
+        by_properties = fake_pb._get_field_snapshot_by_properties(selector, "css selector", 1)
+        for key in ("tag", "type", "text", "value"):
+            assert by_properties[key] == snapshot[key]
+        if snapshot["type"] == "checkbox":
+            assert by_properties["checked"] == snapshot["checked"]
+        if snapshot["tag"] == "select":
+            assert by_properties["selected"] == snapshot["selected"]
+
+    def test_shadow_selector_uses_properties_path(self, fake_pb: PombaseCase, monkeypatch: pytest.MonkeyPatch):
+        calls = []
+        monkeypatch.setattr(fake_pb, "_get_field_snapshot_by_properties", lambda *args: calls.append(args) or {})
+        fake_pb.get_field_snapshot("my-element::shadow input")
+        assert calls == [("my-element::shadow input", "css selector", SMALL_TIMEOUT)]
+
+    def test_timeout_multiplier(self, fake_pb: PombaseCase, monkeypatch: pytest.MonkeyPatch):
+        timeouts = []
+        monkeypatch.setattr(pb_util, "wait_until", lambda *args, **kwargs: timeouts.append(kwargs["timeout"]) or (
+            False, None))
+        fake_pb.timeout_multiplier = 2
+        with pytest.raises(Exception, match=f"after {2 * SMALL_TIMEOUT} seconds"):
+            fake_pb.get_field_snapshot("#missing")
+        with pytest.raises(Exception, match="after 3 seconds"):
+            fake_pb.get_field_snapshot("#missing", timeout=3)
+        assert timeouts == [2 * SMALL_TIMEOUT, 3]
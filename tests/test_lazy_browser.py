@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import pytest
+from pytest import fixture, MonkeyPatch
+from _pytest.fixtures import FixtureRequest
+from selenium.common.exceptions import WebDriverException
+from pombase import PombaseCase
+from pombase.webdriver import LazyDriver
+
+
+@fixture()
+def lazy_pb(request: FixtureRequest, monkeypatch: MonkeyPatch):
+    """Same as fake_pb fixture, but with ini option pb_lazy_browser set"""
+    from pombase import PombaseConfig
+    monkeypatch.setattr(PombaseConfig, "pb_fake_dom", property(lambda self: True))
+    monkeypatch.setattr(PombaseConfig, "pb_lazy_browser", property(lambda self: True))
+    return request.getfixturevalue("pb")
+
+
+class FakeDriver:
+
+    def __init__(self) -> None:
+        self.title = "Page"
+        self.quit_called = False
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+
+class TestLazyDriver:
+
+    def test_started_on_first_use(self):
+        launched = []
+        started = []
+        lazy = LazyDriver(lambda: launched.append(FakeDriver()) or launched[-1],
+                          lambda lazy_driver, driver: started.append((lazy_driver, driver)))
+        assert not lazy.started and launched == []
+        assert lazy.title == "Page"
+        lazy.title = "Other"
+        assert lazy.title == "Other"
+        assert len(launched) == 1 and launched[0].title == "Other"
+        assert started == [(lazy, launched[0])]
+        lazy.quit()
+        assert launched[0].quit_called
+
+    def test_not_started_after_stop(self):
+        launched = []
+        lazy = LazyDriver(lambda: launched.append(FakeDriver()) or launched[-1])
+        lazy.stop_lazily()
+        with pytest.raises(WebDriverException, match="not started"):
+            _ = lazy.title
+        lazy.quit()
+        assert launched == []
+
+    def test_stop_does_not_affect_started_driver(self):
+        lazy = LazyDriver(FakeDriver)
+        assert lazy.title == "Page"
+        lazy.stop_lazily()
+        assert lazy.title == "Page"
+
+
+class TestLazyBrowser:
+
+    def test_browser_starts_on_first_action(self, lazy_pb: PombaseCase):
+        lazy = lazy_pb.driver
+        assert isinstance(lazy, LazyDriver) and not lazy.started
+        lazy_pb.driver.load("<html><body><p id='greeting'>Hi</p></body></html>")
+        assert lazy.started
+        assert lazy_pb.get_text("#greeting") == "Hi"
+        # The real driver replaces the lazy one
+        assert lazy_pb._drivers_list == [lazy_pb.driver]
+        assert not isinstance(lazy_pb.driver, LazyDriver)
+
+    def test_unused_browser_is_not_started_at_teardown(self, lazy_pb: PombaseCase):
+        lazy = lazy_pb.driver
+        lazy_pb.save_teardown_screenshot()
+        assert not lazy.started
+        with pytest.raises(WebDriverException):
+            lazy.start()
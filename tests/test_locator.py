@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from copy import copy, deepcopy
+import pytest
+from selenium.webdriver.common.by import By
+from pombase import PombaseCase, Locator, SingleWebNode, compound, optimize_compound, optimize_xpath, get_locator
+
+
+class TestLocator:
+
+    def test_immutable(self):
+        locator = Locator("div.a")
+        with pytest.raises(AttributeError):
+            locator.selector = "div.b"
+        with pytest.raises(AttributeError):
+            del locator._selector
+        assert copy(locator) is locator
+        assert deepcopy(locator) is locator
+
+    def test_hashable(self):
+        assert Locator("div.a") == Locator("div.a", By.CSS_SELECTOR)
+        assert hash(Locator("div.a")) == hash(Locator("div.a", By.CSS_SELECTOR))
+        assert len({Locator("div.a"), Locator("div.a"), Locator("//div")}) == 2
+        assert Locator("div.a") != "div.a"
+        assert Locator("div.a") == get_locator("div.a")
+        assert Locator("div.a") in {get_locator({"selector": "div.a"})}
+        assert Locator("div.a") != Locator("div.b")
+
+    def test_derived_forms(self):
+        locator = Locator("//div[@id='a']")
+        assert locator.by == By.XPATH
+        assert locator.as_xpath_selector() == "//div[@id='a']"
+        indexed = Locator("div.a", index=1)
+        assert indexed.by == By.XPATH
+        assert indexed.selector == f"({Locator('div.a').as_xpath_selector()})[2]"
+        assert indexed.as_css_selector() is None
+
+    def test_copy_overriding(self):
+        locator = Locator("div.a")
+        assert locator.copy_overriding() is locator
+        assert locator.copy_overriding(selector="div.a") is locator
+        assert locator.copy_overriding(index=0) == Locator("div.a", index=0)
+        assert locator.append(Locator("span")) is locator.append(Locator("span"))
+
+
+class TestCompoundLocator:
+
+    @staticmethod
+    def tree() -> SingleWebNode:
+        root = SingleWebNode("div.root", name="swn_root")
+        SingleWebNode("div.a", name="swn_a", parent=root)
+        SingleWebNode("span", name="swn_b", parent=root.swn_a)
+        return root
+
+    def test_same_as_compound(self):
+        root = self.tree()
+        leaf = root.swn_a__swn_b
+        assert leaf.compound_locator == compound(leaf.path)
+        assert leaf.compound_locator is leaf.compound_locator
+
+    def test_invalidated_when_ancestor_locator_changes(self):
+        root = self.tree()
+        leaf = root.swn_a__swn_b
+        before = leaf.compound_locator
+        root.swn_a.locator = Locator("div.other")
+        assert leaf.compound_locator != before
+        assert leaf.compound_locator == compound(leaf.path)
+
+    def test_invalidated_when_node_is_moved(self):
+        root = self.tree()
+        leaf = root.swn_a__swn_b
+        _ = leaf.compound_locator
+        other = SingleWebNode("section", name="swn_other")
+        leaf.parent = other
+        assert leaf.compound_locator == compound([other, leaf])
+
+    def test_override_parent(self):
+        root = self.tree()
+        node = SingleWebNode("a", name="swn_link", parent=root.swn_a, override_parent="nav")
+        before = node.compound_locator
+        assert before == compound(node.path)
+        root.locator = Locator("div.changed")
+        assert node.compound_locator == before == compound(node.path)
+
+
+OPTIMIZER_PAGE = """
+<html><body>
+<div class="root main" id="r">
+    <ul>
+        <li class="item" data-x="1"><a href="/one">One</a></li>
+        <li class="item" data-x="2"><a href="/two">Two</a></li>
+    </ul>
+    <div class="a"><span title="s1">S1</span><p><span title="s2">S2</span></p></div>
+</div>
+<div class="root"><span title="s3">S3</span></div>
+</body></html>
+"""
+
+
+class TestLocatorOptimizer:
+
+    def test_optimize_xpath(self):
+        assert optimize_xpath(".//div/descendant-or-self::*/span/./a") == ".//div//span/a"
+        # String literals are not modified
+        assert optimize_xpath("//a[.='/./']/./b") == "//a[.='/./']/b"
+        # descendant-or-self followed by another axis is not collapsed
+        assert optimize_xpath("//div/descendant-or-self::node()/following::a") == \
+               "//div/descendant-or-self::node()/following::a"
+
+    def test_optimize_compound_as_css(self):
+        locators = [Locator("div.root"), Locator("./ul/li[@data-x='2']"), Locator(".//a[contains(@href,'tw')]")]
+        optimized = optimize_compound(locators)
+        assert optimized.by == By.CSS_SELECTOR
+        assert optimized.selector == "div.root > ul > li[data-x='2'] a[href*='tw']"
+
+    def test_optimize_compound_anchors(self):
+        assert optimize_compound([Locator("div.root"), Locator("//body/div")]) == Locator("//body/div")
+        root = SingleWebNode("div.root", name="swn_root")
+        node = SingleWebNode("span", name="swn_span", parent=root, override_parent="p")
+        assert optimize_compound(node.path) == compound(node.path)
+
+    def test_optimize_compound_keeps_xpath_when_needed(self):
+        locators = [Locator("div.root"), Locator(".//span[text()='S2']")]
+        optimized = optimize_compound(locators)
+        assert optimized.by == By.XPATH
+
+    @pytest.mark.parametrize("locators", [
+        ["div.root", "./ul/li[@data-x='2']", ".//a"],
+        ["div.root", ".//span"],
+        ["div.root", "./div/p/span"],
+        ["//div[@id='r']", "./div/./p/span"],
+        ["div.root", "span"],
+        ["//div[@id='r']", "./descendant-or-self::*/span"],
+        ["div.root", Locator("li", index=1), "a"],
+        ["div.root", ".//span[@title='s2']"],
+    ])
+    def test_same_elements(self, fake_pb: PombaseCase, locators: list):
+        fake_pb.driver.load(OPTIMIZER_PAGE)
+        expected = compound(locators)
+        optimized = optimize_compound(locators)
+        expected_elements = fake_pb.driver.find_elements(expected.by, expected.selector)
+        assert len(expected_elements) > 0
+        assert fake_pb.driver.find_elements(optimized.by, optimized.selector) == expected_elements
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import pytest
+from pombase import PombaseConfig
+from pombase.pytest_plugin import PytestVar
+
+
+class TestPombaseConfig:
+
+    @pytest.mark.parametrize("var", [PytestVar.PB_DISABLE_BROWSER_WAITS, PytestVar.PB_POLL_SCHEDULE,
+                                     PytestVar.PB_SESSION_POOL_MAX_REUSE, PytestVar.PB_FAKE_DOM])
+    def test_default_value_without_pytest_config(self, var: PytestVar):
+        assert var.ini_value(None) == var.default_value
+
+    def test_properties_without_pytest_config(self, monkeypatch: pytest.MonkeyPatch):
+        config = PombaseConfig()
+        monkeypatch.setattr(config, "_pytest_config", None)
+        assert config.pb_disable_browser_waits is False
+        assert config.pb_poll_schedule == "constant"
+        assert config.pb_session_pool_max_reuse == 50
+        assert config.pb_warm_pool_size == 0
+        assert config.pb_webdriver_replay_dir is None
+        assert config.pb_fake_dom is False
+
+    def test_ini_values(self):
+        # tests/pytest.ini
+        config = PombaseConfig()
+        assert config.pb_disable_testproject is True
+        assert config.pb_poll_schedule == "constant"
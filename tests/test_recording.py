@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import os
+import pytest
+from selenium.webdriver.common.by import By
+from pombase import PombaseCase
+from pombase import recording as pb_recording
+from pombase.fake_dom import FakeDomDriver
+
+PAGE = "<html><body><div id='present'>Text</div></body></html>"
+
+
+def record(path: str, polls: int) -> None:
+    driver = FakeDomDriver(PAGE)
+    pb_recording.record_driver(driver, path)
+    for _ in range(polls):
+        assert driver.find_elements(By.CSS_SELECTOR, "#missing") == []
+    assert driver.find_element(By.CSS_SELECTOR, "#present").text == "Text"
+    driver.quit()
+
+
+def replay(path: str, polls: int) -> pb_recording.ReplayConnection:
+    driver = pb_recording.replay_driver(path)
+    for _ in range(polls):
+        assert driver.find_elements(By.CSS_SELECTOR, "#missing") == []
+    assert driver.find_element(By.CSS_SELECTOR, "#present").text == "Text"
+    driver.quit()
+    return driver.command_executor
+
+
+class TestRecording:
+
+    @pytest.mark.parametrize("polls", [3, 1, 6])
+    def test_replay_with_different_poll_count(self, tmp_path, polls: int):
+        path = os.path.join(tmp_path, "test.0.jsonl.gz")
+        record(path, 3)
+        assert replay(path, polls).finished
+
+    def test_replay_detects_divergence(self, tmp_path):
+        path = os.path.join(tmp_path, "test.0.jsonl.gz")
+        record(path, 2)
+        driver = pb_recording.replay_driver(path)
+        driver.find_elements(By.CSS_SELECTOR, "#missing")
+        with pytest.raises(RuntimeError, match="does not match"):
+            driver.find_element(By.CSS_SELECTOR, "#other")
+
+    def test_recording_path(self):
+        assert pb_recording.recording_path("dir", "tests.test_a.TestA.test_b[1]", 0) == \
+               os.path.join("dir", "tests.test_a.TestA.test_b_1_.0.jsonl.gz")
+
+    def test_replay_browser_waits(self, fake_pb: PombaseCase, tmp_path, monkeypatch: pytest.MonkeyPatch):
+        # Fake DOM plays the role of a browser that can wait (browser waits are not done with FakeDomDriver)
+        monkeypatch.setattr(PombaseCase, "_is_fake_dom_driver", lambda self: False)
+        path = os.path.join(tmp_path, "test.0.jsonl.gz")
+        fake_pb.driver.load(PAGE)
+        pb_recording.record_driver(fake_pb.driver, path)
+        assert fake_pb.wait_in_browser("#missing", timeout=0.2) is False
+        assert fake_pb.get_text("#present") == "Text"
+        fake_pb.driver.command_executor.close()
+        fake_pb.driver = pb_recording.replay_driver(path)
+        assert fake_pb.wait_in_browser("#missing", timeout=0.5) is False
+        assert fake_pb.get_text("#present") == "Text"
+        assert fake_pb.driver.command_executor.finished
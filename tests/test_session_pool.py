@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import time
+import pytest
+from seleniumbase import BaseCase
+from pombase import PombaseCase
+from pombase.session_pool import SessionPool
+
+
+class HealthyDriver:
+    window_handles = ["main"]
+
+    @staticmethod
+    def execute_script(_script: str) -> int:
+        return 1
+
+    def quit(self) -> None:
+        pass
+
+
+class ReusableDriver(HealthyDriver):
+
+    def __init__(self, healthy: bool = True, resettable: bool = True) -> None:
+        self.healthy = healthy
+        self.resettable = resettable
+        self.window_handles = ["main", "popup"]
+        self.calls = []
+        self.quit_called = False
+        self.switch_to = self
+
+    def window(self, handle: str) -> None:
+        self.calls.append(("window", handle))
+
+    def close(self) -> None:
+        self.window_handles = self.window_handles[:-1]
+
+    def execute_script(self, _script: str) -> int:
+        if not self.healthy:
+            raise RuntimeError("Browser is gone")
+        return 1
+
+    def delete_all_cookies(self) -> None:
+        self.calls.append(("delete_all_cookies",))
+
+    def get(self, url: str) -> None:
+        if not self.resettable:
+            raise RuntimeError("Page can not be loaded")
+        self.calls.append(("get", url))
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+
+class TestSessionReuse:
+
+    def test_released_driver_is_reset_and_reused(self):
+        pool = SessionPool()
+        driver = ReusableDriver()
+        assert pool.acquire("key") is None
+        assert pool.release(driver, "key")
+        assert driver.window_handles == ["main"]
+        assert ("delete_all_cookies",) in driver.calls and driver.calls[-1] == ("get", "about:blank")
+        assert pool.acquire("other") is None
+        assert pool.acquire("key") is driver
+        assert pool.acquire("key") is None
+        pool.close()
+
+    def test_max_reuse(self):
+        pool = SessionPool(max_reuse=2)
+        driver = ReusableDriver()
+        assert pool.release(driver, "key")
+        assert pool.acquire("key") is driver
+        assert not pool.release(driver, "key")
+        assert driver.quit_called
+        assert pool.idle_count == 0
+
+    def test_driver_that_can_not_be_reset_is_quit(self):
+        pool = SessionPool()
+        driver = ReusableDriver(resettable=False)
+        assert not pool.release(driver, "key")
+        assert driver.quit_called
+        assert pool.idle_count == 0
+
+    def test_unhealthy_driver_is_not_acquired(self):
+        pool = SessionPool()
+        broken, healthy = ReusableDriver(), ReusableDriver()
+        pool.release(broken, "key")
+        pool.release(healthy, "key")
+        broken.healthy = False
+        assert pool.acquire("key") is healthy
+        assert broken.quit_called
+
+    def test_close_quits_idle_drivers(self):
+        pool = SessionPool()
+        idle, released = ReusableDriver(), ReusableDriver()
+        pool.release(idle, "key")
+        pool.close()
+        assert idle.quit_called
+        assert not pool.release(released, "key")
+        assert released.quit_called
+
+
+class TestSessionPool:
+
+    def test_acquire_waits_for_warm_driver(self):
+        pool = SessionPool()
+        driver = HealthyDriver()
+        pool.warm("key", lambda: time.sleep(0.3) or driver, 1)
+        time.sleep(0.05)
+        assert pool.acquire("key", timeout=5) is driver
+        pool.close()
+
+    def test_acquire_wait_is_bounded(self):
+        pool = SessionPool()
+        pool.warm("key", lambda: time.sleep(2) or HealthyDriver(), 1)
+        time.sleep(0.05)
+        start = time.time()
+        assert pool.acquire("key", timeout=0.3) is None
+        assert time.time() - start < 1
+        pool.close()
+
+    def test_warm_launcher_does_not_share_state(self, fake_pb: PombaseCase, monkeypatch: pytest.MonkeyPatch):
+        pool = SessionPool()
+        launchers = []
+
+        def get_new_driver(launcher: PombaseCase, **_kwargs) -> HealthyDriver:
+            launchers.append(launcher)
+            new_driver = HealthyDriver()
+            launcher._drivers_list.append(new_driver)
+            return new_driver
+
+        monkeypatch.setattr(PombaseCase, "warm_pool_size", property(lambda self: 1))
+        monkeypatch.setattr(PombaseCase, "session_pool", property(lambda self: pool))
+        monkeypatch.setattr(BaseCase, "get_new_driver", get_new_driver)
+        fake_pb._warm_session_pool("key", {})
+        stop = time.time() + 5
+        while pool.idle_count == 0 and time.time() < stop:
+            time.sleep(0.01)
+        assert isinstance(pool.acquire("key"), HealthyDriver)
+        launcher = launchers[0]
+        assert launcher is not fake_pb
+        assert launcher.browser == fake_pb.browser
+        assert "driver" not in launcher.__dict__
+        assert launcher._drivers_list == [] and launcher._drivers_list is not fake_pb._drivers_list
+        pool.close()
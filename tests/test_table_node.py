@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import os
+import pytest
+from overrides import overrides
+from pombase import PombaseCase, PageNode, TableNode, TableSnapshot, HeaderLookup, header_index
+from tests.conftest import HTML_DIR, html_url
+
+
+class PeoplePage(PageNode):
+    @overrides
+    def init_node(self) -> None:
+        super().init_node()
+
+        self.swn_people = TableNode("table#people", header_cell_locator="./thead/tr/th")
+
+
+@pytest.fixture()
+def people(fake_pb: PombaseCase) -> TableNode:
+    fake_pb.open(html_url("people_table.html"))
+    return PeoplePage(fake_pb).swn_people
+
+
+class TestBulkReading:
+
+    def test_to_rows(self, people: TableNode):
+        assert people.to_rows() == [
+            ["Cierra", "Vega", "cierra@example.com", "yes", "Admin"],
+            ["Alden", "Cantrell", "alden@example.com", "no", "User"],
+            ["Kierra", "Vega", "kierra@example.com", "yes", "User"],
+            ["Short", "Row"],
+        ]
+
+    def test_to_dicts(self, people: TableNode):
+        dicts = people.to_dicts()
+        assert dicts[1] == {"First Name": "Alden", "Last Name": "Cantrell", "Email": "alden@example.com",
+                            "Active": "no", "Role": "User"}
+        assert dicts[3] == {"First Name": "Short", "Last Name": "Row"}
+
+    def test_column(self, people: TableNode):
+        assert people.column(0) == ["Cierra", "Alden", "Kierra", "Short"]
+        assert people.column("Email") == ["cierra@example.com", "alden@example.com", "kierra@example.com", None]
+        assert people.column("last_name") == people.column(1)
+        with pytest.raises(RuntimeError, match="no column"):
+            people.column("Phone")
+
+    def test_one_browser_call(self, people: TableNode, monkeypatch: pytest.MonkeyPatch):
+        calls = []
+        get_table_snapshot = people.pbc.get_table_snapshot
+        monkeypatch.setattr(people.pbc, "get_table_snapshot", lambda *args: calls.append(args) or get_table_snapshot(
+            *args))
+        people.to_rows()
+        assert len(calls) == 1
+
+    def test_not_visible_table(self, fake_pb: PombaseCase):
+        fake_pb.driver.load("<html><body><table id='people' style='display: none'></table></body></html>")
+        with pytest.raises(TimeoutError, match="not visible"):
+            PeoplePage(fake_pb).swn_people.to_rows(timeout=0.2)
+
+
+class TestFiltering:
+
+    def test_snapshot_columns(self):
+        snapshot = TableSnapshot(["A", "B", "C"], [[1, 2, 3], [4, 5], [7, 8, 9, 10]])
+        assert snapshot.num_rows == 3
+        assert snapshot.num_columns == 4
+        assert snapshot.column("B") == [2, 5, 8]
+        assert snapshot.column(2) == [3, None, 9]
+        assert snapshot.column(5) == [None, None, None]
+        # Rows keep their own length
+        assert snapshot.rows() == [[1, 2, 3], [4, 5], [7, 8, 9, 10]]
+
+    def test_snapshot_without_headers(self):
+        snapshot = TableSnapshot(None, [["x"]])
+        assert snapshot.column(0) == ["x"]
+        with pytest.raises(RuntimeError, match="no header cells"):
+            snapshot.column("A")
+        with pytest.raises(RuntimeError, match="no header cells"):
+            snapshot.dicts()
+
+    def test_snapshot_filter_rows(self):
+        snapshot = TableSnapshot(["Name", "Age"], [["Ann", "30"], ["Bob", "45"], ["Cid"]])
+        assert snapshot.filter_rows({}) == [0, 1, 2]
+        assert snapshot.filter_rows({"Age": lambda age: age is not None and int(age) > 40}) == [1]
+        # Only False excludes a row
+        assert snapshot.filter_rows({"Name": lambda name: None}) == [0, 1, 2]
+        assert snapshot.filter_rows({"Name": lambda name: name != "Bob", 1: lambda age: age is not None}) == [0]
+
+    def test_filter_rows(self, people: TableNode):
+        assert people.filter_rows({"Last Name": lambda v: v == "Vega"}) == [0, 2]
+        assert people.filter_rows({"Last Name": lambda v: v == "Vega", "Role": lambda v: v == "User"}) == [2]
+
+    def test_wait_until_num_rows(self, people: TableNode):
+        assert people.wait_until_num_rows_succeeded(2, {"Active": lambda v: v == "yes"}, timeout=1)
+        assert people.wait_until_num_rows_succeeded(4, timeout=1)
+        assert people.wait_until_num_rows_succeeded(3, timeout=0.2, raise_error=False) is False
+        with pytest.raises(TimeoutError, match="had not 3 rows"):
+            people.wait_until_num_rows_succeeded(3, timeout=0.2)
+
+    def test_wait_until_num_rows_of_not_visible_table(self, fake_pb: PombaseCase):
+        fake_pb.driver.load("<html><body><table id='people' style='display: none'></table></body></html>")
+        table = PeoplePage(fake_pb).swn_people
+        assert table.wait_until_num_rows_succeeded(0, timeout=1)
+
+
+class TestIndexing:
+
+    def test_snapshot_index_by(self):
+        snapshot = TableSnapshot(["Name", "Tags"], [["Ann", ["a", "b"]], ["Bob", ["a"]], ["Ann", ["a", "b"]]])
+        assert snapshot.index_by("Name") == {"Ann": [0, 2], "Bob": [1]}
+        # Built only once
+        assert snapshot.index_by(0) is snapshot.index_by("Name")
+        assert snapshot.index_by("Tags") == {("a", "b"): [0, 2], ("a",): [1]}
+
+    def test_snapshot_rows_for(self):
+        snapshot = TableSnapshot(["Name", "Tags"], [["Ann", ["a", "b"]], ["Bob", ["a"]], ["Ann", ["a"]]])
+        assert snapshot.rows_for({}) == [0, 1, 2]
+        assert snapshot.rows_for({"Name": "Ann"}) == [0, 2]
+        assert snapshot.rows_for({"Name": "Ann", "Tags": ["a"]}) == [2]
+        assert snapshot.rows_for({"Name": "Bob", "Tags": ["a", "b"]}) == []
+        assert snapshot.rows_for({"Name": "Cid"}) == []
+
+    def test_index_by(self, people: TableNode):
+        assert people.index_by("Last Name") == {"Vega": [0, 2], "Cantrell": [1], "Row": [3]}
+        assert people.index_by("Email")[None] == [3]
+
+    def test_row_for(self, people: TableNode):
+        assert people.row_for(email="kierra@example.com") == 2
+        assert people.row_for(last_name="Vega", role="User") == 2
+        assert people.row_for(last_name="Vega") == 0
+        assert people.row_for(last_name="Nobody") is None
+        with pytest.raises(RuntimeError, match="no column 'phone'"):
+            people.row_for(phone="555")
+
+    def test_snapshot_is_reused_while_table_does_not_change(self,
+                                                            fake_pb: PombaseCase,
+                                                            people: TableNode,
+                                                            monkeypatch: pytest.MonkeyPatch):
+        snapshot_calls = []
+        get_table_snapshot = fake_pb.get_table_snapshot
+
+        def counted_get_table_snapshot(*args, **kwargs):
+            snapshot_calls.append(args)
+            return get_table_snapshot(*args, **kwargs)
+
+        monkeypatch.setattr(fake_pb, "get_table_snapshot", counted_get_table_snapshot)
+        snapshot = people.get_cached_table_snapshot()
+        assert people.row_for(first_name="Alden") == 1
+        assert people.index_by("Role") == {"Admin": [0], "User": [1, 2], None: [3]}
+        assert people.get_cached_table_snapshot() is snapshot
+        # A snapshot with rows is also valid when only headers are needed
+        assert people.get_cached_table_snapshot(with_rows=False) is snapshot
+        assert len(snapshot_calls) == 1
+
+        # Table changes: snapshot is read again
+        with open(os.path.join(HTML_DIR, "people_table.html"), encoding="utf-8") as file:
+            page_source = file.read()
+        fake_pb.driver.load(page_source.replace("Alden", "Aldo"))
+        assert people.row_for(first_name="Alden") is None
+        assert people.row_for(first_name="Aldo") == 1
+        assert people.get_cached_table_snapshot() is not snapshot
+        assert len(snapshot_calls) == 2
+
+
+class TestHeaderLookup:
+
+    def test_priorities(self):
+        headers = ["Email address", "email", "Name", "User Name", "user_name"]
+        # Exact match first
+        assert header_index(headers, "email") == 1
+        assert header_index(headers, "User Name") == 3
+        assert header_index(headers, "user_name") == 4
+        # Then ignoring case
+        assert header_index(headers, "name") == 2
+        assert header_index(headers, "email address") == 0
+        # Then headers that contain text
+        assert header_index(headers, "addr") == 0
+        assert header_index(headers, "ame") == 2
+        assert header_index(headers, "phone") is None
+
+    def test_underscores(self):
+        headers = [" First Name ", "Last Name"]
+        assert header_index(headers, "First Name") == 0
+        assert header_index(headers, "last_name") == 1
+
+    def test_lookup_is_reusable(self):
+        lookup = HeaderLookup(["First Name", "Last Name"])
+        assert [lookup.get(text) for text in ["last_name", "Last", "first", "age", "Last"]] == [1, 1, 0, None, 1]
+
+    def test_get_data_cell_by_header(self, people: TableNode):
+        assert people.get_header_cell_index("Email") == 2
+        assert people.get_header_cell_index("role") == 4
+        assert people.get_header_cell_index("Phone") is None
+        assert people.get_data_cell(0, "Email").get_text() == "cierra@example.com"
+        assert people.get_data_cell(1, "first_name").get_text() == "Alden"
+        with pytest.raises(RuntimeError, match="no column 'Phone'"):
+            people.get_data_cell(0, "Phone")
+
+    def test_header_texts_are_read_once(self, fake_pb: PombaseCase, people: TableNode, monkeypatch: pytest.MonkeyPatch):
+        snapshot_calls = []
+        get_table_snapshot = fake_pb.get_table_snapshot
+
+        def counted_get_table_snapshot(*args, **kwargs):
+            snapshot_calls.append(args)
+            return get_table_snapshot(*args, **kwargs)
+
+        monkeypatch.setattr(fake_pb, "get_table_snapshot", counted_get_table_snapshot)
+        assert people.get_header_cell_index("Active") == 3
+        assert people.get_header_cell_index("Last Name") == 1
+        assert people.get_header_cell_node("Role").get_text() == "Role"
+        assert len(snapshot_calls) == 1
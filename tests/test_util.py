@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import time
+import pytest
+from pombase import PombaseCase, PageNode, SingleWebNode, Deadline, remaining_timeout, wait_until, wait_until_any, \
+    wait_until_all, PollSchedule, ConstantPollSchedule, BackoffPollSchedule, poll_schedule_from_str, \
+    get_default_poll_schedule, set_default_poll_schedule
+
+
+class TestDeadline:
+
+    def test_remaining(self):
+        deadline = Deadline(0.2)
+        assert 0 < deadline.remaining <= 0.2
+        assert not deadline.expired
+        time.sleep(0.25)
+        assert deadline.remaining == 0
+        assert deadline.expired
+        assert str(deadline) == "0.2"
+
+    def test_invalid_timeout(self):
+        with pytest.raises(RuntimeError):
+            Deadline(-1)
+
+    def test_from_timeout(self):
+        deadline = Deadline(1)
+        assert Deadline.from_timeout(deadline) is deadline
+        assert Deadline.from_timeout(None, default=3).timeout == 3
+        assert Deadline.from_timeout(2).timeout == 2
+
+    def test_remaining_timeout(self):
+        assert remaining_timeout(5) == 5
+        assert remaining_timeout(None) is None
+        assert remaining_timeout(Deadline(1)) <= 1
+
+    def test_nested_waits_share_deadline(self):
+        deadline = Deadline(0.5)
+        start = time.time()
+
+        def inner() -> bool:
+            # Nested wait that never succeeds: gets only the remaining time, not its own full timeout
+            success, _ = wait_until(lambda: False, timeout=deadline, step=0.05)
+            return success
+
+        success, _ = wait_until(inner, timeout=deadline, step=0.05)
+        assert success is False
+        assert time.time() - start < 1
+
+
+class TestPollSchedules:
+
+    def test_constant(self):
+        delays = ConstantPollSchedule(0.25).delays()
+        assert [next(delays) for _ in range(3)] == [0.25, 0.25, 0.25]
+        with pytest.raises(RuntimeError):
+            ConstantPollSchedule(0)
+
+    def test_backoff(self):
+        delays = BackoffPollSchedule(initial=(0.01, 0.02), factor=2, cap=0.1, jitter=0).delays()
+        assert [next(delays) for _ in range(6)] == [0.01, 0.02, 0.04, 0.08, 0.1, 0.1]
+
+    def test_backoff_jitter(self):
+        delays = BackoffPollSchedule(initial=(0.1,), factor=1, cap=1, jitter=0.1).delays()
+        assert all(0.09 <= next(delays) <= 0.11 for _ in range(20))
+
+    @pytest.mark.parametrize("kwargs", [dict(initial=()), dict(initial=(0,)), dict(factor=0.5), dict(cap=0),
+                                        dict(jitter=1)])
+    def test_backoff_invalid(self, kwargs: dict):
+        with pytest.raises(RuntimeError):
+            BackoffPollSchedule(**kwargs)
+
+    def test_from_str(self):
+        assert poll_schedule_from_str("constant").step == 0.5
+        assert poll_schedule_from_str(" Constant:0.25 ").step == 0.25
+        schedule = poll_schedule_from_str("backoff:initial=0.01/0.03,factor=3,cap=2,jitter=0")
+        assert (schedule.initial, schedule.factor, schedule.cap, schedule.jitter) == ((0.01, 0.03), 3, 2, 0)
+        assert isinstance(poll_schedule_from_str("backoff"), BackoffPollSchedule)
+        for value in ("linear", "constant:fast", "backoff:speed=2"):
+            with pytest.raises(RuntimeError):
+                poll_schedule_from_str(value)
+
+    def test_default(self):
+        previous = get_default_poll_schedule()
+        try:
+            set_default_poll_schedule("constant:0.01")
+            assert get_default_poll_schedule().step == 0.01
+        finally:
+            set_default_poll_schedule(previous)
+        # tests/pytest.ini does not set pb_poll_schedule
+        assert isinstance(previous, ConstantPollSchedule) and previous.step == 0.5
+
+    def test_schedule_must_implement_delays(self):
+        with pytest.raises(TypeError):
+            PollSchedule()
+
+        class EveryTenthOfSecond(PollSchedule):
+            def delays(self):
+                while True:
+                    yield 0.1
+
+        assert next(EveryTenthOfSecond().delays()) == 0.1
+
+    def test_wait_until_uses_schedule(self):
+        calls = []
+        start = time.time()
+        success, value = wait_until(lambda: calls.append(time.time() - start) or len(calls),
+                                    expected=4,
+                                    timeout=2,
+                                    poll_schedule=BackoffPollSchedule(initial=(0.01,), factor=2, cap=1, jitter=0))
+        assert (success, value) == (True, 4)
+        # Checks after 0.01, 0.02 and 0.04 more seconds (instead of the old constant 0.5)
+        assert calls[-1] < 0.3
+
+    def test_step_and_schedule_are_exclusive(self):
+        with pytest.raises(RuntimeError):
+            wait_until(lambda: True, step=0.1, poll_schedule="constant")
+
+
+class TestWaitUntilAnyAll:
+
+    def test_any_with_callables(self):
+        start = time.time()
+        success, index = wait_until_any([lambda: False, lambda: time.time() - start > 0.1, lambda: 1 / 0], timeout=2)
+        assert (success, index) == (True, 1)
+        assert wait_until_any([lambda: False], timeout=0.1) == (False, None)
+
+    def test_all_with_callables(self):
+        assert wait_until_all([lambda: True, lambda: "yes"], timeout=1) == (True, [True, True])
+        assert wait_until_all([lambda: True, lambda: None], timeout=0.1) == (False, [True, False])
+        with pytest.raises(TimeoutError):
+            wait_until_all([lambda: False], timeout=0.1, raise_error="Not ready")
+        with pytest.raises(RuntimeError):
+            wait_until_all([])
+
+    def test_nodes_are_checked_together(self, fake_pb: PombaseCase, monkeypatch: pytest.MonkeyPatch):
+        fake_pb.driver.load("<html><body><div id='ok'>OK</div><div id='error' style='display: none'>E</div>"
+                            "</body></html>")
+        calls = []
+        are_nodes_visible = fake_pb.are_nodes_visible
+        monkeypatch.setattr(fake_pb, "are_nodes_visible", lambda nodes: calls.append(nodes) or are_nodes_visible(nodes))
+        page = PageNode(fake_pb)
+        error = SingleWebNode("#error", name="swn_error", parent=page)
+        ok = SingleWebNode("#ok", name="swn_ok", parent=page)
+        assert wait_until_any([error, ok], timeout=1) == (True, 1)
+        assert calls == [[error, ok]]
+        assert wait_until_all([ok, error, lambda: True], timeout=0.1, poll_schedule="constant:0.05") == \
+               (False, [True, False, True])
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import pytest
+from itertools import count
+from overrides import overrides
+from pombase import PombaseCase, PageNode, GenericNode, SingleWebNode, MultipleWebNode, TimeoutType, \
+    valid_count_bounds
+from pages.toolsqa.elements.web_tables_page import WebTablesPage, RowActionNode
+from tests.conftest import html_url
+
+
+class TestMultipleNodes:
+
+    def test_nodes_are_created_when_accessed(self, fake_pb: PombaseCase):
+        fake_pb.open(html_url("web_tables.html"))
+        table = WebTablesPage(fake_pb).swn_table_wrapper__swn_table
+        rows_node = table.mwn_data_rows
+        children = len(rows_node.parent.children)
+        rows = rows_node.get_multiple_nodes()
+        assert len(rows) == 3
+        assert len(rows_node.parent.children) == children
+        assert "Cierra" in rows[0].get_text()
+        assert len(rows_node.parent.children) == children + 1
+        assert rows[-1] is rows[2]
+        assert rows[1:] == [rows[1], rows[2]]
+        with pytest.raises(IndexError):
+            _ = rows[3]
+
+    def test_reused_cell_does_not_keep_attached_nodes(self, fake_pb: PombaseCase):
+        fake_pb.open(html_url("web_tables.html"))
+        page = WebTablesPage(fake_pb)
+        table = page.swn_table_wrapper__swn_table
+        first = table.get_data_cell(0, "Action")
+        RowActionNode(parent=first)
+        second = table.get_data_cell(0, "Action")
+        assert second is not first
+        row_action = RowActionNode(parent=second)
+        assert row_action.swn_edit.get_text() == "Edit"
+
+    def test_cell_is_reused_while_unchanged(self, fake_pb: PombaseCase):
+        fake_pb.open(html_url("web_tables.html"))
+        table = WebTablesPage(fake_pb).swn_table_wrapper__swn_table
+        assert table.get_data_cell(1, "Email") is table.get_data_cell(1, "Email")
+
+    def test_rows_are_reused_while_unchanged(self, fake_pb: PombaseCase):
+        fake_pb.open(html_url("web_tables.html"))
+        table = WebTablesPage(fake_pb).swn_table_wrapper__swn_table
+        row = table.mwn_data_rows.get_multiple_nodes()[0]
+        assert table.get_data_cell(0, "Email").get_text() == "cierra@example.com"
+        assert table.mwn_data_rows.get_multiple_nodes()[0] is row
+
+    def test_nodes_with_descendants_are_reused(self, fake_pb: PombaseCase):
+        fake_pb.driver.load(LOADING_PAGE)
+        items = LoadingPage(fake_pb).swn_list__mwn_items
+        assert len(items.children) > 0
+        item = items.get_multiple_nodes()[1]
+        assert items.get_multiple_nodes()[1] is item
+        assert item.children[0].get_text() == "Two"
+        # Template changes: nodes are generated again
+        SingleWebNode("b", parent=items)
+        assert items.get_multiple_nodes()[1] is not item
+
+    def test_web_tables_page_loads_twice(self, fake_pb: PombaseCase):
+        fake_pb.open(html_url("web_tables.html"))
+        page = WebTablesPage(fake_pb)
+        assert page.wait_until_loaded_succeeded(timeout=2)
+        assert page.wait_until_loaded_succeeded(timeout=2)
+        page.do_delete_row(0)
+
+
+class TemplatePage(PageNode):
+    use_template = True
+
+    @overrides
+    def init_node(self) -> None:
+        super().init_node()
+
+        self.swn_header = SingleWebNode("header", required=True)
+        self.swn_header__swn_logo = SingleWebNode("a.logo")
+        self.buttons = [self.swn_header, {"logo": self.swn_header__swn_logo}]
+
+
+class TestPageTemplates:
+
+    def test_clone_does_not_share_nodes_with_template(self):
+        PageNode.clear_templates()
+        first = TemplatePage()
+        second = TemplatePage()
+        assert second._get_template() is not None
+        assert second.swn_header is not first.swn_header
+        assert second.swn_header.parent is second
+        assert second.buttons is not first.buttons
+        assert second.buttons[0] is second.swn_header
+        assert second.buttons[1]["logo"] is second.swn_header__swn_logo
+        assert second.swn_header__swn_logo.parent is second.swn_header
+        assert second._kwargs is not first._kwargs
+
+    def test_template_is_opt_in(self):
+        assert PageNode.use_template is False
+        assert WebTablesPage.use_template is True
+
+    def test_shipped_page_is_cloned(self, fake_pb: PombaseCase):
+        WebTablesPage.clear_templates()
+        fake_pb.open(html_url("web_tables.html"))
+        WebTablesPage(fake_pb)
+        page = WebTablesPage(fake_pb)
+        assert page._get_template() is not None
+        elements = page.swn_left_pannel__swn_elements
+        assert elements.title == "Elements" and elements.parent is page.swn_left_pannel
+        assert page.wait_until_loaded_succeeded(timeout=2)
+        elements.do_select_sub_element("Web Tables")
+        page.do_delete_row(0)
+
+
+class TestNameIndex:
+
+    @staticmethod
+    def tree() -> SingleWebNode:
+        root = SingleWebNode("div.root", name="swn_root")
+        SingleWebNode("div.a", name="swn_a", parent=root)
+        unnamed = SingleWebNode("div.unnamed", parent=root.swn_a)
+        SingleWebNode("span", name="swn_b", parent=unnamed)
+        return root
+
+    def test_find_by_path(self):
+        root = self.tree()
+        leaf = root.find_node("swn_a__swn_b")
+        assert leaf.name == "swn_b"
+        assert root.find_node("swn_b") is leaf
+        assert leaf.find_node("swn_a", descendants_only=False) is root.swn_a
+        with pytest.raises(RuntimeError, match="not found"):
+            root.find_node("swn_a__swn_missing")
+
+    def test_index_follows_tree_changes(self):
+        root = self.tree()
+        leaf = root.swn_a__swn_b
+        other = SingleWebNode("section", name="swn_other")
+        leaf.parent = other
+        assert other.find_node("swn_b") is leaf
+        with pytest.raises(RuntimeError):
+            root.find_node("swn_b")
+        assert set(root._get_name_index()) == {"swn_a"}
+
+    def test_index_follows_renames(self):
+        root = self.tree()
+        leaf = root.swn_a__swn_b
+        leaf.name = "swn_c"
+        assert root.find_node("swn_a__swn_c") is leaf
+        with pytest.raises(RuntimeError):
+            root.find_node("swn_b")
+
+
+class TestUniqueNames:
+
+    def test_duplicated_name_is_rejected(self):
+        root = SingleWebNode("div.root", name="swn_root")
+        SingleWebNode("div.a", name="swn_a", parent=root)
+        with pytest.raises(RuntimeError, match="Found 2 nodes with name 'swn_a'"):
+            SingleWebNode("div.b", name="swn_a", parent=root)
+
+    def test_duplicated_name_through_unnamed_node(self):
+        root = SingleWebNode("div.root", name="swn_root")
+        SingleWebNode("div.a", name="swn_a", parent=root)
+        unnamed = SingleWebNode("div.unnamed", parent=root)
+        with pytest.raises(RuntimeError, match="Found 2 nodes with name 'swn_a'"):
+            SingleWebNode("div.b", name="swn_a", parent=unnamed)
+
+    def test_same_name_under_different_named_nodes(self):
+        root = SingleWebNode("div.root", name="swn_root")
+        SingleWebNode("div.a", name="swn_a", parent=root)
+        SingleWebNode("div.b", name="swn_b", parent=root)
+        SingleWebNode("span", name="swn_c", parent=root.swn_a)
+        SingleWebNode("span", name="swn_c", parent=root.swn_b)
+        root.validate_tree()
+        assert root.swn_a__swn_c is not root.swn_b__swn_c
+
+    def test_page_tree_is_validated(self):
+        page = TemplatePage()
+        page.validate_tree()
+        page.validate_unique_descendant_names()
+
+
+SNAPSHOT_PAGE = """<html><body>
+<form id="f">
+    <input id="name" value="Ann">
+    <input id="agree" type="checkbox" checked>
+    <select id="color"><option>Red</option><option selected>Blue</option></select>
+    <div class="box"><h2>Title</h2></div>
+    <ul><li>One</li><li>Two</li><li style="display: none">Hidden</li></ul>
+</form>
+</body></html>"""
+
+
+class SnapshotPage(PageNode):
+
+    @overrides
+    def init_node(self) -> None:
+        super().init_node()
+
+        self.swn_form = SingleWebNode("form#f")
+        self.swn_form__swn_name = SingleWebNode("#name")
+        self.swn_form__swn_agree = SingleWebNode("#agree")
+        self.swn_form__swn_color = SingleWebNode("#color")
+        self.swn_form__mwn_items = MultipleWebNode("li")
+        self.swn_form__swn_missing = SingleWebNode("#missing", required=True)
+        box = GenericNode("div.box", parent=self.swn_form)
+        self.swn_form__swn_title = SingleWebNode("h2", parent=box)
+
+
+class TestSnapshot:
+
+    def test_snapshot(self, fake_pb: PombaseCase):
+        fake_pb.driver.load(SNAPSHOT_PAGE)
+        snapshot = SnapshotPage(fake_pb).snapshot()
+        page = snapshot["snapshot_page"]
+        assert page["count"] == 1
+        form = page["children"]["snapshot_page__swn_form"]
+        assert form["value"] is None
+        fields = form["children"]
+        assert fields["snapshot_page__swn_form__swn_name"]["value"] == "Ann"
+        assert fields["snapshot_page__swn_form__swn_agree"]["value"] is True
+        assert fields["snapshot_page__swn_form__swn_color"]["value"] == ["Blue"]
+        items = fields["snapshot_page__swn_form__mwn_items"]
+        assert (items["count"], items["value"], items["valid_count"]) == (2, ["One", "Two"], True)
+        missing = fields["snapshot_page__swn_form__swn_missing"]
+        assert missing == {"count": 0, "visible": False, "valid_count": False, "value": None, "children": {}}
+        # Unnamed nodes are skipped, but not their named descendants
+        assert fields["snapshot_page__swn_form__swn_title"]["value"] == "Title"
+
+    def test_snapshot_of_a_subtree(self, fake_pb: PombaseCase):
+        fake_pb.driver.load(SNAPSHOT_PAGE)
+        items = SnapshotPage(fake_pb).swn_form__mwn_items
+        assert items.snapshot()["snapshot_page__swn_form__mwn_items"]["value"] == ["One", "Two"]
+
+    def test_one_browser_call(self, fake_pb: PombaseCase, monkeypatch: pytest.MonkeyPatch):
+        fake_pb.driver.load(SNAPSHOT_PAGE)
+        page = SnapshotPage(fake_pb)
+        scripts = []
+        execute_script = fake_pb.execute_script
+
+        def counted_execute_script(script, *args):
+            scripts.append(script)
+            return execute_script(script, *args)
+
+        monkeypatch.setattr(fake_pb, "execute_script", counted_execute_script)
+        page.snapshot()
+        assert len(scripts) == 1
+
+
+LOADING_PAGE = """<html><body>
+<ul id="list">
+    <li><span class="name">One</span></li>
+    <li><span class="name">Two</span></li>
+    <li>Three</li>
+</ul>
+<div id="footer">Footer</div>
+</body></html>"""
+
+
+class FooterNode(SingleWebNode):
+    checked_texts: list[str] = []
+
+    @overrides
+    def override_wait_until_loaded(self, timeout: TimeoutType = None) -> None:
+        self.checked_texts.append(self.get_text(timeout))
+
+
+class LoadingPage(PageNode):
+
+    @overrides
+    def init_node(self) -> None:
+        super().init_node()
+
+        self.swn_list = SingleWebNode("#list", required=True)
+        self.swn_list__mwn_items = MultipleWebNode("li")
+        self.swn_list__mwn_items__swn_name = SingleWebNode("span.name", required=True)
+        self.swn_footer = FooterNode("#footer", required=True)
+
+
+class TestLoading:
+
+    def test_loaded_in_one_browser_call(self, fake_pb: PombaseCase, monkeypatch: pytest.MonkeyPatch):
+        fake_pb.driver.load(LOADING_PAGE.replace("<li>Three</li>", ""))
+        page = LoadingPage(fake_pb)
+        calls = []
+        get_nodes_load_state = fake_pb.get_nodes_load_state
+
+        def counted_get_nodes_load_state(*args, **kwargs):
+            calls.append(args)
+            return get_nodes_load_state(*args, **kwargs)
+
+        monkeypatch.setattr(fake_pb, "get_nodes_load_state", counted_get_nodes_load_state)
+        assert page.wait_until_loaded_succeeded(timeout=1)
+        assert len(calls) == 1
+
+    def test_descendants_of_multiple_nodes_are_checked_for_every_element(self, fake_pb: PombaseCase):
+        fake_pb.driver.load(LOADING_PAGE)
+        page = LoadingPage(fake_pb)
+        assert page.wait_until_loaded_succeeded(timeout=0.2, raise_error=False) is False
+        with pytest.raises(TimeoutError, match=r"(?s)not loaded.*swn_name.*elements \[2\] of multiple ancestors"):
+            page.wait_until_loaded_succeeded(timeout=0.2)
+
+    def test_missing_node(self, fake_pb: PombaseCase):
+        fake_pb.driver.load(LOADING_PAGE.replace("<li>Three</li>", "").replace('<div id="footer">Footer</div>', ""))
+        with pytest.raises(TimeoutError, match=r"swn_footer.*count=0"):
+            LoadingPage(fake_pb).wait_until_loaded_succeeded(timeout=0.2)
+
+    def test_count_bounds_are_not_consumed(self, fake_pb: PombaseCase):
+        fake_pb.driver.load(LOADING_PAGE)
+        page = LoadingPage(fake_pb)
+        items = MultipleWebNode("li", valid_count=count(2), parent=page.swn_list, name="mwn_at_least_two")
+        assert items.required and items.max_valid_count is None
+        assert 5 in items.valid_count and 3 in items.valid_count and 1 not in items.valid_count
+        assert items.has_valid_count()
+        assert valid_count_bounds(items.valid_count) == [2, None, None]
+        assert items.wait_until_loaded_succeeded(timeout=1, force_count_not_zero=False)
+        items.valid_count = count(4)
+        assert items.wait_until_loaded_succeeded(timeout=0.2, raise_error=False) is False
+
+    def test_custom_logic_runs_after_counts(self, fake_pb: PombaseCase):
+        fake_pb.driver.load(LOADING_PAGE.replace("<li>Three</li>", ""))
+        page = LoadingPage(fake_pb)
+        page.swn_footer.checked_texts = []
+        assert page.wait_until_loaded_succeeded(timeout=1)
+        assert page.swn_footer.checked_texts == ["Footer"]